@@ -119,3 +119,151 @@ ALTER TABLE surveys ADD COLUMN IF NOT EXISTS end_reason TEXT;
 -- Configurable company name (replaces hardcoded TENANT_DISPLAY_NAMES)
 ALTER TABLE surveys ADD COLUMN IF NOT EXISTS company_name TEXT;
 ALTER TABLE templates ADD COLUMN IF NOT EXISTS company_name TEXT;
+
+-- Content-addressed cache for brain-service LLM results (see migrations/004_add_llm_cache.sql)
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key        TEXT PRIMARY KEY,
+    op         TEXT NOT NULL,
+    value      JSONB NOT NULL,
+    hits       INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
+
+-- Prebuilt voice prompts per survey (see migrations/005_add_prompt_artifacts.sql)
+CREATE TABLE IF NOT EXISTS prompt_artifacts (
+    survey_id    TEXT PRIMARY KEY REFERENCES surveys(id) ON DELETE CASCADE,
+    content_hash TEXT NOT NULL,
+    artifacts    JSONB NOT NULL,
+    built_at     TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Per-question prompt translations (see migrations/006_add_question_translations.sql)
+CREATE TABLE IF NOT EXISTS question_translations (
+    key             TEXT PRIMARY KEY,
+    question_id     TEXT,
+    lang            TEXT NOT NULL,
+    source_text     TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at      TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_question_translations_question ON question_translations(question_id);
+
+-- Outbound call leases shared by voice-service replicas (see migrations/007_add_call_reservations.sql)
+CREATE TABLE IF NOT EXISTS call_reservations (
+    phone       TEXT PRIMARY KEY,
+    survey_id   TEXT NOT NULL UNIQUE,
+    holder      TEXT NOT NULL,
+    confirmed   BOOLEAN NOT NULL DEFAULT FALSE,
+    reserved_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at  TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_call_reservations_expires ON call_reservations(expires_at);
+
+-- Structured transcript turns/answers (see migrations/008_add_transcript_turns.sql)
+ALTER TABLE call_transcripts ADD COLUMN IF NOT EXISTS turns JSONB;
+ALTER TABLE call_transcripts ADD COLUMN IF NOT EXISTS answers JSONB;
+
+-- Parse-on-write transcripts (see migrations/009_add_parsed_transcripts.sql)
+ALTER TABLE call_transcripts ADD COLUMN IF NOT EXISTS parsed JSONB;
+ALTER TABLE call_transcripts ADD COLUMN IF NOT EXISTS language_detected TEXT;
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_survey_started ON call_transcripts(survey_id, call_started_at DESC);
+
+-- Transcript listing keyset index (see migrations/010_add_transcript_keyset_index.sql)
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_started_id ON call_transcripts(call_started_at DESC, id DESC);
+
+-- Campaign dialer checkpoints (see migrations/011_add_campaign_runs.sql)
+CREATE TABLE IF NOT EXISTS campaign_runs (
+    id              TEXT PRIMARY KEY,
+    campaign_id     TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'running',
+    checkpoint_id   TEXT,
+    total           INTEGER NOT NULL DEFAULT 0,
+    dialed          INTEGER NOT NULL DEFAULT 0,
+    succeeded       INTEGER NOT NULL DEFAULT 0,
+    failed          INTEGER NOT NULL DEFAULT 0,
+    started_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at     TIMESTAMP,
+    error           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_campaign_runs_campaign ON campaign_runs(campaign_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_campaign_runs_running ON campaign_runs(status) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_surveys_campaign_status_id ON surveys(campaign_id, status, id);
+
+-- Calling windows and campaign dial queue (see migrations/012_add_dial_queue.sql)
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS timezone TEXT;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS call_window_start TIME;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS call_window_end TIME;
+ALTER TABLE surveys ADD COLUMN IF NOT EXISTS timezone TEXT;
+CREATE TABLE IF NOT EXISTS dial_queue (
+    survey_id        TEXT PRIMARY KEY,
+    run_id           TEXT NOT NULL,
+    campaign_id      TEXT NOT NULL,
+    phone            TEXT NOT NULL,
+    timezone         TEXT NOT NULL,
+    window_start     TIME NOT NULL,
+    window_end       TIME NOT NULL,
+    next_eligible_at TIMESTAMP NOT NULL,
+    state            TEXT NOT NULL DEFAULT 'queued',
+    outcome          TEXT,
+    enqueued_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at       TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_dial_queue_eligible ON dial_queue(run_id, next_eligible_at) WHERE state = 'queued';
+
+-- Call retry series (see migrations/013_add_call_retries.sql)
+CREATE TABLE IF NOT EXISTS call_retries (
+    survey_id    TEXT PRIMARY KEY,
+    phone        TEXT NOT NULL,
+    campaign_id  TEXT,
+    attempt      INTEGER NOT NULL DEFAULT 1,
+    state        TEXT NOT NULL DEFAULT 'dialing',  -- dialing | pending | done
+    run_at       TIMESTAMP,
+    last_outcome TEXT,
+    updated_at   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_call_retries_due ON call_retries(run_at) WHERE state = 'pending';
+
+-- Scheduled call queue, replaces call_retries (see migrations/014_add_scheduled_calls.sql)
+CREATE TABLE IF NOT EXISTS scheduled_calls (
+    id           TEXT PRIMARY KEY,
+    survey_id    TEXT NOT NULL,
+    phone        TEXT NOT NULL,
+    campaign_id  TEXT,
+    attempt      INTEGER NOT NULL DEFAULT 1,
+    state        TEXT NOT NULL DEFAULT 'pending',  -- pending | claimed | dialing | done | cancelled
+    run_at       TIMESTAMP NOT NULL,
+    lease_until  TIMESTAMP,
+    last_outcome TEXT,
+    created_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_due ON scheduled_calls(run_at) WHERE state = 'pending';
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_lease ON scheduled_calls(lease_until) WHERE state = 'claimed';
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_survey ON scheduled_calls(survey_id, state);
+
+-- Pending retries become the next attempt's row
+DO $$
+BEGIN
+    IF to_regclass('call_retries') IS NOT NULL THEN
+        INSERT INTO scheduled_calls (id, survey_id, phone, campaign_id, attempt, state, run_at, last_outcome)
+        SELECT gen_random_uuid()::text, survey_id, phone, campaign_id, attempt + 1, 'pending', run_at, last_outcome
+        FROM call_retries WHERE state = 'pending';
+        DROP TABLE call_retries;
+    END IF;
+END $$;
+
+-- Campaign run lease, one running run per campaign (see migrations/015_add_campaign_run_lease.sql)
+ALTER TABLE campaign_runs ADD COLUMN IF NOT EXISTS owner TEXT;
+ALTER TABLE campaign_runs ADD COLUMN IF NOT EXISTS lease_until TIMESTAMP;
+-- At most one running run per campaign; older duplicates are closed first
+UPDATE campaign_runs r SET status = 'failed', finished_at = NOW(), error = 'superseded by a newer run'
+WHERE r.status = 'running' AND EXISTS (
+    SELECT 1 FROM campaign_runs n
+    WHERE n.campaign_id = r.campaign_id AND n.status = 'running' AND n.started_at > r.started_at
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_campaign_runs_one_running ON campaign_runs(campaign_id) WHERE status = 'running';
+-- A run starting up requeues its campaign's rows left 'dialing'
+CREATE INDEX IF NOT EXISTS idx_dial_queue_campaign_dialing ON dial_queue(campaign_id) WHERE state = 'dialing';
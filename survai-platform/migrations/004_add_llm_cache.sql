@@ -0,0 +1,10 @@
+-- Content-addressed cache for brain-service LLM results (second tier behind the in-process LRU)
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key        TEXT PRIMARY KEY,        -- sha256 of (operation, model, prompt, inputs)
+    op         TEXT NOT NULL,
+    value      JSONB NOT NULL,
+    hits       INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at);
@@ -0,0 +1,7 @@
+-- Voice prompts prebuilt at survey creation, read by voice-service make_call
+CREATE TABLE IF NOT EXISTS prompt_artifacts (
+    survey_id    TEXT PRIMARY KEY REFERENCES surveys(id) ON DELETE CASCADE,
+    content_hash TEXT NOT NULL,         -- sha256 of prompt inputs + PROMPT_BUILDER_VERSION
+    artifacts    JSONB NOT NULL,        -- greeter / questions_prompt / questions_map per language
+    built_at     TIMESTAMP NOT NULL DEFAULT NOW()
+);
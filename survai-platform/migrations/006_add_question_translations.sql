@@ -0,0 +1,10 @@
+-- Per-question translations used by voice-service prompt_builder (second tier behind the in-process LRU)
+CREATE TABLE IF NOT EXISTS question_translations (
+    key             TEXT PRIMARY KEY,   -- sha256 of (language, model, question text)
+    question_id     TEXT,
+    lang            TEXT NOT NULL,
+    source_text     TEXT NOT NULL,
+    translated_text TEXT NOT NULL,
+    created_at      TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_question_translations_question ON question_translations(question_id);
@@ -0,0 +1,10 @@
+-- Cluster-wide outbound call locks for voice-service (one lease per phone / survey)
+CREATE TABLE IF NOT EXISTS call_reservations (
+    phone       TEXT PRIMARY KEY,
+    survey_id   TEXT NOT NULL UNIQUE,
+    holder      TEXT NOT NULL,          -- hostname:pid of the voice-service worker that dialed
+    confirmed   BOOLEAN NOT NULL DEFAULT FALSE,
+    reserved_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at  TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_call_reservations_expires ON call_reservations(expires_at);
@@ -0,0 +1,4 @@
+-- Structured transcript payload posted by the agent (POST /api/voice/transcripts)
+ALTER TABLE call_transcripts
+    ADD COLUMN IF NOT EXISTS turns JSONB,      -- [{"role": "agent"|"user", "text": ..., "ts": ...}]
+    ADD COLUMN IF NOT EXISTS answers JSONB;    -- {question_id: answer}
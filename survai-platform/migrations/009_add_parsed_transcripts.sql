@@ -0,0 +1,7 @@
+-- Transcripts are parsed once at write time; GET /api/voice/transcript/{id} reads the stored result
+ALTER TABLE call_transcripts
+    ADD COLUMN IF NOT EXISTS parsed JSONB,              -- enhance_transcript() output
+    ADD COLUMN IF NOT EXISTS language_detected TEXT;
+-- Latest transcript per survey in one index probe
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_survey_started
+    ON call_transcripts(survey_id, call_started_at DESC);
@@ -0,0 +1,3 @@
+-- Keyset pagination for GET /api/voice/transcripts: ORDER BY call_started_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_call_transcripts_started_id
+    ON call_transcripts(call_started_at DESC, id DESC);
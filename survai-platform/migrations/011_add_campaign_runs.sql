@@ -0,0 +1,19 @@
+-- Campaign dialer runs: progress checkpoint so a scheduler restart resumes a campaign mid-way
+CREATE TABLE IF NOT EXISTS campaign_runs (
+    id              TEXT PRIMARY KEY,
+    campaign_id     TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'running',  -- running | completed | cancelled | failed
+    checkpoint_id   TEXT,                             -- every target with surveys.id <= this has been dialed
+    total           INTEGER NOT NULL DEFAULT 0,
+    dialed          INTEGER NOT NULL DEFAULT 0,
+    succeeded       INTEGER NOT NULL DEFAULT 0,
+    failed          INTEGER NOT NULL DEFAULT 0,
+    started_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    finished_at     TIMESTAMP,
+    error           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_campaign_runs_campaign ON campaign_runs(campaign_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_campaign_runs_running ON campaign_runs(status) WHERE status = 'running';
+-- Dialer pages through a campaign's targets by surveys.id
+CREATE INDEX IF NOT EXISTS idx_surveys_campaign_status_id ON surveys(campaign_id, status, id);
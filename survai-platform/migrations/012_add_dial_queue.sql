@@ -0,0 +1,22 @@
+-- Calling windows: campaign dials only go out between window start / end in the target's local time
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS timezone TEXT;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS call_window_start TIME;
+ALTER TABLE campaigns ADD COLUMN IF NOT EXISTS call_window_end TIME;
+ALTER TABLE surveys ADD COLUMN IF NOT EXISTS timezone TEXT;
+
+-- Campaign dial queue: one row per target, pulled by next_eligible_at (UTC)
+CREATE TABLE IF NOT EXISTS dial_queue (
+    survey_id        TEXT PRIMARY KEY,
+    run_id           TEXT NOT NULL,
+    campaign_id      TEXT NOT NULL,
+    phone            TEXT NOT NULL,
+    timezone         TEXT NOT NULL,
+    window_start     TIME NOT NULL,
+    window_end       TIME NOT NULL,
+    next_eligible_at TIMESTAMP NOT NULL,
+    state            TEXT NOT NULL DEFAULT 'queued',  -- queued | dialing | done
+    outcome          TEXT,
+    enqueued_at      TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at       TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_dial_queue_eligible ON dial_queue(run_id, next_eligible_at) WHERE state = 'queued';
@@ -0,0 +1,12 @@
+-- Call retries: one row per survey tracking its attempt series, polled by run_at (UTC)
+CREATE TABLE IF NOT EXISTS call_retries (
+    survey_id    TEXT PRIMARY KEY,
+    phone        TEXT NOT NULL,
+    campaign_id  TEXT,
+    attempt      INTEGER NOT NULL DEFAULT 1,
+    state        TEXT NOT NULL DEFAULT 'dialing',  -- dialing | pending | done
+    run_at       TIMESTAMP,
+    last_outcome TEXT,
+    updated_at   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_call_retries_due ON call_retries(run_at) WHERE state = 'pending';
@@ -0,0 +1,29 @@
+-- Scheduled calls: one row per call attempt, claimed by scheduler workers with FOR UPDATE SKIP LOCKED.
+-- Replaces per-call APScheduler jobs and the call_retries table (a retry is the next attempt's row).
+CREATE TABLE IF NOT EXISTS scheduled_calls (
+    id           TEXT PRIMARY KEY,
+    survey_id    TEXT NOT NULL,
+    phone        TEXT NOT NULL,
+    campaign_id  TEXT,
+    attempt      INTEGER NOT NULL DEFAULT 1,
+    state        TEXT NOT NULL DEFAULT 'pending',  -- pending | claimed | dialing | done | cancelled
+    run_at       TIMESTAMP NOT NULL,
+    lease_until  TIMESTAMP,
+    last_outcome TEXT,
+    created_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at   TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_due ON scheduled_calls(run_at) WHERE state = 'pending';
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_lease ON scheduled_calls(lease_until) WHERE state = 'claimed';
+CREATE INDEX IF NOT EXISTS idx_scheduled_calls_survey ON scheduled_calls(survey_id, state);
+
+-- Pending retries become the next attempt's row
+DO $$
+BEGIN
+    IF to_regclass('call_retries') IS NOT NULL THEN
+        INSERT INTO scheduled_calls (id, survey_id, phone, campaign_id, attempt, state, run_at, last_outcome)
+        SELECT gen_random_uuid()::text, survey_id, phone, campaign_id, attempt + 1, 'pending', run_at, last_outcome
+        FROM call_retries WHERE state = 'pending';
+        DROP TABLE call_retries;
+    END IF;
+END $$;
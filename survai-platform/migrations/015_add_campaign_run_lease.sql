@@ -0,0 +1,12 @@
+-- Campaign run lease: the scheduler replica holding a run renews lease_until at each checkpoint
+ALTER TABLE campaign_runs ADD COLUMN IF NOT EXISTS owner TEXT;
+ALTER TABLE campaign_runs ADD COLUMN IF NOT EXISTS lease_until TIMESTAMP;
+-- At most one running run per campaign; older duplicates are closed first
+UPDATE campaign_runs r SET status = 'failed', finished_at = NOW(), error = 'superseded by a newer run'
+WHERE r.status = 'running' AND EXISTS (
+    SELECT 1 FROM campaign_runs n
+    WHERE n.campaign_id = r.campaign_id AND n.status = 'running' AND n.started_at > r.started_at
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_campaign_runs_one_running ON campaign_runs(campaign_id) WHERE status = 'running';
+-- A run starting up requeues its campaign's rows left 'dialing'
+CREATE INDEX IF NOT EXISTS idx_dial_queue_campaign_dialing ON dial_queue(campaign_id) WHERE state = 'dialing';
@@ -3,12 +3,18 @@ Agent Service -- Port 8050
 Handles transcript retrieval and email fallback.
 """
 
+import sys
+
+sys.path.insert(0, "/app")
+
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import pool_stats
+
 from routes.agent import router as agent_router
 
 logging.basicConfig(level=logging.INFO)
@@ -50,6 +56,11 @@ async def health():
     return {"status": "OK", "service": "agent-service"}
 
 
+@app.get("/health/db")
+async def health_db():
+    return {"service": "agent-service", "pools": pool_stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app:app", host="0.0.0.0", port=8050)
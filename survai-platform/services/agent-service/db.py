@@ -4,43 +4,29 @@ Owns: call_transcripts table
 Reads: surveys, survey_response_items, questions, templates, template_questions, riders
 """
 
-import os
+import sys
+
+sys.path.insert(0, "/app")
+
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import create_engine, text
+from shared.db import get_engine as _get_engine, sql_execute as _sql_execute
 
 logger = logging.getLogger(__name__)
 
-_engine = None
+SERVICE_NAME = "agent-service"
 
 
 def get_engine():
-    global _engine
-    if _engine is None:
-        db_host = os.getenv("DB_HOST", "localhost")
-        db_port = os.getenv("DB_PORT", "5432")
-        db_user = os.getenv("DB_USER", "pguser")
-        db_password = os.getenv("DB_PASSWORD", "root")
-        db_name = os.getenv("DB_NAME", "postgres")
-        url = f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        _engine = create_engine(url, pool_size=5, max_overflow=10, pool_pre_ping=True)
-    return _engine
+    """This service's sync engine (pool sized via env, see shared.db)."""
+    return _get_engine(SERVICE_NAME)
 
 
 def sql_execute(query: str, params: dict = None) -> list:
-    engine = get_engine()
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params or {})
-        if result.returns_rows:
-            rows = result.fetchall()
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in rows]
-        else:
-            conn.commit()
-            return []
+    return _sql_execute(query, params, service_name=SERVICE_NAME)
 
 
 # ─── Survey Data Loading ─────────────────────────────────────────────────────
@@ -13,6 +13,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+
 from routes.analytics import router as analytics_router
 from routes.export import router as export_router
 from routes.import_data import router as import_router
@@ -26,6 +28,7 @@ async def lifespan(app: FastAPI):
     logger.info("Analytics Service starting up...")
     yield
     logger.info("Analytics Service shutting down...")
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -58,6 +61,11 @@ async def health():
     return {"status": "OK", "service": "analytics-service"}
 
 
+@app.get("/health/db")
+async def health_db():
+    return {"service": "analytics-service", "pools": pool_stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -2,6 +2,7 @@
 Analytics routes: summary metrics, campaign metrics, AI analysis.
 """
 
+import datetime
 import json
 import logging
 import os
@@ -10,7 +11,7 @@ from typing import Any, Dict, Optional
 import httpx
 from fastapi import APIRouter, HTTPException
 
-from db import sql_execute
+from db import async_sql_execute
 
 BRAIN_SERVICE_URL = os.getenv("BRAIN_SERVICE_URL", "http://brain-service:8016")
 
@@ -26,7 +27,7 @@ async def get_analytics_summary():
     """
     try:
         # From call_transcripts: total, completed, avg_duration
-        transcript_stats = sql_execute(
+        transcript_stats = await async_sql_execute(
             """SELECT
                 COUNT(*) AS total_surveys,
                 SUM(CASE WHEN call_status = 'completed' THEN 1 ELSE 0 END) AS completed,
@@ -41,14 +42,14 @@ async def get_analytics_summary():
         completion_rate = (completed / total * 100) if total > 0 else 0
 
         # Channel counts from surveys
-        channel_rows = sql_execute(
+        channel_rows = await async_sql_execute(
             """SELECT channel, COUNT(*) AS cnt FROM surveys GROUP BY channel""",
             {},
         )
         channel_counts = {r.get("channel") or "phone": r.get("cnt", 0) for r in channel_rows}
 
         # Dropout tracking: find last answered question for incomplete surveys
-        dropout_rows = sql_execute(
+        dropout_rows = await async_sql_execute(
             """SELECT sri.ord, q.text AS question_text, COUNT(*) AS dropout_count
                FROM surveys s
                JOIN survey_response_items sri ON sri.survey_id = s.id
@@ -72,7 +73,7 @@ async def get_analytics_summary():
         ]
 
         # Response type breakdown
-        response_type_rows = sql_execute(
+        response_type_rows = await async_sql_execute(
             """SELECT q.criteria, COUNT(*) AS cnt
                FROM survey_response_items sri
                JOIN questions q ON q.id = sri.question_id
@@ -100,14 +101,14 @@ async def get_analytics_summary():
 async def get_campaign_analytics(campaign_id: str):
     """Campaign-specific metrics."""
     try:
-        campaign = sql_execute(
+        campaign = await async_sql_execute(
             "SELECT * FROM campaigns WHERE id = :id",
             {"id": campaign_id},
         )
         if not campaign:
             raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
 
-        surveys = sql_execute(
+        surveys = await async_sql_execute(
             """SELECT s.id, s.status, s.completion_date, ct.call_duration_seconds, s.channel
                FROM surveys s
                LEFT JOIN call_transcripts ct ON ct.survey_id = s.id
@@ -145,14 +146,14 @@ async def analyze_survey(survey_id: str):
     Post-survey AI analysis using OpenAI. Analyzes responses, stores in survey_analytics table.
     """
     try:
-        survey = sql_execute(
+        survey = await async_sql_execute(
             "SELECT * FROM surveys WHERE id = :id",
             {"id": survey_id},
         )
         if not survey:
             raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
 
-        responses = sql_execute(
+        responses = await async_sql_execute(
             """SELECT q.text AS question_text, sri.raw_answer, sri.answer
                FROM survey_response_items sri
                JOIN questions q ON q.id = sri.question_id
@@ -160,7 +161,7 @@ async def analyze_survey(survey_id: str):
                ORDER BY sri.ord""",
             {"survey_id": survey_id},
         )
-        transcript_rows = sql_execute(
+        transcript_rows = await async_sql_execute(
             "SELECT full_transcript FROM call_transcripts WHERE survey_id = :survey_id ORDER BY call_started_at DESC LIMIT 1",
             {"survey_id": survey_id},
         )
@@ -184,10 +185,10 @@ async def analyze_survey(survey_id: str):
                 raise RuntimeError(f"Brain service error: {brain_resp.status_code}")
             data = brain_resp.json()
 
-        sql_execute(
+        await async_sql_execute(
             """INSERT INTO survey_analytics
                (survey_id, overall_sentiment, quality_score, key_themes, summary, nps_score, satisfaction_score)
-               VALUES (:survey_id, :sentiment, :quality, :themes::jsonb, :summary, :nps, :satisfaction)
+               VALUES (:survey_id, :sentiment, :quality, CAST(:themes AS jsonb), :summary, :nps, :satisfaction)
                ON CONFLICT (survey_id) DO UPDATE SET
                  overall_sentiment = EXCLUDED.overall_sentiment,
                  quality_score = EXCLUDED.quality_score,
@@ -221,11 +222,11 @@ async def analyze_survey(survey_id: str):
 async def get_demand_fulfillment(tenant_id: str, days: int = 30):
     """Get demand fulfillment rate for a tenant over specified days."""
     try:
-        rows = sql_execute(
+        rows = await async_sql_execute(
             """SELECT date, total_requests, fulfilled_requests, fulfillment_rate, avg_wait_time_minutes
                FROM demand_fulfillment
                WHERE tenant_id = :tenant_id
-               AND date >= CURRENT_DATE - :days
+               AND date >= CURRENT_DATE - CAST(:days AS INTEGER)
                ORDER BY date DESC""",
             {"tenant_id": tenant_id, "days": days},
         )
@@ -269,7 +270,7 @@ async def record_demand_fulfillment(
     try:
         fulfillment_rate = (fulfilled_requests / total_requests * 100) if total_requests > 0 else 0
         
-        sql_execute(
+        await async_sql_execute(
             """INSERT INTO demand_fulfillment 
                (tenant_id, date, total_requests, fulfilled_requests, fulfillment_rate, avg_wait_time_minutes)
                VALUES (:tenant_id, :date, :total_requests, :fulfilled_requests, :fulfillment_rate, :avg_wait_time)
@@ -280,7 +281,7 @@ async def record_demand_fulfillment(
                  avg_wait_time_minutes = EXCLUDED.avg_wait_time_minutes""",
             {
                 "tenant_id": tenant_id,
-                "date": date,
+                "date": datetime.date.fromisoformat(date),
                 "total_requests": total_requests,
                 "fulfilled_requests": fulfilled_requests,
                 "fulfillment_rate": round(fulfillment_rate, 2),
@@ -300,14 +301,14 @@ async def get_incentives(tenant_id: str, campaign_id: Optional[str] = None):
     """Get incentive/gift card issuance for a tenant."""
     try:
         if campaign_id:
-            rows = sql_execute(
+            rows = await async_sql_execute(
                 """SELECT * FROM incentive_tracking
                    WHERE tenant_id = :tenant_id AND campaign_id = :campaign_id
                    ORDER BY issued_at DESC""",
                 {"tenant_id": tenant_id, "campaign_id": campaign_id},
             )
         else:
-            rows = sql_execute(
+            rows = await async_sql_execute(
                 """SELECT * FROM incentive_tracking
                    WHERE tenant_id = :tenant_id
                    ORDER BY issued_at DESC""",
@@ -348,7 +349,7 @@ async def issue_incentive(
     """
     try:
         # Check for duplicate
-        existing = sql_execute(
+        existing = await async_sql_execute(
             """SELECT * FROM incentive_tracking
                WHERE rider_phone = :phone AND campaign_id = :campaign_id""",
             {"phone": rider_phone, "campaign_id": campaign_id},
@@ -362,7 +363,7 @@ async def issue_incentive(
             }
         
         # Issue new incentive
-        sql_execute(
+        await async_sql_execute(
             """INSERT INTO incentive_tracking
                (rider_phone, rider_email, rider_name, incentive_type, incentive_value, 
                 survey_id, campaign_id, tenant_id, status)
@@ -394,7 +395,7 @@ async def issue_incentive(
 async def redeem_incentive(rider_phone: str, campaign_id: str):
     """Mark an incentive as redeemed."""
     try:
-        existing = sql_execute(
+        existing = await async_sql_execute(
             """SELECT * FROM incentive_tracking
                WHERE rider_phone = :phone AND campaign_id = :campaign_id""",
             {"phone": rider_phone, "campaign_id": campaign_id},
@@ -406,7 +407,7 @@ async def redeem_incentive(rider_phone: str, campaign_id: str):
         if existing[0].get("status") == "redeemed":
             return {"status": "already_redeemed", "redeemed_at": existing[0].get("redeemed_at")}
         
-        sql_execute(
+        await async_sql_execute(
             """UPDATE incentive_tracking
                SET status = 'redeemed', redeemed_at = NOW()
                WHERE rider_phone = :phone AND campaign_id = :campaign_id""",
@@ -426,13 +427,13 @@ async def check_rider_incentive(rider_phone: str, campaign_id: Optional[str] = N
     """Check if a rider has already received an incentive."""
     try:
         if campaign_id:
-            rows = sql_execute(
+            rows = await async_sql_execute(
                 """SELECT * FROM incentive_tracking
                    WHERE rider_phone = :phone AND campaign_id = :campaign_id""",
                 {"phone": rider_phone, "campaign_id": campaign_id},
             )
         else:
-            rows = sql_execute(
+            rows = await async_sql_execute(
                 """SELECT * FROM incentive_tracking WHERE rider_phone = :phone""",
                 {"phone": rider_phone},
             )
@@ -1,41 +1,141 @@
 """
 Export routes: CSV export for surveys, transcripts, campaigns.
+
+Exports stream: rows are read through a server-side cursor EXPORT_BATCH_SIZE
+at a time and each batch is sent as a CSV chunk (gzip-compressed with
+?compress=true), so memory stays flat however large the table. A stream
+holds one pooled connection for the whole download, so at most
+EXPORT_MAX_CONCURRENT run at once and further requests get a 503.
 """
 
+import asyncio
 import csv
 import io
 import logging
-from typing import Optional
+import os
+import weakref
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
-from db import sql_execute
+from db import async_sql_execute, async_stream
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/export", tags=["export"])
 
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Leaves the rest of the async pool (DB_POOL_SIZE, 5 by default) to the other routes
+EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "2"))
+EXPORT_RETRY_AFTER_SECONDS = 30
+
+_export_slots = asyncio.Semaphore(EXPORT_MAX_CONCURRENT)
+
+
+class _ExportSlot:
+    """One taken export slot; release() is idempotent."""
+
+    def __init__(self) -> None:
+        self._held = True
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            _export_slots.release()
+
 
-def _stream_csv(rows: list, columns: list, filename: str):
-    output = io.StringIO()
-    writer = csv.writer(output)
+def _drain(buf: io.StringIO) -> bytes:
+    data = buf.getvalue()
+    buf.seek(0)
+    buf.truncate()
+    return data.encode("utf-8")
+
+
+async def _csv_chunks(
+    first: List[Dict[str, Any]], batches: AsyncIterator[List[Dict[str, Any]]], columns: list, slot: _ExportSlot,
+) -> AsyncIterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
     writer.writerow(columns)
-    for row in rows:
-        writer.writerow([row.get(c, "") for c in columns])
-    output.seek(0)
+    try:
+        for row in first:
+            writer.writerow([row.get(c, "") for c in columns])
+        yield _drain(buf)
+        async for batch in batches:
+            for row in batch:
+                writer.writerow([row.get(c, "") for c in columns])
+            yield _drain(buf)
+    except Exception as e:
+        # Headers are already sent; the truncated file is all the client can get
+        logger.error(f"Export stream failed: {e}")
+        raise
+    finally:
+        await batches.aclose()
+        slot.release()
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)  # gzip container
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+async def _stream_csv(
+    query: str,
+    params: dict,
+    columns: list,
+    filename: str,
+    compress: bool = False,
+    not_found: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream the query result as CSV. The first batch is read before the
+    response starts, so query errors still surface as a 500 and an empty
+    result raises 404 with not_found, if given. Takes one export slot,
+    released when the body finishes or fails; 503 when none is free.
+    """
+    if _export_slots.locked():
+        raise HTTPException(
+            status_code=503,
+            detail="Too many exports in progress, retry shortly",
+            headers={"Retry-After": str(EXPORT_RETRY_AFTER_SECONDS)},
+        )
+    await _export_slots.acquire()
+    slot = _ExportSlot()
+    batches = async_stream(query, params, batch_size=EXPORT_BATCH_SIZE)
+    try:
+        first = await anext(batches, None)
+        if first is None and not_found:
+            await batches.aclose()
+            raise HTTPException(status_code=404, detail=not_found)
+    except BaseException:
+        slot.release()
+        raise
+    body = _csv_chunks(first or [], batches, columns, slot)
+    # A client gone before the body starts never runs its finally; free the slot when it is dropped
+    weakref.finalize(body, slot.release)
+    media_type = "text/csv"
+    if compress:
+        body = _gzip(body)
+        filename += ".gz"
+        media_type = "application/gzip"
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        body,
+        media_type=media_type,
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
 
 
 @router.get("/surveys")
-async def export_surveys(tenant_id: Optional[str] = Query(None)):
+async def export_surveys(tenant_id: Optional[str] = Query(None), compress: bool = Query(False)):
     """Export survey responses as CSV. Optionally filter by tenant_id."""
     try:
         if tenant_id:
-            rows = sql_execute(
+            query, params = (
                 """SELECT s.id, s.template_name, s.status, s.rider_name, s.phone, s.email,
                           s.launch_date, s.completion_date, s.channel,
                           sri.question_id, q.text AS question_text, sri.raw_answer, sri.answer
@@ -47,7 +147,7 @@ async def export_surveys(tenant_id: Optional[str] = Query(None)):
                 {"tid": tenant_id},
             )
         else:
-            rows = sql_execute(
+            query, params = (
                 """SELECT s.id, s.template_name, s.status, s.rider_name, s.phone, s.email,
                           s.launch_date, s.completion_date, s.channel,
                           sri.question_id, q.text AS question_text, sri.raw_answer, sri.answer
@@ -58,18 +158,20 @@ async def export_surveys(tenant_id: Optional[str] = Query(None)):
                 {},
             )
         columns = ["id", "template_name", "status", "rider_name", "phone", "email", "launch_date", "completion_date", "channel", "question_id", "question_text", "raw_answer", "answer"]
-        return _stream_csv(rows, columns, "survey_responses.csv")
+        return await _stream_csv(query, params, columns, "survey_responses.csv", compress)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Export surveys error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/transcripts")
-async def export_transcripts(tenant_id: Optional[str] = Query(None)):
+async def export_transcripts(tenant_id: Optional[str] = Query(None), compress: bool = Query(False)):
     """Export call transcripts as CSV. Optionally filter by tenant_id via surveys."""
     try:
         if tenant_id:
-            rows = sql_execute(
+            query, params = (
                 """SELECT ct.id, ct.survey_id, ct.full_transcript, ct.call_duration_seconds,
                           ct.call_started_at, ct.call_ended_at, ct.call_status, ct.call_attempts, ct.channel
                    FROM call_transcripts ct
@@ -78,7 +180,7 @@ async def export_transcripts(tenant_id: Optional[str] = Query(None)):
                 {"tid": tenant_id},
             )
         else:
-            rows = sql_execute(
+            query, params = (
                 """SELECT id, survey_id, full_transcript, call_duration_seconds,
                           call_started_at, call_ended_at, call_status, call_attempts, channel
                    FROM call_transcripts
@@ -86,17 +188,20 @@ async def export_transcripts(tenant_id: Optional[str] = Query(None)):
                 {},
             )
         columns = ["id", "survey_id", "full_transcript", "call_duration_seconds", "call_started_at", "call_ended_at", "call_status", "call_attempts", "channel"]
-        return _stream_csv(rows, columns, "call_transcripts.csv")
+        return await _stream_csv(query, params, columns, "call_transcripts.csv", compress)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Export transcripts error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/campaign/{campaign_id}")
-async def export_campaign(campaign_id: str):
+async def export_campaign(campaign_id: str, compress: bool = Query(False)):
     """Export campaign data as CSV."""
     try:
-        rows = sql_execute(
+        columns = ["id", "template_name", "status", "rider_name", "phone", "email", "launch_date", "completion_date", "channel", "question_id", "question_text", "raw_answer", "answer"]
+        return await _stream_csv(
             """SELECT s.id, s.template_name, s.status, s.rider_name, s.phone, s.email,
                       s.launch_date, s.completion_date, s.channel,
                       sri.question_id, q.text AS question_text, sri.raw_answer, sri.answer
@@ -106,11 +211,11 @@ async def export_campaign(campaign_id: str):
                WHERE s.campaign_id = :campaign_id
                ORDER BY s.id, sri.ord""",
             {"campaign_id": campaign_id},
+            columns,
+            f"campaign_{campaign_id}.csv",
+            compress,
+            not_found=f"No data for campaign {campaign_id}",
         )
-        if not rows:
-            raise HTTPException(status_code=404, detail=f"No data for campaign {campaign_id}")
-        columns = ["id", "template_name", "status", "rider_name", "phone", "email", "launch_date", "completion_date", "channel", "question_id", "question_text", "raw_answer", "answer"]
-        return _stream_csv(rows, columns, f"campaign_{campaign_id}.csv")
     except HTTPException:
         raise
     except Exception as e:
@@ -119,25 +224,29 @@ async def export_campaign(campaign_id: str):
 
 
 @router.get("/survey/{survey_id}/responses")
-async def export_survey_responses(survey_id: str, tenant_id: Optional[str] = Query(None)):
+async def export_survey_responses(
+    survey_id: str, tenant_id: Optional[str] = Query(None), compress: bool = Query(False),
+):
     """Export single survey responses as CSV. Optionally enforce tenant_id for access control."""
     try:
-        survey = sql_execute("SELECT * FROM surveys WHERE id = :id", {"id": survey_id})
+        survey = await async_sql_execute("SELECT * FROM surveys WHERE id = :id", {"id": survey_id})
         if not survey:
             raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
         if tenant_id and survey[0].get("tenant_id") != tenant_id:
             raise HTTPException(status_code=403, detail="Survey does not belong to your organization")
 
-        rows = sql_execute(
+        columns = ["question_id", "question_text", "raw_answer", "answer", "ord"]
+        return await _stream_csv(
             """SELECT sri.question_id, q.text AS question_text, sri.raw_answer, sri.answer, sri.ord
                FROM survey_response_items sri
                JOIN questions q ON q.id = sri.question_id
                WHERE sri.survey_id = :survey_id
                ORDER BY sri.ord""",
             {"survey_id": survey_id},
+            columns,
+            f"survey_{survey_id}_responses.csv",
+            compress,
         )
-        columns = ["question_id", "question_text", "raw_answer", "answer", "ord"]
-        return _stream_csv(rows, columns, f"survey_{survey_id}_responses.csv")
     except HTTPException:
         raise
     except Exception as e:
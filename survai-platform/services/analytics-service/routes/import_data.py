@@ -11,7 +11,8 @@ from uuid import uuid4
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
 
-from db import sql_execute
+from shared.db import utc_now
+from db import async_sql_execute
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/import", tags=["import"])
@@ -43,7 +44,7 @@ async def import_riders(file: UploadFile = File(...)):
             phone = (row.get("phone") or "").strip()
             email = (row.get("email") or "").strip()
             rider_id = str(uuid4())
-            sql_execute(
+            await async_sql_execute(
                 """INSERT INTO riders (id, name, phone, email)
                    VALUES (:id, :name, :phone, :email)""",
                 {"id": rider_id, "name": name, "phone": phone or None, "email": email or None},
@@ -70,7 +71,7 @@ async def import_bulk_surveys(file: UploadFile = File(...)):
         if not rows:
             raise HTTPException(status_code=400, detail="CSV is empty or has no data rows")
 
-        template_names = sql_execute("SELECT name FROM templates WHERE status = 'Published'", {})
+        template_names = await async_sql_execute("SELECT name FROM templates WHERE status = 'Published'", {})
         valid_templates = {t["name"] for t in template_names}
 
         created = []
@@ -85,10 +86,9 @@ async def import_bulk_surveys(file: UploadFile = File(...)):
                 continue
 
             survey_id = str(uuid4())
-            from datetime import datetime, timezone
-            launch_date = datetime.now(timezone.utc).isoformat()[:19].replace("T", " ")
+            launch_date = utc_now()
 
-            sql_execute(
+            await async_sql_execute(
                 """INSERT INTO surveys (id, template_name, status, name, rider_name, phone, email, launch_date)
                    VALUES (:id, :template_name, 'In-Progress', :name, :rider_name, :phone, :email, :launch_date)""",
                 {
@@ -103,12 +103,12 @@ async def import_bulk_surveys(file: UploadFile = File(...)):
             )
 
             # Create survey_response_items from template_questions
-            tq = sql_execute(
+            tq = await async_sql_execute(
                 "SELECT question_id, ord FROM template_questions WHERE template_name = :tn ORDER BY ord",
                 {"tn": template_name},
             )
             for t in tq:
-                sql_execute(
+                await async_sql_execute(
                     """INSERT INTO survey_response_items (survey_id, question_id, ord)
                        VALUES (:survey_id, :question_id, :ord)""",
                     {"survey_id": survey_id, "question_id": t["question_id"], "ord": t["ord"]},
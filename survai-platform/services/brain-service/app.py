@@ -11,12 +11,19 @@ This means you can:
 - Monitor all AI costs from a single service
 """
 
+import sys
+
+sys.path.insert(0, "/app")
+
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+
+import llm
 from routes.brain import router as brain_router
 
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +35,8 @@ async def lifespan(app: FastAPI):
     logger.info("Brain Service starting up...")
     yield
     logger.info("Brain Service shutting down...")
+    await llm.close_client()
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -55,7 +64,12 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "OK", "service": "brain-service"}
+    return {"status": "OK", "service": "brain-service", "llm": llm.concurrency_stats()}
+
+
+@app.get("/health/db")
+async def health_db():
+    return {"service": "brain-service", "pools": pool_stats()}
 
 
 if __name__ == "__main__":
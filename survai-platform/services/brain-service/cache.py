@@ -0,0 +1,170 @@
+"""
+Content-addressed cache for LLM results.
+
+Keys are sha256(operation, model, messages, params), so the same prompt +
+inputs always maps to the same entry regardless of which caller asks.
+Two tiers:
+
+- in-process LRU (LLM_CACHE_MAX_ENTRIES, default 5000)
+- Postgres table llm_cache shared by all brain-service replicas
+
+Entries expire after LLM_CACHE_TTL_SECONDS (default 7 days). Expired rows
+are swept from Postgres at most once per LLM_CACHE_SWEEP_SECONDS. Setting
+LLM_CACHE_DB=0 keeps the cache memory-only; a DB error also just skips the
+Postgres tier for that call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from shared.db import utc_now
+from db import async_sql_execute
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+SWEEP_SECONDS = int(os.getenv("LLM_CACHE_SWEEP_SECONDS", "3600"))
+DB_ENABLED = os.getenv("LLM_CACHE_DB", "1") != "0"
+
+_MISSING = object()
+
+
+def make_key(op: str, model: str, messages: Any, params: Optional[Dict[str, Any]] = None) -> str:
+    payload = json.dumps([op, model, messages, params or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: int = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._last_sweep = time.monotonic()
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, op: str, name: str) -> None:
+        bucket = self.counters.setdefault(
+            op, {"memory_hits": 0, "db_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "db_errors": 0}
+        )
+        bucket[name] += 1
+
+    # ─── Memory tier ──────────────────────────────────────────────────────
+
+    def _memory_get(self, key: str) -> Any:
+        entry = self._lru.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._lru[key]
+            return _MISSING
+        self._lru.move_to_end(key)
+        return value
+
+    def _memory_set(self, op: str, key: str, value: Any, expires_at: float) -> None:
+        self._lru[key] = (expires_at, value)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._count(op, "evictions")
+
+    # ─── Public API ───────────────────────────────────────────────────────
+
+    async def get(self, op: str, key: str) -> Any:
+        """Cached value, or None on a miss (None is never stored)."""
+        value = self._memory_get(key)
+        if value is not _MISSING:
+            self._count(op, "memory_hits")
+            return value
+
+        if DB_ENABLED:
+            try:
+                rows = await async_sql_execute(
+                    """UPDATE llm_cache SET hits = hits + 1
+                       WHERE key = :key AND expires_at > :now
+                       RETURNING value, expires_at""",
+                    {"key": key, "now": utc_now()},
+                )
+            except Exception as e:
+                self._count(op, "db_errors")
+                logger.warning(f"llm_cache read failed: {e}")
+                rows = []
+            if rows:
+                value = rows[0]["value"]
+                remaining = (rows[0]["expires_at"] - utc_now()).total_seconds()
+                self._memory_set(op, key, value, time.time() + max(remaining, 0))
+                self._count(op, "db_hits")
+                return value
+
+        self._count(op, "misses")
+        return None
+
+    async def set(self, op: str, key: str, value: Any) -> None:
+        if value is None:
+            return
+        self._memory_set(op, key, value, time.time() + self.ttl_seconds)
+        self._count(op, "sets")
+        if not DB_ENABLED:
+            return
+
+        now = utc_now()
+        try:
+            await async_sql_execute(
+                """INSERT INTO llm_cache (key, op, value, created_at, expires_at)
+                   VALUES (:key, :op, CAST(:value AS jsonb), :now, :expires_at)
+                   ON CONFLICT (key) DO UPDATE
+                   SET value = EXCLUDED.value, created_at = EXCLUDED.created_at,
+                       expires_at = EXCLUDED.expires_at""",
+                {
+                    "key": key,
+                    "op": op,
+                    "value": json.dumps(value, ensure_ascii=False),
+                    "now": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                },
+            )
+        except Exception as e:
+            self._count(op, "db_errors")
+            logger.warning(f"llm_cache write failed: {e}")
+            return
+
+        sweeping = self._sweep_task is not None and not self._sweep_task.done()
+        if not sweeping and time.monotonic() - self._last_sweep > SWEEP_SECONDS:
+            self._sweep_task = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        try:
+            await async_sql_execute("DELETE FROM llm_cache WHERE expires_at <= :now", {"now": utc_now()})
+        except Exception as e:
+            logger.warning(f"llm_cache sweep failed: {e}")
+        finally:
+            self._last_sweep = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        totals: Dict[str, int] = {}
+        for bucket in self.counters.values():
+            for name, n in bucket.items():
+                totals[name] = totals.get(name, 0) + n
+        hits = totals.get("memory_hits", 0) + totals.get("db_hits", 0)
+        lookups = hits + totals.get("misses", 0)
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "db_enabled": DB_ENABLED,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "totals": totals,
+            "by_op": self.counters,
+        }
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,19 @@
+"""
+Database access for the Brain Service.
+Owns: llm_cache. Reads: templates (enhance-question).
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+from typing import Any, Dict, List, Union
+
+from shared.db import async_sql_execute as _async_sql_execute
+
+SERVICE_NAME = "brain-service"
+
+
+async def async_sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
+    """Non-blocking sql_execute for route handlers (asyncpg pool, see shared.db)."""
+    return await _async_sql_execute(query, params, service_name=SERVICE_NAME)
@@ -3,20 +3,34 @@ LLM Client -- single point of contact for all OpenAI API calls.
 
 Every AI operation in the system goes through these functions.
 To swap models, add caching, or add rate limiting -- change it here once.
+
+Calls run on one AsyncOpenAI client over a shared keep-alive HTTP pool, so
+an in-flight completion never blocks the event loop. LLM_MAX_CONCURRENCY
+caps how many completions are outstanding at once; callers past the cap
+wait on a semaphore instead of piling onto the OpenAI rate limit.
+
+Deterministic operations (parse, autofill, summarize, translate) go through
+_cached_content, backed by the content-addressed llm_cache (see cache.py).
 """
 
+import asyncio
 import json
 import logging
+import os
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 
+import resolver
+from cache import llm_cache, make_key
 from prompts import (
     ANALYZE_PROMPT,
     AUTOFILL_OPEN_PROMPT,
     AUTOFILL_PROMPT,
     FILTERING_PROMPT,
     MAX_SURVEY_QUESTIONS,
+    PARSE_BATCH_PROMPT,
     PARSE_PROMPT,
     PRIORITIZE_QUESTIONS_PROMPT,
     SUMMARIZE_PROMPT,
@@ -27,34 +41,103 @@ from prompts import (
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[OpenAI] = None
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "200"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+_client: Optional[AsyncOpenAI] = None
+_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_in_flight = 0
 
 
-def _get_client() -> OpenAI:
+def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = OpenAI()
+        _client = AsyncOpenAI(
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                timeout=LLM_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONCURRENCY,
+                    max_keepalive_connections=min(LLM_MAX_CONCURRENCY, 100),
+                    keepalive_expiry=60,
+                ),
+            ),
+        )
     return _client
 
 
+async def _chat(**kwargs):
+    """chat.completions.create on the shared client, bounded by LLM_MAX_CONCURRENCY."""
+    global _in_flight
+    async with _semaphore:
+        _in_flight += 1
+        try:
+            return await _get_client().chat.completions.create(**kwargs)
+        finally:
+            _in_flight -= 1
+
+
+async def _cached_content(op: str, **kwargs) -> str:
+    """
+    Completion text for a deterministic (temperature=0) call, served from
+    llm_cache when the same op/model/messages/params were seen before.
+    """
+    params = {k: v for k, v in kwargs.items() if k not in ("model", "messages")}
+    key = make_key(op, kwargs["model"], kwargs["messages"], params)
+    cached = await llm_cache.get(op, key)
+    if cached is not None:
+        return cached
+    resp = await _chat(**kwargs)
+    content = resp.choices[0].message.content
+    await llm_cache.set(op, key, content)
+    return content
+
+
+def concurrency_stats() -> Dict[str, int]:
+    """In-flight completions against the configured limit."""
+    return {"in_flight": _in_flight, "limit": LLM_MAX_CONCURRENCY}
+
+
+async def close_client() -> None:
+    """Close the shared HTTP pool (call from the FastAPI lifespan on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
 # ─── Parse ────────────────────────────────────────────────────────────────────
 
-def parse_response(
+async def parse_response(
     question: str,
     response: str,
     options: List[str],
     criteria: str = "categorical",
 ) -> Optional[str]:
     """Parse a user's natural-language answer into a structured option."""
-    client = _get_client()
+    # Obvious answers ("4", "yes", an exact option) never need the model
+    resolved = resolver.resolve(response, options, criteria)
+    if resolved is not None:
+        return resolved
+    return await _parse_with_model(question, response, options, criteria)
 
+
+async def _parse_with_model(
+    question: str,
+    response: str,
+    options: List[str],
+    criteria: str = "categorical",
+) -> Optional[str]:
     if criteria == "scale":
         options_text = f"Scale: {', '.join(options)}"
     else:
         options_text = f"Options: {', '.join(options)}"
 
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "parse",
             model="gpt-4.1",
             messages=[
                 {"role": "developer", "content": PARSE_PROMPT},
@@ -69,7 +152,7 @@ def parse_response(
             ],
             temperature=0,
         )
-        answer = resp.choices[0].message.content.strip()
+        answer = content.strip()
         if answer in options:
             return answer
         for opt in options:
@@ -81,24 +164,122 @@ def parse_response(
         return None
 
 
+async def _parse_batch_with_model(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One JSON-mode call for all items; {} if the call or the JSON fails."""
+    payload = [
+        {
+            "id": item["id"],
+            "criteria": item["criteria"],
+            "question": item["question"],
+            "response": item["response"],
+            **({"options": item["options"]} if item["criteria"] != "open" else {}),
+        }
+        for item in items
+    ]
+    try:
+        content = await _cached_content(
+            "parse_batch",
+            model="gpt-4.1",
+            messages=[
+                {"role": "developer", "content": PARSE_BATCH_PROMPT},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
+            ],
+            temperature=0,
+            response_format={"type": "json_object"},
+        )
+        answers = json.loads(content).get("answers", [])
+        return {str(a.get("id")): a.get("answer") for a in answers if isinstance(a, dict)}
+    except Exception as e:
+        logger.error(f"parse_batch error: {e}")
+        return {}
+
+
+def _validate_batch_answer(item: Dict[str, Any], answer: Any) -> Optional[str]:
+    if not isinstance(answer, str) or not answer.strip():
+        return None
+    answer = answer.strip()
+    if item["criteria"] == "open":
+        return answer
+    for opt in item["options"]:
+        if opt == answer or opt.lower() == answer.lower():
+            return opt
+    return None
+
+
+async def _parse_single(item: Dict[str, Any]) -> Optional[str]:
+    if item["criteria"] == "open":
+        return await summarize_response(item["question"], item["response"])
+    return await _parse_with_model(item["question"], item["response"], item["options"], item["criteria"])
+
+
+async def parse_batch(items: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Resolve every answer of a survey with at most one model round trip.
+
+    Items are {id, question, response, options, criteria}. Resolver hits and
+    open answers short enough to keep verbatim are settled locally; the rest
+    go to the model together in JSON mode. Items whose batch answer is
+    missing or not one of their options are re-parsed individually.
+    """
+    results: Dict[str, Optional[str]] = {}
+    pending = []
+    for item in items:
+        item = {
+            "id": str(item["id"]),
+            "question": item.get("question") or "",
+            "response": item.get("response") or "",
+            "options": list(item.get("options") or []),
+            "criteria": item.get("criteria") or "categorical",
+        }
+        if item["criteria"] in ("scale", "categorical"):
+            resolved = resolver.resolve(item["response"], item["options"], item["criteria"])
+            if resolved is not None:
+                results[item["id"]] = resolved
+                continue
+        else:
+            item["criteria"] = "open"
+            if len(item["response"]) <= 300:
+                results[item["id"]] = item["response"]
+                continue
+        pending.append(item)
+
+    if not pending:
+        return results
+
+    batch = await _parse_batch_with_model(pending)
+    retry = []
+    for item in pending:
+        answer = _validate_batch_answer(item, batch.get(item["id"]))
+        if answer is None:
+            retry.append(item)
+        else:
+            results[item["id"]] = answer
+
+    if retry:
+        logger.info(f"parse_batch: {len(retry)}/{len(pending)} items fell back to single parsing")
+        fallback = await asyncio.gather(*(_parse_single(item) for item in retry))
+        for item, answer in zip(retry, fallback):
+            results[item["id"]] = answer
+    return results
+
+
 # ─── Autofill ─────────────────────────────────────────────────────────────────
 
-def autofill_response(
+async def autofill_response(
     context: str,
     question: str,
     options: List[str],
     criteria: str = "categorical",
 ) -> Optional[str]:
     """Try to autofill an answer from rider context/biodata."""
-    client = _get_client()
-
     if criteria == "scale":
         options_text = f"Scale values: {', '.join(options)}"
     else:
         options_text = f"Options: {', '.join(options)}"
 
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "autofill",
             model="gpt-4.1",
             messages=[
                 {"role": "developer", "content": AUTOFILL_PROMPT},
@@ -113,7 +294,7 @@ def autofill_response(
             ],
             temperature=0,
         )
-        answer = resp.choices[0].message.content.strip()
+        answer = content.strip()
         if not answer:
             return None
         for opt in options:
@@ -125,11 +306,11 @@ def autofill_response(
         return None
 
 
-def autofill_open(context: str, question: str) -> Optional[str]:
+async def autofill_open(context: str, question: str) -> Optional[str]:
     """Autofill an open-ended question from context."""
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "autofill_open",
             model="gpt-4.1",
             messages=[
                 {"role": "developer", "content": AUTOFILL_OPEN_PROMPT},
@@ -143,7 +324,7 @@ def autofill_open(context: str, question: str) -> Optional[str]:
             ],
             temperature=0,
         )
-        content = resp.choices[0].message.content.strip()
+        content = content.strip()
         if content == "Cannot be determined":
             return None
         return content
@@ -154,13 +335,13 @@ def autofill_open(context: str, question: str) -> Optional[str]:
 
 # ─── Summarize ────────────────────────────────────────────────────────────────
 
-def summarize_response(question: str, response: str) -> str:
+async def summarize_response(question: str, response: str) -> str:
     """Summarize a long survey response. Returns original if <= 300 chars."""
     if len(response) <= 300:
         return response
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "summarize",
             model="gpt-4.1",
             messages=[
                 {"role": "developer", "content": SUMMARIZE_PROMPT},
@@ -171,7 +352,7 @@ def summarize_response(question: str, response: str) -> str:
             ],
             temperature=0,
         )
-        return resp.choices[0].message.content.strip()
+        return content.strip()
     except Exception as e:
         logger.error(f"summarize_response error: {e}")
         return response
@@ -179,14 +360,13 @@ def summarize_response(question: str, response: str) -> str:
 
 # ─── Sympathize ───────────────────────────────────────────────────────────────
 
-def sympathize(question: str, response: str, language: str = "en") -> str:
+async def sympathize(question: str, response: str, language: str = "en") -> str:
     """Generate an empathetic acknowledgment for a user's answer."""
-    client = _get_client()
     lang_instruction = ""
     if language == "es":
         lang_instruction = "\n\nIMPORTANT: You MUST respond ONLY in Spanish (Español)."
     try:
-        resp = client.chat.completions.create(
+        resp = await _chat(
             model="gpt-4.1-mini",
             messages=[
                 {"role": "system", "content": SYMPATHIZE_PROMPT + lang_instruction},
@@ -206,11 +386,11 @@ def sympathize(question: str, response: str, language: str = "en") -> str:
 
 # ─── Translate ────────────────────────────────────────────────────────────────
 
-def translate_text(text: str, language: str) -> str:
+async def translate_text(text: str, language: str) -> str:
     """Translate text to the target language."""
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "translate_text",
             model="gpt-4.1-mini",
             messages=[
                 {
@@ -221,20 +401,20 @@ def translate_text(text: str, language: str) -> str:
             ],
             temperature=0,
         )
-        return resp.choices[0].message.content.strip()
+        return content.strip()
     except Exception as e:
         logger.error(f"translate_text error: {e}")
         return text
 
 
-def translate_categories(categories: List[str], language: str) -> List[str]:
+async def translate_categories(categories: List[str], language: str) -> List[str]:
     """Translate a list of categories to the target language."""
     if not categories:
         return []
-    client = _get_client()
     joined = "; ".join(categories)
     try:
-        resp = client.chat.completions.create(
+        content = await _cached_content(
+            "translate_categories",
             model="gpt-4.1-mini",
             messages=[
                 {
@@ -245,7 +425,7 @@ def translate_categories(categories: List[str], language: str) -> List[str]:
             ],
             temperature=0,
         )
-        return [c.strip() for c in resp.choices[0].message.content.split(";")]
+        return [c.strip() for c in content.split(";")]
     except Exception as e:
         logger.error(f"translate_categories error: {e}")
         return categories
@@ -253,11 +433,10 @@ def translate_categories(categories: List[str], language: str) -> List[str]:
 
 # ─── Analyze ──────────────────────────────────────────────────────────────────
 
-def analyze_survey(combined_text: str) -> Dict[str, Any]:
+async def analyze_survey(combined_text: str) -> Dict[str, Any]:
     """Run post-survey AI analysis on responses + transcript."""
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
+        resp = await _chat(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": ANALYZE_PROMPT},
@@ -294,11 +473,10 @@ def analyze_survey(combined_text: str) -> Dict[str, Any]:
 
 # ─── Quick Generate ───────────────────────────────────────────────────────────
 
-def quick_generate(prompt: str) -> str:
+async def quick_generate(prompt: str) -> str:
     """Quick single-turn generation for short tasks like greetings."""
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
+        resp = await _chat(
             model="gpt-4.1-mini",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
@@ -319,7 +497,7 @@ def filter_question(biodata: str, question: str) -> str:
 
 # ─── Question Prioritization ─────────────────────────────────────────────────
 
-def prioritize_questions(
+async def prioritize_questions(
     questions: List[Dict],
     max_count: int = MAX_SURVEY_QUESTIONS,
     rider_context: str = "",
@@ -332,8 +510,6 @@ def prioritize_questions(
     if len(questions) <= max_count:
         return [q["id"] for q in questions]
 
-    client = _get_client()
-
     questions_desc = []
     for q in questions:
         desc = f"ID: {q['id']} | Type: {q.get('criteria', 'open')} | Text: {q['text']}"
@@ -352,7 +528,7 @@ def prioritize_questions(
         user_msg += f"\n\nRIDER CONTEXT (use to determine relevance):\n{rider_context}"
 
     try:
-        resp = client.chat.completions.create(
+        resp = await _chat(
             model="gpt-4.1-mini",
             messages=[
                 {"role": "system", "content": PRIORITIZE_QUESTIONS_PROMPT},
@@ -22,6 +22,22 @@ PARSE_PROMPT = (
     "- Return ONLY the matched option text, nothing else"
 )
 
+PARSE_BATCH_PROMPT = (
+    "You are an expert survey response interpreter. You receive every answer "
+    "from one survey as a JSON list of items with id, criteria, question, "
+    "response and (for scale/categorical) options.\n\n"
+    "RULES:\n"
+    "- scale / categorical: map the response to the closest option, using the "
+    "same judgement as for a single answer (semantic meaning, synonyms, "
+    "indirect answers). The answer MUST be copied exactly from that item's options\n"
+    "- open: summarize the response in 1-2 sentences, preserving key sentiment "
+    "and specific details, without adding interpretation\n"
+    "- NEVER make up information -- only use what the user said\n"
+    "- Answer every item exactly once\n\n"
+    "Return ONLY a JSON object of the form "
+    "{\"answers\": [{\"id\": \"<item id>\", \"answer\": \"<answer>\"}]}"
+)
+
 # ─── Autofill ─────────────────────────────────────────────────────────────────
 
 AUTOFILL_PROMPT = (
@@ -0,0 +1,269 @@
+"""
+Deterministic fast path for answer parsing.
+
+Most phone answers are trivially mappable ("4", "yes", "Very satisfied"),
+so parse_response tries these rules before spending a model call:
+
+- scale: an answer that is just one in-range number (digits or EN/ES
+  number words), optionally "out of N" or after a lead-in like "I'd say"
+- categorical: normalized exact match, yes/no synonyms (EN + ES),
+  whole-phrase containment, or a close typo match that does not negate
+  the option ("unsatisfied" is not "Satisfied")
+- anything ambiguous returns None and falls through to the LLM
+
+Hit/miss counters per criteria are exposed via resolver_stats().
+"""
+
+import re
+import threading
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+FUZZY_THRESHOLD = 0.88
+FUZZY_MARGIN = 0.08
+
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "cero": 0, "uno": 1, "una": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5,
+    "seis": 6, "siete": 7, "ocho": 8, "nueve": 9, "diez": 10,
+}
+
+YES_PHRASES = {
+    "yes", "yeah", "yep", "yup", "sure", "of course", "absolutely", "definitely",
+    "correct", "that is right", "thats right",
+    "si", "claro", "claro que si", "por supuesto", "desde luego", "correcto",
+    "asi es", "exacto", "afirmativo", "si senor", "si senora",
+}
+NO_PHRASES = {
+    "no", "nope", "nah", "not really", "never",
+    "absolutely not", "definitely not", "no thanks", "no thank you",
+    "nunca", "para nada", "no gracias", "claro que no", "de ninguna manera", "tampoco",
+}
+YES_WORDS = {p for p in YES_PHRASES if " " not in p}
+YES_OPTIONS = {"yes", "si"}
+NO_OPTIONS = {"no"}
+
+# Words that flip the meaning of an option found inside a longer answer
+NEGATIONS = {"not", "no", "never", "dont", "didnt", "wasnt", "isnt", "arent", "werent", "nunca", "ni", "tampoco"}
+# "no se", "not sure", "i dont know" -- hedges that must go to the model
+UNSURE = {"know", "idea", "maybe", "perhaps", "depends", "se", "sabe", "quizas", "depende", "tal"}
+# Nouns after which "no" is a determiner, not an answer: "no problems at all"
+NO_DETERMINED = {
+    "problem", "problems", "issue", "issues", "complaint", "complaints", "trouble", "worries",
+    "problema", "problemas", "queja", "quejas", "inconveniente", "inconvenientes",
+}
+# Prefixes that negate a word: "unsatisfied", "dissatisfied", "insatisfecho", "descontento"
+NEGATING_PREFIXES = ("un", "dis", "in", "im", "non", "des")
+# Lead-ins allowed before a bare score: "I'd say 4", "I'd give it a five", "le doy un cuatro"
+SCORE_LEAD_INS = (
+    "i would give it", "id give it", "i give it", "give it", "i would say", "id say",
+    "it is", "its", "yo diria que", "yo diria", "diria que", "diria", "le daria", "le doy",
+)
+ARTICLES = {"a", "an", "un"}
+
+# "4 out of 5", "cuatro de cinco", "4/5" -- group 1 or 2 is the stated denominator
+_SCALE_OUT_OF = re.compile(
+    r"\b(?:out of|de|sobre)\s+(\d+|" + "|".join(NUMBER_WORDS) + r")\b|/\s*(\d+)"
+)
+_NUMBER = re.compile(r"\b\d+(?:[.,]\d+)?\b")
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower().replace("'", "").replace("’", "")
+    text = re.sub(r"[^\w\s./]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _record(criteria: str, hit: bool) -> None:
+    with _lock:
+        bucket = _stats.setdefault(criteria, {"hits": 0, "misses": 0})
+        bucket["hits" if hit else "misses"] += 1
+
+
+def resolver_stats() -> Dict[str, Dict[str, float]]:
+    """Per-criteria hits, misses and hit_rate since process start."""
+    with _lock:
+        out = {}
+        for criteria, bucket in _stats.items():
+            total = bucket["hits"] + bucket["misses"]
+            out[criteria] = {
+                **bucket,
+                "hit_rate": round(bucket["hits"] / total, 4) if total else 0.0,
+            }
+        return out
+
+
+# ─── Scale ────────────────────────────────────────────────────────────────────
+
+def _bare_number(text: str) -> Optional[str]:
+    """The answer's only token once a lead-in and article are dropped, else None."""
+    for lead in SCORE_LEAD_INS:
+        if text.startswith(lead + " "):
+            text = text[len(lead) + 1:]
+            break
+    words = text.split()
+    if len(words) == 2 and words[0] in ARTICLES:
+        words = words[1:]
+    return words[0] if len(words) == 1 else None
+
+
+def resolve_scale(response: str, options: List[str]) -> Optional[str]:
+    """
+    Return the option when the whole answer is one in-range number, else
+    None: numbers inside longer answers ("one hundred percent", "I had 2
+    rides") are left to the model, and so are scores out of another maximum
+    ("5 out of 10" on a 1-5 scale).
+    """
+    allowed = {}
+    for opt in options:
+        try:
+            allowed[int(str(opt).strip())] = opt
+        except ValueError:
+            continue
+    if not allowed:
+        return None
+
+    text = normalize(response)
+    for match in _SCALE_OUT_OF.finditer(text):
+        denominator = match.group(1) or match.group(2)
+        scale_max = NUMBER_WORDS[denominator] if denominator in NUMBER_WORDS else int(denominator)
+        if scale_max != max(allowed):
+            return None  # "5 out of 10" on a 1-5 scale -- let the model rescale it
+    text = " ".join(_SCALE_OUT_OF.sub(" ", text).split())
+    token = _bare_number(text)
+    if token is None:
+        return None
+    if token in NUMBER_WORDS:
+        value = NUMBER_WORDS[token]
+    elif _NUMBER.fullmatch(token):
+        num = float(token.replace(",", "."))
+        if num != int(num):
+            return None  # "3.5" -- let the model decide how to round
+        value = int(num)
+    else:
+        return None
+    return allowed.get(value)
+
+
+# ─── Categorical ──────────────────────────────────────────────────────────────
+
+def _polarity(answer: str) -> Optional[str]:
+    if set(answer.split()) & UNSURE:
+        return None
+    if answer in YES_PHRASES:
+        return "yes"
+    if answer in NO_PHRASES:
+        return "no"
+    words = answer.split()
+    # Leading synonym ("yes it was on time", "no it was late") counts only if
+    # nothing later contradicts it: a negation after yes, a bare yes after no
+    for n in (3, 2, 1):
+        head, rest = " ".join(words[:n]), set(words[n:])
+        if head in NO_PHRASES:
+            if words[n:n + 1] and words[n] in NO_DETERMINED:
+                return None  # "no problems at all"
+            if rest & YES_WORDS and not (rest & NEGATIONS):
+                return None  # "no, yes"
+            return "no"
+        if head in YES_PHRASES and not (rest & NEGATIONS):
+            return "yes"
+    return None
+
+
+def _resolve_yes_no(answer: str, normalized_options: Dict[str, str]) -> Optional[str]:
+    yes = next((o for n, o in normalized_options.items() if n in YES_OPTIONS), None)
+    no = next((o for n, o in normalized_options.items() if n in NO_OPTIONS), None)
+    if not (yes and no):
+        return None
+    polarity = _polarity(answer)
+    if polarity == "yes":
+        return yes
+    if polarity == "no":
+        return no
+    return None
+
+
+def _resolve_contained(answer: str, normalized_options: Dict[str, str]) -> Optional[str]:
+    words = set(answer.split())
+    if words & NEGATIONS:
+        return None
+    padded = f" {answer} "
+    found = [n for n in normalized_options if n and f" {n} " in padded]
+    # "very satisfied" also contains "satisfied"; keep only the longest phrases
+    found = [n for n in found if not any(n != m and f" {n} " in f" {m} " for m in found)]
+    if len(found) == 1:
+        return normalized_options[found[0]]
+    return None
+
+
+def _negates(answer: str, option: str) -> bool:
+    """True if the answer has a negation word, or an option word behind a negating prefix."""
+    words = answer.split()
+    if set(words) & NEGATIONS:
+        return True
+    option_words = set(option.split())
+    for word in words:
+        if word in option_words:
+            continue
+        for prefix in NEGATING_PREFIXES:
+            if not word.startswith(prefix) or len(word) <= len(prefix):
+                continue
+            stem = word[len(prefix):]
+            if any(
+                not o.startswith(prefix) and SequenceMatcher(None, stem, o).ratio() >= FUZZY_THRESHOLD
+                for o in option_words
+            ):
+                return True
+    return False
+
+
+def _resolve_fuzzy(answer: str, normalized_options: Dict[str, str]) -> Optional[str]:
+    scored = sorted(
+        ((SequenceMatcher(None, answer, n).ratio(), n) for n in normalized_options if n),
+        reverse=True,
+    )
+    if not scored or scored[0][0] < FUZZY_THRESHOLD:
+        return None
+    if len(scored) > 1 and scored[0][0] - scored[1][0] < FUZZY_MARGIN:
+        return None
+    if _negates(answer, scored[0][1]):
+        return None
+    return normalized_options[scored[0][1]]
+
+
+def resolve_categorical(response: str, options: List[str]) -> Optional[str]:
+    """Map an answer onto one option without the LLM, or None if unsure."""
+    answer = normalize(response)
+    if not answer or not options:
+        return None
+    normalized_options = {normalize(o): o for o in options}
+
+    if answer in normalized_options:
+        return normalized_options[answer]
+    return (
+        _resolve_yes_no(answer, normalized_options)
+        or _resolve_contained(answer, normalized_options)
+        or _resolve_fuzzy(answer, normalized_options)
+    )
+
+
+# ─── Entry point ──────────────────────────────────────────────────────────────
+
+def resolve(response: str, options: List[str], criteria: str = "categorical") -> Optional[str]:
+    """Try the deterministic rules for this criteria; None means ask the model."""
+    if criteria == "scale":
+        answer = resolve_scale(response, options)
+    elif criteria == "categorical":
+        answer = resolve_categorical(response, options)
+    else:
+        return None
+    _record(criteria, answer is not None)
+    return answer
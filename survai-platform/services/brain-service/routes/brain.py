@@ -12,6 +12,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 import llm
+import resolver
+from cache import llm_cache
+from db import async_sql_execute
 from prompts import (
     AGENT_SYSTEM_PROMPT_TEMPLATE,
     MAX_SURVEY_QUESTIONS,
@@ -36,6 +39,19 @@ class ParseRequest(BaseModel):
 class ParseResponse(BaseModel):
     answer: Optional[str]
 
+class ParseBatchItem(BaseModel):
+    id: str
+    question: str
+    response: str = ""
+    options: List[str] = []
+    criteria: str = "categorical"
+
+class ParseBatchRequest(BaseModel):
+    items: List[ParseBatchItem]
+
+class ParseBatchResponse(BaseModel):
+    answers: Dict[str, Optional[str]]
+
 class AutofillRequest(BaseModel):
     context: str
     question: str
@@ -106,21 +122,42 @@ class SystemPromptRequest(BaseModel):
 async def parse_endpoint(req: ParseRequest):
     """Parse a user's natural-language answer into a structured option."""
     try:
-        answer = llm.parse_response(req.question, req.response, req.options, req.criteria)
+        answer = await llm.parse_response(req.question, req.response, req.options, req.criteria)
         return ParseResponse(answer=answer)
     except Exception as e:
         logger.error(f"Parse error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/parse-batch", response_model=ParseBatchResponse)
+async def parse_batch_endpoint(req: ParseBatchRequest):
+    """Parse all answers of a survey in one LLM call (open answers are summarized)."""
+    try:
+        answers = await llm.parse_batch([item.model_dump() for item in req.items])
+        return ParseBatchResponse(answers=answers)
+    except Exception as e:
+        logger.error(f"Parse batch error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def stats_endpoint():
+    """Fast-path resolver hit rates, LLM cache counters and LLM concurrency."""
+    return {
+        "resolver": resolver.resolver_stats(),
+        "cache": llm_cache.stats(),
+        "llm": llm.concurrency_stats(),
+    }
+
+
 @router.post("/autofill", response_model=AutofillResponse)
 async def autofill_endpoint(req: AutofillRequest):
     """Autofill an answer from context/biodata."""
     try:
         if req.criteria == "open":
-            answer = llm.autofill_open(req.context, req.question)
+            answer = await llm.autofill_open(req.context, req.question)
         else:
-            answer = llm.autofill_response(req.context, req.question, req.options, req.criteria)
+            answer = await llm.autofill_response(req.context, req.question, req.options, req.criteria)
         return AutofillResponse(answer=answer)
     except Exception as e:
         logger.error(f"Autofill error: {e}")
@@ -131,7 +168,7 @@ async def autofill_endpoint(req: AutofillRequest):
 async def summarize_endpoint(req: SummarizeRequest):
     """Summarize a long survey response."""
     try:
-        summary = llm.summarize_response(req.question, req.response)
+        summary = await llm.summarize_response(req.question, req.response)
         return SummarizeResponse(summary=summary)
     except Exception as e:
         logger.error(f"Summarize error: {e}")
@@ -142,7 +179,7 @@ async def summarize_endpoint(req: SummarizeRequest):
 async def sympathize_endpoint(req: SympathizeRequest):
     """Generate empathetic acknowledgment for a user's answer."""
     try:
-        message = llm.sympathize(req.question, req.response, language=req.language)
+        message = await llm.sympathize(req.question, req.response, language=req.language)
         return SympathizeResponse(message=message)
     except Exception as e:
         logger.error(f"Sympathize error: {e}")
@@ -153,7 +190,7 @@ async def sympathize_endpoint(req: SympathizeRequest):
 async def translate_endpoint(req: TranslateRequest):
     """Translate text to a target language."""
     try:
-        translated = llm.translate_text(req.text, req.language)
+        translated = await llm.translate_text(req.text, req.language)
         return TranslateResponse(translated=translated)
     except Exception as e:
         logger.error(f"Translate error: {e}")
@@ -164,7 +201,7 @@ async def translate_endpoint(req: TranslateRequest):
 async def translate_categories_endpoint(req: TranslateCategoriesRequest):
     """Translate a list of categories."""
     try:
-        translated = llm.translate_categories(req.categories, req.language)
+        translated = await llm.translate_categories(req.categories, req.language)
         return TranslateCategoriesResponse(translated=translated)
     except Exception as e:
         logger.error(f"Translate categories error: {e}")
@@ -175,7 +212,7 @@ async def translate_categories_endpoint(req: TranslateCategoriesRequest):
 async def analyze_endpoint(req: AnalyzeRequest):
     """Run post-survey AI analysis."""
     try:
-        result = llm.analyze_survey(req.combined_text)
+        result = await llm.analyze_survey(req.combined_text)
         return AnalyzeResponse(**result)
     except Exception as e:
         logger.error(f"Analyze error: {e}")
@@ -186,7 +223,7 @@ async def analyze_endpoint(req: AnalyzeRequest):
 async def prioritize_questions_endpoint(req: PrioritizeRequest):
     """Select and prioritize the most important questions using AI."""
     try:
-        selected_ids = llm.prioritize_questions(
+        selected_ids = await llm.prioritize_questions(
             req.questions, req.max_count, req.rider_context
         )
         return {"selected_ids": selected_ids, "count": len(selected_ids)}
@@ -247,7 +284,7 @@ async def build_system_prompt_endpoint(req: SystemPromptRequest):
         if len(questions) > MAX_SURVEY_QUESTIONS:
             try:
                 rider_ctx = rider_context if rider_data else ""
-                selected_ids = llm.prioritize_questions(questions, MAX_SURVEY_QUESTIONS, rider_ctx)
+                selected_ids = await llm.prioritize_questions(questions, MAX_SURVEY_QUESTIONS, rider_ctx)
                 selected_set = set(selected_ids)
                 questions = [q for q in questions if q["id"] in selected_set]
             except Exception:
@@ -322,8 +359,7 @@ async def enhance_question_endpoint(req: dict):
         # Check if the survey has AI augmentation enabled
         template_name = context.get("template_name", "")
         if template_name:
-            from db import sql_execute
-            template = sql_execute(
+            template = await async_sql_execute(
                 "SELECT ai_augmented FROM templates WHERE name = :name",
                 {"name": template_name}
             )
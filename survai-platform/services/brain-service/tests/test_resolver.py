@@ -0,0 +1,93 @@
+"""Deterministic answer resolver: cases that must resolve, and cases that must go to the model."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resolver import resolve_categorical, resolve_scale  # noqa: E402
+
+SCALE = ["1", "2", "3", "4", "5"]
+YES_NO = ["Yes", "No"]
+SATISFACTION = ["Very satisfied", "Satisfied", "Neutral", "Dissatisfied"]
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("4", "4"),
+    ("four", "4"),
+    ("cuatro", "4"),
+    ("4 out of 5", "4"),
+    ("4/5", "4"),
+    ("cuatro de cinco", "4"),
+    ("I'd say 4", "4"),
+    ("I'd give it a five", "5"),
+    ("5.0", "5"),
+])
+def test_scale_bare_number(answer, expected):
+    assert resolve_scale(answer, SCALE) == expected
+
+
+@pytest.mark.parametrize("answer", [
+    "one hundred percent",
+    "I had 2 rides and it was fine",
+    "no one helped me",
+    "3.5",
+    "two or three",
+    "9",
+])
+def test_scale_number_inside_longer_answer_goes_to_model(answer):
+    assert resolve_scale(answer, SCALE) is None
+
+
+@pytest.mark.parametrize("answer", [
+    "5 out of 10",
+    "1 out of 10",
+    "4/10",
+    "cinco de diez",
+])
+def test_scale_out_of_another_maximum_goes_to_model(answer):
+    assert resolve_scale(answer, SCALE) is None
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("yes", "Yes"),
+    ("yes it was on time", "Yes"),
+    ("sí, claro", "Yes"),
+    ("no", "No"),
+    ("no it was late", "No"),
+    ("no, absolutely not", "No"),
+    ("no gracias", "No"),
+])
+def test_yes_no(answer, expected):
+    assert resolve_categorical(answer, YES_NO) == expected
+
+
+@pytest.mark.parametrize("answer", [
+    "no, yes",
+    "no problems at all",
+    "yes, it was not on time",
+    "no sé",
+])
+def test_yes_no_contradicted_goes_to_model(answer):
+    assert resolve_categorical(answer, YES_NO) is None
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("very satisfied", "Very satisfied"),
+    ("satisfied", "Satisfied"),
+    ("satisifed", "Satisfied"),
+    ("dissatisfied", "Dissatisfied"),
+])
+def test_categorical_match(answer, expected):
+    assert resolve_categorical(answer, SATISFACTION) == expected
+
+
+@pytest.mark.parametrize("answer", [
+    "unsatisfied",
+    "not satisfied",
+    "insatisfied",
+])
+def test_negated_option_is_not_fuzzy_matched(answer):
+    assert resolve_categorical(answer, SATISFACTION) is None
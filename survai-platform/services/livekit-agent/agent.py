@@ -16,7 +16,6 @@ import asyncio
 import os
 import json
 from datetime import datetime
-import aiohttp
 
 from livekit import api
 from livekit.agents import (
@@ -67,13 +66,31 @@ from agents import (
     SpanishQuestionsAgent,
 )
 from tools.survey_tools import create_survey_tools
+from utils import outbox
 from utils.logging import get_logger, setup_survey_logging, cleanup_survey_logging
-from utils.metrics_logger import log_pipeline_metrics
+from utils.metrics_logger import CallLatency, finish_call_latency, log_pipeline_metrics
 from utils.storage import create_empty_response_dict
 from utils.recording import start_call_recording, stop_call_recording
+from utils.transcript import build_transcript_payload, has_content, post_transcript
 
 logger = get_logger()
 VOICE_SERVICE_URL = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
+CALL_LEASE_RENEW_SECONDS = int(os.getenv("CALL_LEASE_RENEW_SECONDS", "60"))
+
+# SIP final response codes → end_reason reported for a call that was never answered
+SIP_BUSY_CODES = {"486", "600", "603"}
+SIP_NO_ANSWER_CODES = {"408", "480", "487"}
+
+
+def _dial_failure_reason(error: Exception) -> str:
+    """busy / no_answer / dial_failed from the SIP status LiveKit attaches to the error."""
+    code = str((getattr(error, "metadata", None) or {}).get("sip_status_code", ""))
+    if code in SIP_BUSY_CODES:
+        return "busy"
+    if code in SIP_NO_ANSWER_CODES:
+        return "no_answer"
+    return "dial_failed"
+
 
 MINIMAL_GREETER_PROMPT = (
     "You are Cameron, a warm and professional survey caller. "
@@ -103,28 +120,37 @@ async def entrypoint(ctx: JobContext):
     phone_number = metadata.get("phone_number")
     survey_id = metadata.get("survey_id")
 
+    # Callbacks for this call go through the durable outbox and are delivered in order
+    outbox_key = survey_id or phone_number or ctx.room.name
+
     async def _voice_service_post(endpoint: str, params: dict) -> None:
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{VOICE_SERVICE_URL}/api/voice/{endpoint}",
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=8),
-                ) as resp:
-                    if resp.status != 200:
-                        logger.warning(f"{endpoint} returned {resp.status}: {await resp.text()}")
-        except Exception as e:
-            logger.warning(f"Failed to call {endpoint} for survey {survey_id}: {e}")
+        queued = await outbox.outbox_for(outbox_key).enqueue(
+            f"{VOICE_SERVICE_URL}/api/voice/{endpoint}", params=params,
+        )
+        if not queued:
+            logger.warning(f"Could not queue {endpoint} for survey {survey_id}, sent directly")
+
+    lease_task: asyncio.Task | None = None
+
+    async def _renew_call_lease() -> None:
+        """Heartbeat the voice-service reservation while the call is live."""
+        while True:
+            await asyncio.sleep(CALL_LEASE_RENEW_SECONDS)
+            await _voice_service_post("renew-call", {"survey_id": survey_id})
 
     async def release_call_lock() -> None:
+        if lease_task:
+            lease_task.cancel()
         if not survey_id and not phone_number:
             return
         await _voice_service_post("release-call", {"survey_id": survey_id or "", "phone": phone_number or ""})
 
     async def confirm_call_lock() -> None:
+        nonlocal lease_task
         if not survey_id:
             return
         await _voice_service_post("confirm-call", {"survey_id": survey_id or "", "phone": phone_number or ""})
+        lease_task = asyncio.create_task(_renew_call_lease())
 
     await ctx.connect(auto_subscribe=AutoSubscribe.AUDIO_ONLY)
 
@@ -150,8 +176,13 @@ async def entrypoint(ctx: JobContext):
             logger.info(f"Answered: {phone_number}")
             await confirm_call_lock()
         except Exception as e:
-            logger.error(f"Call to {phone_number} failed: {e}")
+            reason = _dial_failure_reason(e)
+            logger.error(f"Call to {phone_number} failed ({reason}): {e}")
+            if survey_id:
+                # Lets the scheduler's retry policy see busy / no-answer separately
+                await _voice_service_post("complete-survey", {"survey_id": survey_id, "reason": reason})
             await release_call_lock()
+            await outbox.close_outbox(outbox_key)
             return
         participant = await ctx.wait_for_participant()
         caller_number = phone_number
@@ -481,9 +512,11 @@ async def entrypoint(ctx: JobContext):
         except Exception as e:
             logger.warning("[conversation_item_added] %s", e, exc_info=False)
 
+    call_latency = CallLatency()
+
     @session.on("metrics_collected")
     def _on_metrics(ev) -> None:
-        log_pipeline_metrics(ev.metrics)
+        log_pipeline_metrics(ev.metrics, call_latency)
 
     @session.on("agent_state_changed")
     def _on_agent_state(ev) -> None:
@@ -536,6 +569,9 @@ async def entrypoint(ctx: JobContext):
         )
     finally:
         audio_url = await stop_call_recording(recording_handle, ctx.api)
+        final_language = getattr(call_data, "detected_language", None) or call_language
+        call_latency.voice = TTS_VOICE_ID_ES if final_language == "es" else TTS_VOICE_ID
+        survey_responses["latency"] = await finish_call_latency(call_latency, final_language)
 
         if survey_id and not survey_responses.get("_finalized"):
             reason = survey_responses.get("end_reason") or "disconnected"
@@ -556,37 +592,11 @@ async def entrypoint(ctx: JobContext):
             except Exception as e:
                 logger.warning(f"Failed to finalize survey on exit: {e}")
 
-            convo_log = survey_responses.get("_conversation_log", [])
-            transcript_lines = []
-            if convo_log:
-                for entry in convo_log:
-                    role_label = "AGENT" if entry["role"] == "agent" else "CALLER"
-                    transcript_lines.append(
-                        f'[{entry["ts"]}] {role_label}: {entry["text"]}'
-                    )
-                answers_section = []
-                for qid, ans in survey_responses.get("answers", {}).items():
-                    answers_section.append(f"  Q[{qid}]: {ans}")
-                if answers_section:
-                    transcript_lines.append("\n--- RECORDED ANSWERS ---")
-                    transcript_lines.extend(answers_section)
-            else:
-                for qid, ans in survey_responses.get("answers", {}).items():
-                    transcript_lines.append(f"Q[{qid}]: {ans}")
-
-            if transcript_lines:
-                store_params = {
-                    "survey_id": survey_id,
-                    "full_transcript": "\n".join(transcript_lines),
-                    "call_duration_seconds": str(int(call_duration)),
-                    "call_status": reason,
-                }
-                if audio_url:
-                    store_params["audio_url"] = audio_url
-                try:
-                    await _voice_service_post("store-transcript", store_params)
-                except Exception as e:
-                    logger.warning(f"Failed to store transcript on exit: {e}")
+            transcript_payload = build_transcript_payload(
+                survey_id, survey_responses, call_duration, reason, audio_url=audio_url,
+            )
+            if has_content(transcript_payload):
+                await post_transcript(transcript_payload)
 
             try:
                 from utils.storage import save_survey_responses
@@ -595,6 +605,7 @@ async def entrypoint(ctx: JobContext):
             except Exception as e:
                 logger.warning(f"Failed to save responses on exit: {e}")
         await release_call_lock()
+        await outbox.close_outbox(outbox_key)
 
 
 if __name__ == "__main__":
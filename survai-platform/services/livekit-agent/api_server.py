@@ -10,6 +10,7 @@ Usage:
 Endpoints:
     POST /call   — dispatch the survey agent and place an outbound call
     GET  /health — liveness check
+    GET  /metrics — worker latency histograms (Prometheus text format)
 """
 
 import json
@@ -18,9 +19,12 @@ import random
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from livekit import api as lkapi_module
 from pydantic import BaseModel
 
+from utils.metrics_logger import render_prometheus
+
 load_dotenv()
 
 app = FastAPI(title="Survey Bot Call API")
@@ -63,3 +67,9 @@ async def trigger_call(req: CallRequest):
 def health():
     """Liveness check."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Per-stage turn latency histograms aggregated over the worker's calls."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1 @@
+"""Offline latency benchmark support: fake providers and scripted conversations."""
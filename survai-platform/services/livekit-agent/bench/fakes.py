@@ -0,0 +1,185 @@
+"""
+Local stand-ins for the STT / LLM / TTS providers, with configurable latency.
+
+FakeLLM is a real livekit LLM plugin: AgentSession drives it exactly like
+openai.LLM, so tool calls run the actual survey tools and agent handoffs.
+Its time to first token grows with the prompt size (ttft_ms plus
+ttft_per_1k_tokens_ms per 1,000 estimated prompt tokens) and the reply
+then streams at tokens_per_second. Replies come from the scenario script;
+when the script runs dry it reads the next question out of the last
+record_answer() output, like the production prompt instructs.
+
+The harness runs AgentSession in text mode (no room, no audio), so speech
+recognition and synthesis are modelled by FakeSTT / FakeTTS: each sleeps
+for its configured latency where the real plugin would deliver the final
+transcript or the first audio frame.
+"""
+
+import asyncio
+import json
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from livekit.agents import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions, llm
+
+_NEXT_QUESTION = re.compile(r'Ask VERBATIM: "([^"]+)"')
+
+
+@dataclass
+class LatencyProfile:
+    stt_ms: float = 150.0             # end of speech → final transcript
+    eou_ms: float = 300.0             # end-of-utterance / endpointing delay
+    ttft_ms: float = 350.0            # LLM time to first token, empty prompt
+    ttft_per_1k_tokens_ms: float = 40.0
+    tokens_per_second: float = 80.0
+    tts_ttfb_ms: float = 200.0        # text in → first audio out
+    jitter: float = 0.1               # ± fraction applied to every latency
+
+    def sample(self, ms: float) -> float:
+        return max(0.0, ms * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+@dataclass
+class LLMStep:
+    """One scripted LLM response: plain text, or a single tool call."""
+    text: str = ""
+    tool: str = ""
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def say(text: str) -> LLMStep:
+    return LLMStep(text=text)
+
+
+def call(tool: str, **args) -> LLMStep:
+    return LLMStep(tool=tool, args=args)
+
+
+def estimate_tokens(chat_ctx: llm.ChatContext) -> int:
+    """Rough prompt size (4 chars per token) of everything the LLM would be sent."""
+    chars = 0
+    for item in chat_ctx.items:
+        if item.type == "message":
+            chars += len(item.text_content or "")
+        elif item.type == "function_call":
+            chars += len(item.name) + len(item.arguments)
+        elif item.type == "function_call_output":
+            chars += len(item.output)
+    return chars // 4
+
+
+@dataclass
+class LLMCall:
+    prompt_tokens: int
+    ttft_ms: float
+    step: LLMStep
+
+
+class FakeLLM(llm.LLM):
+    def __init__(self, profile: LatencyProfile):
+        super().__init__()
+        self.profile = profile
+        self._script: List[LLMStep] = []
+        self.calls: List[LLMCall] = []
+
+    @property
+    def model(self) -> str:
+        return "fake-llm"
+
+    @property
+    def provider(self) -> str:
+        return "bench"
+
+    def load(self, steps: List[LLMStep]) -> None:
+        """Script the responses for the next user turn and reset the call log."""
+        self._script = list(steps)
+        self.calls = []
+
+    def next_step(self, chat_ctx: llm.ChatContext) -> LLMStep:
+        if self._script:
+            return self._script.pop(0)
+        last = chat_ctx.items[-1] if chat_ctx.items else None
+        if last is not None and last.type == "function_call_output":
+            match = _NEXT_QUESTION.search(last.output)
+            if match:
+                return say(match.group(1))
+        return say("Okay.")
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: Optional[list] = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        **kwargs,
+    ) -> "FakeLLMStream":
+        return FakeLLMStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class FakeLLMStream(llm.LLMStream):
+    async def _run(self) -> None:
+        fake: FakeLLM = self._llm
+        profile = fake.profile
+        step = fake.next_step(self._chat_ctx)
+        prompt_tokens = estimate_tokens(self._chat_ctx)
+        ttft_ms = profile.sample(profile.ttft_ms + profile.ttft_per_1k_tokens_ms * prompt_tokens / 1000)
+        fake.calls.append(LLMCall(prompt_tokens=prompt_tokens, ttft_ms=ttft_ms, step=step))
+        request_id = f"bench-{uuid.uuid4().hex[:8]}"
+
+        await asyncio.sleep(ttft_ms / 1000)
+        if step.tool:
+            arguments = json.dumps(step.args)
+            self._event_ch.send_nowait(llm.ChatChunk(
+                id=request_id,
+                delta=llm.ChoiceDelta(
+                    role="assistant",
+                    tool_calls=[llm.FunctionToolCall(
+                        name=step.tool, arguments=arguments, call_id=f"call_{uuid.uuid4().hex[:8]}",
+                    )],
+                ),
+            ))
+            completion_tokens = max(1, len(arguments) // 4)
+        else:
+            words = step.text.split(" ")
+            for i, word in enumerate(words):
+                if i:
+                    await asyncio.sleep(1 / profile.tokens_per_second)
+                self._event_ch.send_nowait(llm.ChatChunk(
+                    id=request_id,
+                    delta=llm.ChoiceDelta(role="assistant", content=word if i == 0 else f" {word}"),
+                ))
+            completion_tokens = len(words)
+
+        self._event_ch.send_nowait(llm.ChatChunk(
+            id=request_id,
+            usage=llm.CompletionUsage(
+                completion_tokens=completion_tokens,
+                prompt_tokens=prompt_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        ))
+
+
+class FakeSTT:
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+
+    async def transcribe(self, text: str) -> float:
+        """Wait as long as the final transcript would take; returns the delay in ms."""
+        delay = self.profile.sample(self.profile.stt_ms)
+        await asyncio.sleep(delay / 1000)
+        return delay
+
+
+class FakeTTS:
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+
+    async def first_audio(self, text: str) -> float:
+        """Wait until the first audio frame would be ready; returns the delay in ms."""
+        delay = self.profile.sample(self.profile.tts_ttfb_ms)
+        await asyncio.sleep(delay / 1000)
+        return delay
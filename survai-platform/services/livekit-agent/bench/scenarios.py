@@ -0,0 +1,90 @@
+"""
+Scripted conversations for the latency benchmark.
+
+Each Turn is what the caller says plus the LLM responses for that turn, in
+order (one per LLM request, so a record_answer() round trip is a tool step
+followed by the spoken reply). A turn whose script ends after a
+record_answer() call lets FakeLLM read the next question from the tool
+output, which keeps the scripts short.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from bench.fakes import LLMStep, call, say
+
+QUESTIONS: List[dict] = [
+    {"id": "q1", "text": "How satisfied were you with your most recent ride?", "criteria": "open"},
+    {"id": "q2", "text": "On a scale of 1 to 5, how would you rate the driver?", "criteria": "scale", "scales": 5},
+    {"id": "q3", "text": "Was your ride on time?", "criteria": "open"},
+    {"id": "q4", "text": "Is there anything we could do better?", "criteria": "open"},
+]
+
+
+@dataclass
+class Turn:
+    user: str
+    llm: List[LLMStep] = field(default_factory=list)
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    turns: List[Turn]
+    questions: List[dict] = field(default_factory=lambda: list(QUESTIONS))
+    rider_first_name: str = "Jason"
+
+
+def _answer(qid: str, answer: str) -> Turn:
+    return Turn(user=answer, llm=[call("record_answer", question_id=qid, answer=answer)])
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s for s in [
+        Scenario(
+            name="happy_path",
+            description="Identity, availability, four answers, completed",
+            turns=[
+                Turn("Yes, this is Jason.", [say("Great, thanks Jason! Do you have a few minutes for a short survey?")]),
+                Turn("Sure, go ahead.", [call("to_questions")]),
+                _answer("q1", "Very satisfied, it was smooth."),
+                _answer("q2", "4"),
+                _answer("q3", "Yes, right on time."),
+                Turn("No, that's all.", [
+                    call("record_answer", question_id="q4", answer="No, that's all."),
+                    call("end_survey", reason="completed"),
+                ]),
+            ],
+        ),
+        Scenario(
+            name="detour",
+            description="Caller asks questions mid-survey before answering",
+            turns=[
+                Turn("Who is this?", [say("This is Cameron from IT Curves. Am I speaking with Jason?")]),
+                Turn("Yes, speaking.", [say("Thanks! Do you have about three minutes for a brief survey?")]),
+                Turn("How long will it take?", [say("Just three to five minutes. Is now a good time?")]),
+                Turn("Okay, sure.", [call("to_questions")]),
+                Turn("What do you mean by most recent?", [
+                    say("Your last trip with us. How satisfied were you with your most recent ride?"),
+                ]),
+                _answer("q1", "Pretty satisfied."),
+                Turn("Can you repeat that?", [say("Of course. On a scale of 1 to 5, how would you rate the driver?")]),
+                _answer("q2", "5"),
+                _answer("q3", "It was ten minutes late."),
+                Turn("More drivers in the evening.", [
+                    call("record_answer", question_id="q4", answer="More drivers in the evening."),
+                    call("end_survey", reason="completed"),
+                ]),
+            ],
+        ),
+        Scenario(
+            name="declined",
+            description="Caller confirms identity, then declines",
+            turns=[
+                Turn("Yeah, this is Jason.", [say("Thanks Jason! Do you have a few minutes for a short survey?")]),
+                Turn("No, I'm busy.", [call("end_survey", reason="declined")]),
+            ],
+        ),
+    ]
+}
@@ -0,0 +1,307 @@
+"""
+Voice Pipeline Latency Benchmark
+
+Drives EnglishGreeterAgent → EnglishQuestionsAgent through the scripted
+conversations in bench/scenarios.py with the real survey tools and a real
+AgentSession, but local STT / LLM / TTS stand-ins (bench/fakes.py) with
+configurable latency. Prints a per-turn timing report and p50/p95 response
+latency, so prompt and tool changes can be checked for latency regressions
+offline. No LiveKit server, API keys or services are needed; survey_id is
+unset so no callbacks are sent.
+
+Usage:
+    python benchmark.py                                  # all scenarios, default profile
+    python benchmark.py --scenario happy_path --runs 5
+    python benchmark.py --questions-prompt prompt.txt    # compare a candidate prompt
+    python benchmark.py --no-preemptive --json out.json  # machine-readable results
+
+Response latency per turn is modelled as
+    stt + eou + (first agent text after the transcript) + tts_ttfb - overlap
+where the middle term is measured through the session (LLM requests, tool
+round trips, handoffs) and the others are sampled from the profile.
+
+The preemptive number is MODELLED, not measured. The session is built with
+preemptive_generation=--preemptive like production, but turns go in as
+text (session.run(user_input=...)), which skips the STT / end-of-turn
+events that start a preemptive reply, so the framework never overlaps
+anything here. With --preemptive, overlap = min(eou, llm_ttft) is taken
+off on the assumption that the first LLM request starts at the final
+transcript; without it overlap is 0. A regression inside LiveKit's
+preemptive path (e.g. replies discarded and regenerated) will not show
+up; compare --preemptive / --no-preemptive on a live call for that.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Optional
+
+# Keep response files and call logs out of the real volumes
+os.environ.setdefault("RESPONSES_DIR", tempfile.mkdtemp(prefix="survey-bench-"))
+os.environ.setdefault("LOG_DIR", os.environ["RESPONSES_DIR"])
+
+from livekit.agents.voice import AgentSession
+
+from agent import MINIMAL_GREETER_PROMPT, MINIMAL_QUESTIONS_PROMPT
+from agents import EnglishGreeterAgent, EnglishQuestionsAgent, SurveyCallData
+from bench.fakes import FakeLLM, FakeSTT, FakeTTS, LatencyProfile
+from bench.scenarios import SCENARIOS, Scenario
+from config.settings import MAX_TOOL_STEPS, PREEMPTIVE_GENERATION
+from tools import survey_tools
+from tools.survey_tools import create_survey_tools
+from utils.storage import create_empty_response_dict
+
+logger = logging.getLogger("survey-bench")
+
+GREETING_WAIT_SECONDS = 5.0
+
+
+@dataclass
+class TurnTiming:
+    scenario: str
+    run: int
+    turn: int
+    user: str
+    agent: str
+    tools: List[str]
+    llm_requests: int
+    prompt_tokens: int
+    stt_ms: float
+    eou_ms: float
+    llm_ttft_ms: float
+    first_text_ms: Optional[float]
+    tts_ttfb_ms: float
+    overlap_ms: float       # modelled preemptive saving, see the module docstring
+    response_ms: Optional[float]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _questions_prompt(base: str, questions: List[dict]) -> str:
+    lines = [f"{q['id']}: {q['text']}" for q in questions]
+    return base + "\n\nSURVEY QUESTIONS:\n" + "\n".join(lines)
+
+
+async def _noop(*_args) -> None:
+    return None
+
+
+async def _wait_for_greeting(session: AgentSession) -> None:
+    deadline = time.monotonic() + GREETING_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        if any(getattr(item, "role", None) == "assistant" for item in session.history.items):
+            return
+        await asyncio.sleep(0.05)
+    logger.warning("Greeter did not speak within %.0fs", GREETING_WAIT_SECONDS)
+
+
+async def run_scenario(
+    scenario: Scenario,
+    run: int,
+    profile: LatencyProfile,
+    preemptive: bool,
+    greeter_prompt: str,
+    questions_prompt: str,
+) -> List[TurnTiming]:
+    question_ids = [q["id"] for q in scenario.questions]
+    questions_map = {q["id"]: q["text"] for q in scenario.questions}
+    caller_number = f"bench-{scenario.name}"
+    survey_responses = create_empty_response_dict(scenario.rider_first_name, caller_number)
+    survey_responses["_conversation_log"] = []
+    call_start_time = datetime.now()
+
+    call_data = SurveyCallData(
+        survey_responses=survey_responses,
+        caller_number=caller_number,
+        call_start_time=call_start_time,
+        log_handler=None,
+        cleanup_logging_fn=lambda _handler: None,
+        disconnect_fn=_noop,
+        question_ids=question_ids,
+        questions_map=questions_map,
+        survey_id=None,
+        survey_url=None,
+        rider_email=None,
+        rider_name=scenario.rider_first_name,
+    )
+    greeter_tools, question_tools = create_survey_tools(
+        survey_responses=survey_responses,
+        caller_number=caller_number,
+        call_start_time=call_start_time,
+        log_handler=None,
+        cleanup_logging_fn=lambda _handler: None,
+        disconnect_fn=_noop,
+        question_ids=question_ids,
+        questions_map=questions_map,
+        rider_name=scenario.rider_first_name,
+        questions_metadata=scenario.questions,
+        language_mode="en",
+    )
+    questions_agent = EnglishQuestionsAgent(
+        instructions=_questions_prompt(questions_prompt, scenario.questions), tools=question_tools,
+    )
+    call_data.agents["greeter"] = EnglishGreeterAgent(
+        instructions=greeter_prompt,
+        rider_first_name=scenario.rider_first_name,
+        organization_name="IT Curves",
+        greetings="",
+        language_mode="en",
+        tools=greeter_tools,
+    )
+    call_data.agents["questions"] = questions_agent
+    call_data.agents["questions_en"] = questions_agent
+
+    fake_llm, stt, tts = FakeLLM(profile), FakeSTT(profile), FakeTTS(profile)
+    timings: List[TurnTiming] = []
+
+    async with AgentSession[SurveyCallData](
+        userdata=call_data, llm=fake_llm, max_tool_steps=MAX_TOOL_STEPS, preemptive_generation=preemptive,
+    ) as session:
+        await session.start(agent=call_data.agents["greeter"])
+        await _wait_for_greeting(session)
+
+        for i, turn in enumerate(scenario.turns, 1):
+            fake_llm.load(turn.llm)
+            stt_ms = await stt.transcribe(turn.user)
+            eou_ms = profile.sample(profile.eou_ms)
+            started = time.time()
+            result = await session.run(user_input=turn.user)
+
+            spoken = [
+                ev.item for ev in result.events
+                if ev.type == "message" and ev.item.role == "assistant" and ev.item.text_content
+            ]
+            tools = [ev.item.name for ev in result.events if ev.type == "function_call"]
+            first_text_ms = (spoken[0].created_at - started) * 1000 if spoken else None
+            tts_ttfb_ms = await tts.first_audio(spoken[0].text_content) if spoken else 0.0
+            llm_ttft_ms = fake_llm.calls[0].ttft_ms if fake_llm.calls else 0.0
+
+            overlap_ms = min(eou_ms, llm_ttft_ms) if preemptive else 0.0
+            response_ms = None
+            if first_text_ms is not None:
+                response_ms = stt_ms + eou_ms + max(first_text_ms, 0.0) + tts_ttfb_ms - overlap_ms
+
+            timings.append(TurnTiming(
+                scenario=scenario.name,
+                run=run,
+                turn=i,
+                user=turn.user,
+                agent=spoken[0].text_content if spoken else "",
+                tools=tools,
+                llm_requests=len(fake_llm.calls),
+                prompt_tokens=fake_llm.calls[0].prompt_tokens if fake_llm.calls else 0,
+                stt_ms=round(stt_ms, 1),
+                eou_ms=round(eou_ms, 1),
+                llm_ttft_ms=round(llm_ttft_ms, 1),
+                first_text_ms=round(first_text_ms, 1) if first_text_ms is not None else None,
+                tts_ttfb_ms=round(tts_ttfb_ms, 1),
+                overlap_ms=round(overlap_ms, 1),
+                response_ms=round(response_ms, 1) if response_ms is not None else None,
+            ))
+            if survey_responses.get("_finalized"):
+                break
+
+    return timings
+
+
+def print_report(timings: List[TurnTiming]) -> None:
+    header = f"{'scenario':<12} {'run':>3} {'turn':>4} {'tools':<26} {'llm':>3} {'prompt':>6} " \
+             f"{'ttft':>6} {'text':>7} {'resp':>7}  user"
+    print(header)
+    print("-" * len(header))
+    for t in timings:
+        print(
+            f"{t.scenario:<12} {t.run:>3} {t.turn:>4} {','.join(t.tools) or '-':<26} {t.llm_requests:>3} "
+            f"{t.prompt_tokens:>6} {t.llm_ttft_ms:>6.0f} "
+            f"{t.first_text_ms if t.first_text_ms is not None else float('nan'):>7.0f} "
+            f"{t.response_ms if t.response_ms is not None else float('nan'):>7.0f}  {t.user[:40]}"
+        )
+
+    print()
+    for name in dict.fromkeys(t.scenario for t in timings):
+        values = [t.response_ms for t in timings if t.scenario == name and t.response_ms is not None]
+        if not values:
+            continue
+        tool_turns = [t.response_ms for t in timings if t.scenario == name and t.tools and t.response_ms is not None]
+        line = (
+            f"{name:<12} turns={len(values):<3} response p50={_percentile(values, 50):.0f}ms "
+            f"p95={_percentile(values, 95):.0f}ms max={max(values):.0f}ms"
+        )
+        if tool_turns:
+            line += f"  tool turns p50={_percentile(tool_turns, 50):.0f}ms"
+        print(line)
+
+
+async def main(args: argparse.Namespace) -> int:
+    profile = LatencyProfile(
+        stt_ms=args.stt_ms,
+        eou_ms=args.eou_ms,
+        ttft_ms=args.ttft_ms,
+        ttft_per_1k_tokens_ms=args.ttft_per_1k_ms,
+        tokens_per_second=args.tokens_per_second,
+        tts_ttfb_ms=args.tts_ttfb_ms,
+        jitter=args.jitter,
+    )
+    greeter_prompt = open(args.greeter_prompt).read() if args.greeter_prompt else MINIMAL_GREETER_PROMPT
+    questions_prompt = open(args.questions_prompt).read() if args.questions_prompt else MINIMAL_QUESTIONS_PROMPT
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    survey_tools.POST_FAREWELL_BUFFER_SECONDS = 0.0
+
+    timings: List[TurnTiming] = []
+    for name in names:
+        for run in range(1, args.runs + 1):
+            timings += await run_scenario(
+                SCENARIOS[name], run, profile, args.preemptive, greeter_prompt, questions_prompt,
+            )
+
+    print_report(timings)
+    if args.preemptive:
+        print("\nPreemptive generation: overlap with end-of-turn is modelled, not measured (see --help)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "profile": asdict(profile),
+                "preemptive_generation": args.preemptive,
+                "preemptive_overlap": "modelled",
+                "turns": [asdict(t) for t in timings],
+            }, f, indent=2)
+        print(f"\nWrote {len(timings)} turns to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Offline voice pipeline latency benchmark",
+        epilog="The --preemptive saving is modelled (min(eou, llm ttft)), not measured: turns are fed as text.",
+    )
+    parser.add_argument("--scenario", default="all", choices=["all", *SCENARIOS])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--greeter-prompt", help="file with the greeter prompt to benchmark")
+    parser.add_argument("--questions-prompt", help="file with the questions prompt to benchmark")
+    parser.add_argument("--preemptive", action=argparse.BooleanOptionalAction, default=PREEMPTIVE_GENERATION)
+    parser.add_argument("--stt-ms", type=float, default=LatencyProfile.stt_ms)
+    parser.add_argument("--eou-ms", type=float, default=LatencyProfile.eou_ms)
+    parser.add_argument("--ttft-ms", type=float, default=LatencyProfile.ttft_ms)
+    parser.add_argument("--ttft-per-1k-ms", type=float, default=LatencyProfile.ttft_per_1k_tokens_ms)
+    parser.add_argument("--tokens-per-second", type=float, default=LatencyProfile.tokens_per_second)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=LatencyProfile.tts_ttfb_ms)
+    parser.add_argument("--jitter", type=float, default=LatencyProfile.jitter)
+    parser.add_argument("--json", help="write per-turn results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show agent logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    sys.exit(asyncio.run(main(args)))
@@ -12,11 +12,12 @@ import re
 from datetime import datetime
 from typing import Callable, List, Optional
 
-import aiohttp
 from livekit.agents import function_tool, RunContext
 
+from utils import http, outbox
 from utils.logging import get_logger
 from utils.storage import save_survey_responses
+from utils.transcript import build_transcript_payload, post_transcript
 
 logger = get_logger()
 
@@ -26,22 +27,8 @@ SCHEDULER_SERVICE_URL = os.getenv("SCHEDULER_SERVICE_URL", "http://scheduler-ser
 
 
 async def _call_service(url: str, params: dict):
-    """POST to an internal service endpoint."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=8),
-            ) as resp:
-                if resp.status != 200:
-                    body = await resp.text()
-                    logger.warning(f"{url} returned {resp.status}: {body}")
-                    return False
-                return True
-    except Exception as e:
-        logger.warning(f"Service call {url} failed: {e}")
-        return False
+    """POST to an internal service endpoint on the shared keep-alive session."""
+    return await http.post(url, params=params)
 
 
 def create_survey_tools(
@@ -194,44 +181,15 @@ def create_survey_tools(
         cleanup_logging_fn(log_handler)
 
         if survey_id:
-            await _call_service(
+            # Through the call's outbox so it lands after every queued answer
+            await outbox.outbox_for(survey_id).enqueue(
                 f"{VOICE_SERVICE_URL}/api/voice/complete-survey",
-                {"survey_id": survey_id, "reason": reason},
+                params={"survey_id": survey_id, "reason": reason},
             )
 
-            convo_log = survey_responses.get("_conversation_log", [])
-            if convo_log:
-                transcript_lines = []
-                for entry in convo_log:
-                    role_label = "AGENT" if entry["role"] == "agent" else "CALLER"
-                    transcript_lines.append(
-                        f'[{entry["ts"]}] {role_label}: {entry["text"]}'
-                    )
-                answers_section = []
-                for qid, ans in survey_responses.get("answers", {}).items():
-                    answers_section.append(f"  Q[{qid}]: {ans}")
-                if answers_section:
-                    transcript_lines.append("\n--- RECORDED ANSWERS ---")
-                    transcript_lines.extend(answers_section)
-                full_transcript = "\n".join(transcript_lines)
-            else:
-                transcript_lines = []
-                for qid, ans in survey_responses.get("answers", {}).items():
-                    transcript_lines.append(f"Q[{qid}]: {ans}")
-                full_transcript = "\n".join(transcript_lines)
-
-            try:
-                await _call_service(
-                    f"{VOICE_SERVICE_URL}/api/voice/store-transcript",
-                    {
-                        "survey_id": survey_id,
-                        "full_transcript": full_transcript,
-                        "call_duration_seconds": str(int(call_duration)),
-                        "call_status": reason,
-                    },
-                )
-            except Exception as e:
-                logger.warning(f"Failed to store transcript: {e}")
+            await post_transcript(
+                build_transcript_payload(survey_id, survey_responses, call_duration, reason)
+            )
 
     @function_tool()
     async def record_answer(context: RunContext, question_id: str, answer: str):
@@ -285,10 +243,7 @@ def create_survey_tools(
         logger.info(f"[{question_id}] ({done_count}/{total_questions}) {answer[:120]}")
 
         if survey_id:
-            asyncio.create_task(_call_service(
-                f"{VOICE_SERVICE_URL}/api/voice/record-answer",
-                {"survey_id": survey_id, "question_id": question_id, "answer": answer},
-            ))
+            await outbox.outbox_for(survey_id).enqueue_answer(survey_id, question_id, answer)
 
         if question_ids:
             remaining = [q for q in question_ids if q not in done]
@@ -432,27 +387,21 @@ def create_survey_tools(
 
         # 2. Fallback to SMS if email failed or no email
         if not sent and survey_id and caller_number:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{SURVEY_SERVICE_URL}/api/surveys/sendsms",
-                        json={
-                            "phone": caller_number,
-                            "survey_id": survey_id,
-                            "survey_url": survey_url or "",
-                            "rider_name": person_name,
-                            "language": lang,
-                        },
-                        timeout=aiohttp.ClientTimeout(total=10),
-                    ) as resp:
-                        if resp.status == 200:
-                            sent = True
-                            logger.info(f"Survey link sent via SMS to {caller_number}")
-                        else:
-                            body = await resp.text()
-                            logger.warning(f"SMS send failed ({resp.status}): {body}")
-            except Exception as e:
-                logger.warning(f"SMS fallback failed: {e}")
+            sent = await http.post(
+                f"{SURVEY_SERVICE_URL}/api/surveys/sendsms",
+                json={
+                    "phone": caller_number,
+                    "survey_id": survey_id,
+                    "survey_url": survey_url or "",
+                    "rider_name": person_name,
+                    "language": lang,
+                },
+                timeout=10,
+            )
+            if sent:
+                logger.info(f"Survey link sent via SMS to {caller_number}")
+            else:
+                logger.warning(f"SMS fallback failed for {caller_number}")
 
         if sent:
             return "Survey link sent. Now call end_survey(reason='link_sent') to end the call."
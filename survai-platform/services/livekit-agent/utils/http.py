@@ -0,0 +1,97 @@
+"""
+Pooled HTTP for service callbacks from the agent worker.
+
+One aiohttp.ClientSession per worker process keeps connections to
+voice-service / survey-service / scheduler-service alive across requests
+and calls, instead of a new session (and TCP handshake) per callback.
+
+send() / post() retry connection errors, timeouts and 429/502/503/504 a
+few times with full-jitter exponential backoff; other non-200 responses
+fail at once. Ordered, durable delivery of call callbacks lives in
+utils/outbox.py on top of this.
+"""
+
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger("survey-agent.http")
+
+CALLBACK_TIMEOUT = float(os.getenv("CALLBACK_TIMEOUT_SECONDS", "8"))
+CALLBACK_RETRIES = int(os.getenv("CALLBACK_RETRIES", "3"))
+CALLBACK_BACKOFF_BASE = float(os.getenv("CALLBACK_BACKOFF_BASE_SECONDS", "0.25"))
+CALLBACK_BACKOFF_MAX = 4.0
+CALLBACK_POOL_LIMIT = int(os.getenv("CALLBACK_POOL_LIMIT", "20"))
+RETRY_STATUSES = {429, 502, 503, 504}
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    # A session is bound to the loop it was created on; job processes may run a new one
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session_loop = loop
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=CALLBACK_POOL_LIMIT, keepalive_timeout=60),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(CALLBACK_BACKOFF_MAX, CALLBACK_BACKOFF_BASE * 2 ** attempt))
+
+
+async def send(
+    url: str,
+    params: Optional[dict] = None,
+    json: Any = None,
+    data: Optional[bytes] = None,
+    headers: Optional[dict] = None,
+    timeout: float = CALLBACK_TIMEOUT,
+    retries: int = CALLBACK_RETRIES,
+) -> int:
+    """POST on the shared session with retries; returns the final HTTP status (0 if unreachable)."""
+    status, error = 0, ""
+    for attempt in range(retries + 1):
+        try:
+            async with get_session().post(
+                url,
+                params=params,
+                json=json,
+                data=data,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                status = resp.status
+                if status == 200:
+                    return status
+                body = await resp.text()
+                if status not in RETRY_STATUSES:
+                    logger.warning(f"{url} returned {status}: {body}")
+                    return status
+                error = f"{status}: {body[:200]}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            status, error = 0, str(e) or type(e).__name__
+        if attempt < retries:
+            await asyncio.sleep(_backoff(attempt))
+    logger.warning(f"{url} failed after {retries + 1} attempts: {error}")
+    return status
+
+
+async def post(url: str, **kwargs) -> bool:
+    """send() for callers that only need success/failure; True on HTTP 200."""
+    return await send(url, **kwargs) == 200
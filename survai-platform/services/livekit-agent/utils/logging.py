@@ -1,12 +1,24 @@
 """
 Logging utilities for the survey bot.
 Handles per-call logging and general logging setup.
+
+Per-call log files are written off the event loop: a single QueueHandler on
+the survey-agent logger stamps each record with the call it was logged
+from (a contextvar set by setup_survey_logging, inherited by every task
+the call starts) and a QueueListener thread writes it to that call's file
+only. Each record costs one queue put in the loop, however many calls
+share the worker process.
 """
 
+import atexit
 import logging
 import os
+import queue
+import weakref
+from contextvars import ContextVar
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
 from config.settings import LOG_DIR
 
@@ -15,6 +27,54 @@ from config.settings import LOG_DIR
 _logger = logging.getLogger("survey-agent")
 _logger.setLevel(logging.INFO)
 
+# File handler of the call the current task belongs to
+_call_handler: ContextVar[Optional[logging.Handler]] = ContextVar("survey_call_handler", default=None)
+
+
+class _CallQueueHandler(QueueHandler):
+    """Enqueue records tagged with the current call's file handler; untagged records are skipped."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _call_handler.get() is not None:
+            super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record.call_handler = _call_handler.get()
+        return record
+
+
+class _CallRouter(logging.Handler):
+    """Runs on the listener thread: writes each record to its call's file, closes finished calls."""
+
+    def __init__(self):
+        super().__init__()
+        self._closed: "weakref.WeakSet[logging.Handler]" = weakref.WeakSet()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = getattr(record, "call_handler", None)
+        if handler is None or handler in self._closed:
+            return
+        if getattr(record, "close_call", False):
+            self._closed.add(handler)
+            handler.close()
+        elif record.levelno >= handler.level:
+            handler.handle(record)
+
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    _listener = QueueListener(_queue, _CallRouter())
+    _listener.start()
+    _logger.addHandler(_CallQueueHandler(_queue))
+    atexit.register(_listener.stop)
+
 
 def get_logger() -> logging.Logger:
     """Get the survey agent logger."""
@@ -51,20 +111,25 @@ def setup_survey_logging(room_name: str, caller_number: str) -> tuple[str, Rotat
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(formatter)
-    
-    _logger.addHandler(file_handler)
-    
+
+    _ensure_listener()
+    _call_handler.set(file_handler)
+
     _logger.info(f"📝 SURVEY LOG FILE CREATED: {log_filename}")
     return log_filename, file_handler
 
 
 def cleanup_survey_logging(handler: RotatingFileHandler) -> None:
     """
-    Remove the survey-specific handler after the call ends.
-    
+    Detach the survey-specific handler after the call ends. The file is closed
+    on the listener thread once the records queued before this call are written.
+
     Args:
-        handler: The file handler to remove
+        handler: The file handler returned by setup_survey_logging
     """
-    _logger.removeHandler(handler)
-    handler.close()
+    if handler is None:
+        return
+    if _call_handler.get() is handler:
+        _call_handler.set(None)
+    _queue.put(logging.makeLogRecord({"call_handler": handler, "close_call": True, "levelno": logging.CRITICAL}))
 
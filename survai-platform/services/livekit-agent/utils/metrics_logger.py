@@ -5,13 +5,30 @@ Formats and logs every AgentMetrics event emitted by AgentSession so that
 latency across each stage (VAD → EOU → STT → LLM → TTS) is visible in
 docker compose logs and per-call log files.
 
+It also aggregates turn latency (EOU delay, LLM TTFT, TTS TTFB and the
+end-to-end response time, their sum per speech_id) per call in CallLatency.
+At call end, finish_call_latency() logs a one-line p50/p95 summary and
+folds the call into worker-wide histograms kept in a small SQLite file
+(METRICS_DB_PATH), labelled by LLM model, TTS voice and language, which
+api_server serves in Prometheus text format on GET /metrics. The file is
+shared because every job runs in its own process.
+
 Usage:
-    from utils.metrics_logger import log_pipeline_metrics
-    session.on("metrics_collected")(lambda ev: log_pipeline_metrics(ev.metrics))
+    from utils.metrics_logger import CallLatency, finish_call_latency, log_pipeline_metrics
+    latency = CallLatency(voice=TTS_VOICE_ID)
+    session.on("metrics_collected")(lambda ev: log_pipeline_metrics(ev.metrics, latency))
+    ...
+    summary = await finish_call_latency(latency, language="en")
 """
 
+import asyncio
+import json
 import logging
-from typing import Union
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import RESPONSES_DIR
 
 from livekit.agents.metrics import (
     STTMetrics,
@@ -43,15 +60,18 @@ def _model_tag(metrics) -> str:
     return f" [{'/'.join(parts)}]" if parts else ""
 
 
-def log_pipeline_metrics(metrics) -> None:
+def log_pipeline_metrics(metrics, latency: Optional["CallLatency"] = None) -> None:
     """
-    Dispatch on metrics type and emit a single INFO line per event.
+    Dispatch on metrics type and emit a single INFO line per event; when a
+    CallLatency is given the event is also added to the call's aggregates.
 
     Log prefixes allow easy grepping:
       docker logs livekit-agent | grep METRICS
       docker logs livekit-agent | grep "METRICS:LLM"
     """
     tag = _model_tag(metrics)
+    if latency is not None:
+        latency.record(metrics)
 
     if isinstance(metrics, EOUMetrics):
         logger.info(
@@ -113,3 +133,192 @@ def log_pipeline_metrics(metrics) -> None:
     else:
         # Catch-all for any future metric types
         logger.info("[METRICS:UNKNOWN] type=%s  data=%s", type(metrics).__name__, metrics)
+
+
+
+# ─── Latency aggregation ─────────────────────────────────────────────────────
+
+LATENCY_STAGES = ("eou_delay", "llm_ttft", "tts_ttfb", "e2e")
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+METRICS_DB_PATH = os.getenv("METRICS_DB_PATH", os.path.join(RESPONSES_DIR, "metrics.db"))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class CallLatency:
+    """Per-call latency samples; e2e is EOU delay + LLM TTFT + TTS TTFB of one speech_id."""
+
+    def __init__(self, voice: str = ""):
+        self.voice = voice
+        self.llm_model = ""
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in LATENCY_STAGES}
+        self._turns: Dict[str, Dict[str, float]] = {}
+
+    def _add_turn_part(self, speech_id: Optional[str], stage: str, value: float) -> None:
+        if not speech_id:
+            return
+        turn = self._turns.setdefault(speech_id, {})
+        if stage in turn:  # only the first LLM/TTS of a turn counts towards the response time
+            return
+        turn[stage] = value
+        if len(turn) == 3:
+            self.samples["e2e"].append(sum(turn.values()))
+            del self._turns[speech_id]
+
+    def record(self, metrics) -> None:
+        speech_id = getattr(metrics, "speech_id", None)
+        if isinstance(metrics, EOUMetrics):
+            self.samples["eou_delay"].append(metrics.end_of_utterance_delay)
+            self._add_turn_part(speech_id, "eou_delay", metrics.end_of_utterance_delay)
+        elif isinstance(metrics, LLMMetrics):
+            if metrics.cancelled or metrics.ttft < 0:
+                return
+            self.samples["llm_ttft"].append(metrics.ttft)
+            meta = getattr(metrics, "metadata", None)
+            if meta and getattr(meta, "model_name", None):
+                self.llm_model = meta.model_name
+            self._add_turn_part(speech_id, "llm_ttft", metrics.ttft)
+        elif isinstance(metrics, TTSMetrics):
+            if metrics.cancelled or metrics.ttfb < 0:
+                return
+            self.samples["tts_ttfb"].append(metrics.ttfb)
+            self._add_turn_part(speech_id, "tts_ttfb", metrics.ttfb)
+
+    def summary(self, language: str = "") -> Dict[str, Any]:
+        """Compact per-call row: labels plus count / p50 / p95 / max per stage (seconds)."""
+        row: Dict[str, Any] = {"model": self.llm_model, "voice": self.voice, "language": language}
+        for stage, values in self.samples.items():
+            if values:
+                row[stage] = {
+                    "count": len(values),
+                    "p50": round(_percentile(values, 50), 3),
+                    "p95": round(_percentile(values, 95), 3),
+                    "max": round(max(values), 3),
+                }
+        return row
+
+
+class LatencyStore:
+    """Worker-wide cumulative histograms, shared by the job processes through SQLite."""
+
+    def __init__(self, path: str = METRICS_DB_PATH):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS latency_hist (
+                   stage    TEXT NOT NULL,
+                   model    TEXT NOT NULL,
+                   voice    TEXT NOT NULL,
+                   language TEXT NOT NULL,
+                   buckets  TEXT NOT NULL,
+                   sum      REAL NOT NULL,
+                   count    INTEGER NOT NULL,
+                   calls    INTEGER NOT NULL,
+                   PRIMARY KEY (stage, model, voice, language)
+               )"""
+        )
+        return conn
+
+    def add_call(self, latency: CallLatency, language: str) -> None:
+        labels = (latency.llm_model, latency.voice, language)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for stage, values in latency.samples.items():
+                if not values:
+                    continue
+                row = conn.execute(
+                    "SELECT buckets, sum, count, calls FROM latency_hist "
+                    "WHERE stage = ? AND model = ? AND voice = ? AND language = ?",
+                    (stage, *labels),
+                ).fetchone()
+                buckets, total, count, calls = (json.loads(row[0]), *row[1:]) if row else (
+                    [0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0, 0,
+                )
+                for value in values:
+                    idx = next((i for i, le in enumerate(LATENCY_BUCKETS) if value <= le), len(LATENCY_BUCKETS))
+                    buckets[idx] += 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO latency_hist VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (stage, *labels, json.dumps(buckets), total + sum(values), count + len(values), calls + 1),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def rows(self) -> List[Tuple]:
+        if not os.path.exists(self.path):
+            return []
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT stage, model, voice, language, buckets, sum, count, calls FROM latency_hist "
+                "ORDER BY stage, model, voice, language"
+            ).fetchall()
+        finally:
+            conn.close()
+
+
+latency_store = LatencyStore()
+
+
+async def finish_call_latency(latency: CallLatency, language: str = "") -> Dict[str, Any]:
+    """
+    Log the call's latency summary and add it to the worker histograms; returns
+    the summary. The SQLite write runs in a thread, off the event loop.
+    """
+    summary = latency.summary(language)
+    parts = [
+        f"{stage}=p50 {summary[stage]['p50']:.3f}s/p95 {summary[stage]['p95']:.3f}s (n={summary[stage]['count']})"
+        for stage in LATENCY_STAGES if stage in summary
+    ]
+    logger.info(
+        "[METRICS:SUMMARY] model=%s voice=%s language=%s  %s",
+        summary["model"] or "-", summary["voice"] or "-", language or "-", "  ".join(parts) or "no turns",
+    )
+    try:
+        await asyncio.to_thread(latency_store.add_call, latency, language)
+    except Exception as e:
+        logger.warning(f"Failed to record call latency histograms: {e}")
+    return summary
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+    """Worker latency histograms in Prometheus text exposition format."""
+    lines = [
+        "# HELP survey_agent_latency_seconds Voice pipeline latency per turn, by stage.",
+        "# TYPE survey_agent_latency_seconds histogram",
+    ]
+    calls_lines = []
+    for stage, model, voice, language, buckets, total, count, calls in latency_store.rows():
+        labels = (
+            f'stage="{stage}",model="{_label_value(model)}",'
+            f'voice="{_label_value(voice)}",language="{_label_value(language)}"'
+        )
+        cumulative = 0
+        for le, n in zip((*LATENCY_BUCKETS, "+Inf"), json.loads(buckets)):
+            cumulative += n
+            lines.append(f'survey_agent_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"survey_agent_latency_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"survey_agent_latency_seconds_count{{{labels}}} {count}")
+        calls_lines.append(f"survey_agent_latency_calls_total{{{labels}}} {calls}")
+    lines += [
+        "# HELP survey_agent_latency_calls_total Calls that contributed samples, by stage.",
+        "# TYPE survey_agent_latency_calls_total counter",
+        *calls_lines,
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,402 @@
+"""
+Durable, ordered outbox for call callbacks (answers, completion, transcript).
+
+Every callback is written to a SQLite file (OUTBOX_PATH, on the persistent
+survey_responses volume by default) before it is sent, and deleted only
+once the target service accepts it:
+
+- per call (key = survey id), rows are delivered strictly in insertion
+  order; a failing head row holds back the rows behind it
+- consecutive answers for a survey go out as one POST /api/voice/record-answers
+- failed rows back off exponentially (OUTBOX_BACKOFF_BASE_SECONDS up to
+  OUTBOX_BACKOFF_MAX_SECONDS) for at most OUTBOX_MAX_ATTEMPTS attempts
+- rows that exhaust their attempts, or get a 4xx other than 408/429, are
+  dead-lettered: kept (dead_at set) for OUTBOX_DEAD_LETTER_DAYS but no
+  longer sent, so they stop holding back the rows behind them
+- rows are claimed with a short lease, so several job processes can share
+  the file, and a replay task in each process picks up rows left behind by
+  finished or crashed jobs (including those from before a worker restart)
+
+enqueue() returns once the row is committed; delivery happens on the
+call's worker task, so callers never wait on voice-service. SQLite work
+runs in a thread (asyncio.to_thread), never on the event loop. Delivery
+is at-least-once.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config.settings import RESPONSES_DIR
+from utils import http
+
+logger = logging.getLogger("survey-agent.outbox")
+
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", os.path.join(RESPONSES_DIR, "outbox.db"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
+OUTBOX_DEAD_LETTER_DAYS = float(os.getenv("OUTBOX_DEAD_LETTER_DAYS", "7"))
+OUTBOX_REPLAY_SECONDS = float(os.getenv("OUTBOX_REPLAY_SECONDS", "15"))
+OUTBOX_DRAIN_TIMEOUT = 30.0
+CLAIM_SECONDS = 60.0
+VOICE_SERVICE_URL = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
+RECORD_ANSWERS_URL = f"{VOICE_SERVICE_URL}/api/voice/record-answers"
+
+OWNER = f"{os.getpid()}"
+
+
+def _is_permanent(status: int) -> bool:
+    return 400 <= status < 500 and status not in (408, 429)
+
+
+# ─── SQLite store ─────────────────────────────────────────────────────────────
+
+class OutboxStore:
+    """
+    Blocking SQLite access; call it through asyncio.to_thread. One
+    connection per process, serialised by a lock so a BEGIN IMMEDIATE from
+    one thread never interleaves with another thread's statements.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS outbox (
+                       id              INTEGER PRIMARY KEY AUTOINCREMENT,
+                       call_key        TEXT NOT NULL,
+                       kind            TEXT NOT NULL,
+                       url             TEXT NOT NULL,
+                       request         TEXT NOT NULL,
+                       attempts        INTEGER NOT NULL DEFAULT 0,
+                       next_attempt_at REAL NOT NULL DEFAULT 0,
+                       claimed_by      TEXT,
+                       claimed_until   REAL NOT NULL DEFAULT 0,
+                       created_at      REAL NOT NULL,
+                       last_status     INTEGER,
+                       dead_at         REAL
+                   )"""
+            )
+            # Files written before dead-lettering existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+            for column, ddl in (("last_status", "INTEGER"), ("dead_at", "REAL")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE outbox ADD COLUMN {column} {ddl}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_call ON outbox(call_key, id)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, call_key: str, kind: str, url: str, request: Dict[str, Any]) -> int:
+        with self._lock:
+            cur = self.conn.execute(
+                "INSERT INTO outbox (call_key, kind, url, request, created_at) VALUES (?, ?, ?, ?, ?)",
+                (call_key, kind, url, json.dumps(request, ensure_ascii=False), time.time()),
+            )
+            return cur.lastrowid
+
+    def claim_head(self, call_key: str) -> List[sqlite3.Row]:
+        """
+        Claim the next deliverable rows for call_key: the head row, plus the
+        consecutive answer rows behind it when the head is an answer. Empty if
+        the head is backing off or claimed by another process.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM outbox WHERE call_key = ? AND dead_at IS NULL ORDER BY id LIMIT ?",
+                    (call_key, OUTBOX_BATCH_SIZE),
+                ).fetchall()
+                if not rows or rows[0]["next_attempt_at"] > now or rows[0]["claimed_until"] > now:
+                    conn.execute("COMMIT")
+                    return []
+                batch = [rows[0]]
+                if rows[0]["kind"] == "answer":
+                    for row in rows[1:]:
+                        if row["kind"] != "answer" or row["claimed_until"] > now:
+                            break
+                        batch.append(row)
+                conn.executemany(
+                    "UPDATE outbox SET claimed_by = ?, claimed_until = ? WHERE id = ?",
+                    [(OWNER, now + CLAIM_SECONDS, row["id"]) for row in batch],
+                )
+                conn.execute("COMMIT")
+                return batch
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def done(self, ids: List[int]) -> None:
+        with self._lock:
+            self.conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
+    def dead_letter(self, ids: List[int], status: int) -> None:
+        """Stop sending the rows but keep them for inspection."""
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE outbox SET dead_at = ?, last_status = ?, claimed_by = NULL, claimed_until = 0 WHERE id = ?",
+                [(now, status, i) for i in ids],
+            )
+
+    def retry_later(self, rows: List[sqlite3.Row], status: int) -> Optional[float]:
+        """
+        Release the claim and back off; returns the delay in seconds, or None
+        when the rows have used OUTBOX_MAX_ATTEMPTS and were dead-lettered.
+        """
+        attempts = rows[0]["attempts"] + 1
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            self.dead_letter([row["id"] for row in rows], status)
+            return None
+        delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1))
+        with self._lock:
+            self.conn.executemany(
+                """UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_status = ?,
+                          claimed_by = NULL, claimed_until = 0
+                   WHERE id = ?""",
+                [(attempts, time.time() + delay, status, row["id"]) for row in rows],
+            )
+        return delay
+
+    def pending_keys(self) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT call_key FROM outbox WHERE dead_at IS NULL AND claimed_until <= ?", (time.time(),),
+            ).fetchall()
+        return [row["call_key"] for row in rows]
+
+    def next_due(self, call_key: str) -> Optional[float]:
+        with self._lock:
+            row = self.conn.execute(
+                """SELECT next_attempt_at, claimed_until FROM outbox
+                   WHERE call_key = ? AND dead_at IS NULL ORDER BY id LIMIT 1""",
+                (call_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return max(row["next_attempt_at"], row["claimed_until"])
+
+    def purge_dead(self) -> int:
+        cutoff = time.time() - OUTBOX_DEAD_LETTER_DAYS * 86400
+        with self._lock:
+            return self.conn.execute("DELETE FROM outbox WHERE dead_at < ?", (cutoff,)).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            row = self.conn.execute(
+                """SELECT COUNT(*) - COUNT(dead_at) AS pending, COUNT(dead_at) AS dead_letter
+                   FROM outbox"""
+            ).fetchone()
+        return {"pending": row["pending"], "dead_letter": row["dead_letter"]}
+
+
+_store = OutboxStore()
+
+
+# ─── Delivery ────────────────────────────────────────────────────────────────
+
+async def _send_rows(rows: List[sqlite3.Row]) -> int:
+    if rows[0]["kind"] == "answer":
+        answers = [json.loads(row["request"]) for row in rows]
+        return await http.send(
+            RECORD_ANSWERS_URL,
+            json={
+                "survey_id": answers[0]["survey_id"],
+                "answers": [{"question_id": a["question_id"], "answer": a["answer"]} for a in answers],
+            },
+        )
+    request = json.loads(rows[0]["request"])
+    if request.get("data_b64") is not None:
+        request["data"] = base64.b64decode(request.pop("data_b64"))
+    return await http.send(rows[0]["url"], **request)
+
+
+async def deliver_next(call_key: str, waiters: Optional[Dict[int, asyncio.Future]] = None) -> Optional[bool]:
+    """
+    Try the head of call_key's queue once. Returns True if rows were
+    delivered (or dead-lettered), False if they were put back to retry,
+    None if nothing was deliverable right now.
+    """
+    rows = await asyncio.to_thread(_store.claim_head, call_key)
+    if not rows:
+        return None
+    ids = [row["id"] for row in rows]
+    status = await _send_rows(rows)
+    delivered = True
+    if status == 200:
+        await asyncio.to_thread(_store.done, ids)
+    elif _is_permanent(status):
+        logger.error(f"[{call_key}] dead-lettering {len(rows)} {rows[0]['kind']} callback(s): HTTP {status}")
+        await asyncio.to_thread(_store.dead_letter, ids, status)
+    else:
+        delay = await asyncio.to_thread(_store.retry_later, rows, status)
+        if delay is None:
+            logger.error(
+                f"[{call_key}] dead-lettering {len(rows)} {rows[0]['kind']} callback(s) "
+                f"after {OUTBOX_MAX_ATTEMPTS} attempts (HTTP {status})"
+            )
+        else:
+            logger.warning(f"[{call_key}] {len(rows)} callback(s) not delivered (HTTP {status}), retrying in {delay:.0f}s")
+            delivered = False
+    for row_id in ids:
+        fut = (waiters or {}).pop(row_id, None)
+        if fut and not fut.done():
+            fut.set_result(status == 200)
+    return delivered
+
+
+_direct_sends: set = set()
+
+
+class CallbackOutbox:
+    """One call's view of the outbox: enqueue, and a task delivering its rows in order."""
+
+    def __init__(self, call_key: str):
+        self.call_key = call_key
+        # Resolved after each row's first attempt; only drain() waits on these
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _add(self, kind: str, url: str, request: Dict[str, Any]) -> bool:
+        try:
+            row_id = await asyncio.to_thread(_store.add, self.call_key, kind, url, request)
+        except sqlite3.Error as e:
+            # Disk trouble must not break the call; fall back to a direct send in the background
+            logger.warning(f"[{self.call_key}] outbox write failed, sending directly: {e}")
+            if kind == "answer":
+                send = http.post(url, json={
+                    "survey_id": request["survey_id"],
+                    "answers": [{"question_id": request["question_id"], "answer": request["answer"]}],
+                })
+            else:
+                if request.get("data_b64") is not None:
+                    request["data"] = base64.b64decode(request.pop("data_b64"))
+                send = http.post(url, **request)
+            task = asyncio.create_task(send)
+            _direct_sends.add(task)
+            task.add_done_callback(_direct_sends.discard)
+            return False
+        self._waiters[row_id] = asyncio.get_running_loop().create_future()
+        self._wakeup.set()
+        self._ensure_worker()
+        return True
+
+    async def enqueue(self, url: str, **kwargs) -> bool:
+        """Queue a POST (http.send kwargs); True once the row is stored for delivery."""
+        data = kwargs.pop("data", None)
+        if data is not None:
+            kwargs["data_b64"] = base64.b64encode(data).decode("ascii")
+        return await self._add("callback", url, kwargs)
+
+    async def enqueue_answer(self, survey_id: str, question_id: str, answer: str) -> bool:
+        """Queue an answer; consecutive answers are sent as one batch."""
+        return await self._add(
+            "answer", RECORD_ANSWERS_URL,
+            {"survey_id": survey_id, "question_id": question_id, "answer": answer},
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await deliver_next(self.call_key, self._waiters)
+                if result is not None:
+                    continue
+                due = await asyncio.to_thread(_store.next_due, self.call_key)
+            except sqlite3.Error as e:
+                logger.warning(f"[{self.call_key}] outbox read failed: {e}")
+                due = time.time() + OUTBOX_REPLAY_SECONDS
+            if due is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(due - time.time(), 0.05))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain(self, timeout: float = OUTBOX_DRAIN_TIMEOUT) -> None:
+        """Wait until every queued callback has had a first attempt."""
+        pending = [f for f in self._waiters.values() if not f.done()]
+        if not pending:
+            return
+        done, not_done = await asyncio.wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"[{self.call_key}] {len(not_done)} callbacks still pending after {timeout:.0f}s")
+
+    async def close(self) -> None:
+        """Drain, then stop the worker; undelivered rows are left to the replay task."""
+        await self.drain()
+        if self._worker:
+            self._worker.cancel()
+
+
+_outboxes: Dict[str, CallbackOutbox] = {}
+_replayer: Optional[asyncio.Task] = None
+
+
+async def _replay_loop() -> None:
+    """Deliver rows that no live outbox in this process owns (earlier jobs, restarts)."""
+    while True:
+        try:
+            for call_key in await asyncio.to_thread(_store.pending_keys):
+                if call_key in _outboxes:
+                    continue
+                while await deliver_next(call_key):
+                    pass
+            purged = await asyncio.to_thread(_store.purge_dead)
+            if purged:
+                logger.info(f"Outbox: purged {purged} dead-lettered callback(s)")
+        except Exception as e:
+            logger.warning(f"Outbox replay failed: {e}")
+        await asyncio.sleep(OUTBOX_REPLAY_SECONDS)
+
+
+def _ensure_replayer() -> None:
+    global _replayer
+    if _replayer is None or _replayer.done():
+        _replayer = asyncio.create_task(_replay_loop())
+
+
+def outbox_for(call_key: str) -> CallbackOutbox:
+    """The outbox for one call (keyed by survey id, or phone / room for sandbox calls)."""
+    _ensure_replayer()
+    if call_key not in _outboxes:
+        _outboxes[call_key] = CallbackOutbox(call_key)
+    return _outboxes[call_key]
+
+
+async def close_outbox(call_key: str) -> None:
+    outbox = _outboxes.pop(call_key, None)
+    if outbox:
+        await outbox.close()
+
+
+async def outbox_stats() -> Dict[str, Any]:
+    counts = await asyncio.to_thread(_store.counts)
+    return {**counts, "live_calls": len(_outboxes), "path": OUTBOX_PATH}
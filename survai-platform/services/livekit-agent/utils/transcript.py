@@ -0,0 +1,63 @@
+"""
+Transcript upload to voice-service.
+
+The structured conversation log (role / text / ts per turn) and the answers
+map are posted as a gzip-compressed JSON body to POST /api/voice/transcripts,
+through the call's callback outbox; voice-service derives the flat text
+itself. Used by both end_survey and the entrypoint's exit path.
+"""
+
+import gzip
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from utils import outbox
+
+logger = logging.getLogger("survey-agent.transcript")
+
+VOICE_SERVICE_URL = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
+TRANSCRIPT_POST_TIMEOUT = 15
+
+
+def build_transcript_payload(
+    survey_id: str,
+    survey_responses: dict,
+    call_duration: float,
+    call_status: str,
+    audio_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    turns = [
+        {"role": "agent" if entry.get("role") == "agent" else "user", "text": entry.get("text", ""), "ts": entry.get("ts")}
+        for entry in survey_responses.get("_conversation_log", [])
+    ]
+    answers = {str(qid): str(ans) for qid, ans in survey_responses.get("answers", {}).items()}
+    payload = {
+        "survey_id": survey_id,
+        "turns": turns,
+        "answers": answers,
+        "call_duration_seconds": int(call_duration),
+        "call_status": call_status,
+    }
+    if audio_url:
+        payload["audio_url"] = audio_url
+    return payload
+
+
+def has_content(payload: Dict[str, Any]) -> bool:
+    return bool(payload["turns"] or payload["answers"])
+
+
+async def post_transcript(payload: Dict[str, Any]) -> bool:
+    """
+    Queue the transcript on the call's outbox (after its answers); returns
+    once it is stored, and the outbox delivers and retries it.
+    """
+    body = gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return await outbox.outbox_for(payload["survey_id"]).enqueue(
+        f"{VOICE_SERVICE_URL}/api/voice/transcripts",
+        data=body,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        timeout=TRANSCRIPT_POST_TIMEOUT,
+    )
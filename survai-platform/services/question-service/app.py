@@ -5,6 +5,8 @@ sys.path.insert(0, "/app")  # so shared package at /app/shared can be found
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import pool_stats
+
 from routes.questions import router as questions_router
 
 app = FastAPI(title="Question Service", version="1.0.0")
@@ -28,3 +30,8 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "OK"}
+
+
+@app.get("/health/db")
+async def health_db():
+    return {"service": "question-service", "pools": pool_stats()}
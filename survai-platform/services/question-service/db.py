@@ -7,13 +7,16 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
-from sqlalchemy import create_engine, text
+
+from shared.db import (
+    async_sql_execute as _async_sql_execute,
+    async_transaction as _async_transaction,
+    sql_execute as _sql_execute,
+)
 
 BRAIN_SERVICE_URL = os.getenv("BRAIN_SERVICE_URL", "http://brain-service:8016")
 
-engine = create_engine(
-    f"postgresql+psycopg2://{os.getenv('DB_USER', 'pguser')}:{os.getenv('DB_PASSWORD', 'root')}@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/db"
-)
+SERVICE_NAME = "question-service"
 
 
 def sql_execute(
@@ -25,13 +28,19 @@ def sql_execute(
     For SELECT: returns list of dicts.
     For INSERT/UPDATE/DELETE: commits and returns empty list.
     """
-    params = params if params is not None else {}
-    with engine.begin() as conn:
-        result = conn.execute(text(query), params)
-        if result.returns_rows:
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in result]
-        return []
+    return _sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+# ─── Async access (route handlers) ───────────────────────────────────────────
+
+async def async_sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
+    """Non-blocking sql_execute for route handlers (asyncpg pool, see shared.db)."""
+    return await _async_sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+def async_transaction():
+    """Atomic multi-statement block on this service's async pool."""
+    return _async_transaction(SERVICE_NAME)
 
 
 def get_current_time() -> str:
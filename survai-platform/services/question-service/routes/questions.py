@@ -4,7 +4,7 @@ from fastapi import APIRouter, HTTPException
 
 from shared.models.common import QuestionP, QuestionResponseP, SympathizeP
 
-from db import sql_execute, sympathize
+from db import async_sql_execute, async_transaction, sympathize
 
 router = APIRouter()
 
@@ -20,66 +20,67 @@ async def add_question(question: QuestionP):
     try:
         sql_query = """SELECT * FROM questions WHERE id = :question_id"""
         sql_dict = {"question_id": question.QueId}
-        res = sql_execute(sql_query, sql_dict)
+        res = await async_sql_execute(sql_query, sql_dict)
         if res:
             raise HTTPException(
                 status_code=400,
                 detail=f"Question with ID {question.QueId} already exists",
             )
 
-        sql_query = """INSERT INTO questions (id, text, criteria, scales, parent_id, autofill)
-VALUES (:id, :text, :criteria, :scales, :parent_id, :autofill)"""
-        sql_dict = {
-            "id": question.QueId,
-            "text": question.QueText,
-            "criteria": question.QueCriteria,
-            "scales": question.QueScale,
-            "parent_id": question.ParentId,
-            "autofill": question.Autofill,
-        }
-        sql_execute(sql_query, sql_dict)
-        if question.QueCriteria == "categorical":
-            question.QueCategories.append("None of the above")
-            sql_dict = []
-            for category_text in question.QueCategories:
-                sql_dict.append(
+        async with async_transaction() as tx:
+            sql_query = """INSERT INTO questions (id, text, criteria, scales, parent_id, autofill)
+    VALUES (:id, :text, :criteria, :scales, :parent_id, :autofill)"""
+            sql_dict = {
+                "id": question.QueId,
+                "text": question.QueText,
+                "criteria": question.QueCriteria,
+                "scales": question.QueScale,
+                "parent_id": question.ParentId,
+                "autofill": question.Autofill,
+            }
+            await tx.execute(sql_query, sql_dict)
+            if question.QueCriteria == "categorical":
+                question.QueCategories.append("None of the above")
+                sql_dict = []
+                for category_text in question.QueCategories:
+                    sql_dict.append(
+                        {
+                            "id": str(uuid4()),
+                            "question_id": question.QueId,
+                            "text": category_text,
+                        }
+                    )
+                sql_query = """
+                            INSERT INTO question_categories (id, question_id, text)
+                            VALUES (:id, :question_id, :text)
+                        """
+                await tx.execute(sql_query, sql_dict)
+
+            if question.ParentId and question.ParentCategoryTexts:
+                sql_query = """SELECT id, text FROM question_categories WHERE question_id = :parent_id"""
+                sql_dict = {"parent_id": question.ParentId}
+                parent_categories = await tx.execute(sql_query, sql_dict)
+                text_to_id = {row["text"]: row["id"] for row in parent_categories}
+
+                missing = [t for t in question.ParentCategoryTexts if t not in text_to_id]
+                if missing:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Parent categories not found for texts: {missing}",
+                    )
+
+                mappings = [
                     {
-                        "id": str(uuid4()),
-                        "question_id": question.QueId,
-                        "text": category_text,
+                        "child_question_id": question.QueId,
+                        "parent_category_id": text_to_id[t],
                     }
-                )
-            sql_query = """
-                        INSERT INTO question_categories (id, question_id, text)
-                        VALUES (:id, :question_id, :text)
-                    """
-            sql_execute(sql_query, sql_dict)
-
-        if question.ParentId and question.ParentCategoryTexts:
-            sql_query = """SELECT id, text FROM question_categories WHERE question_id = :parent_id"""
-            sql_dict = {"parent_id": question.ParentId}
-            parent_categories = sql_execute(sql_query, sql_dict)
-            text_to_id = {row["text"]: row["id"] for row in parent_categories}
-
-            missing = [t for t in question.ParentCategoryTexts if t not in text_to_id]
-            if missing:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Parent categories not found for texts: {missing}",
-                )
-
-            mappings = [
-                {
-                    "child_question_id": question.QueId,
-                    "parent_category_id": text_to_id[t],
-                }
-                for t in question.ParentCategoryTexts
-            ]
-            sql_query = """
-                INSERT INTO question_category_mappings (child_question_id, parent_category_id)
-                VALUES (:child_question_id, :parent_category_id)
-            """
-            sql_execute(sql_query, mappings)
+                    for t in question.ParentCategoryTexts
+                ]
+                sql_query = """
+                    INSERT INTO question_category_mappings (child_question_id, parent_category_id)
+                    VALUES (:child_question_id, :parent_category_id)
+                """
+                await tx.execute(sql_query, mappings)
 
         return f"Question with ID {question.QueId} added successfully"
     except HTTPException:
@@ -97,7 +98,7 @@ async def get_question(question_id: str):
     try:
         sql_query = """SELECT * FROM questions WHERE id = :question_id"""
         sql_dict = {"question_id": question_id}
-        res = sql_execute(sql_query, sql_dict)
+        res = await async_sql_execute(sql_query, sql_dict)
         if not res:
             raise HTTPException(
                 status_code=404, detail=f"Question with ID {question_id} not found"
@@ -108,7 +109,7 @@ async def get_question(question_id: str):
                 """SELECT * FROM question_categories WHERE question_id = :question_id"""
             )
             sql_dict = {"question_id": question_id}
-            categories = [item["text"] for item in sql_execute(sql_query, sql_dict)]
+            categories = [item["text"] for item in await async_sql_execute(sql_query, sql_dict)]
 
         parent_category_texts = None
         if res[0]["parent_id"]:
@@ -120,7 +121,7 @@ async def get_question(question_id: str):
                 ORDER BY qc.text
                 """
             sql_dict = {"child_id": question_id}
-            rows = sql_execute(sql_query, sql_dict)
+            rows = await async_sql_execute(sql_query, sql_dict)
             if rows:
                 parent_category_texts = [row["text"] for row in rows]
 
@@ -150,7 +151,7 @@ async def get_question_parent(question_id: str):
     try:
         sql_query = """SELECT * FROM questions WHERE id = :question_id"""
         sql_dict = {"question_id": question_id}
-        question = sql_execute(sql_query, sql_dict)
+        question = await async_sql_execute(sql_query, sql_dict)
         if not question:
             raise HTTPException(
                 status_code=404, detail=f"Question with ID {question_id} not found"
@@ -175,7 +176,7 @@ async def get_question_children(question_id: str, category_text: str | None = No
     try:
         sql_query = """SELECT * FROM questions WHERE id = :question_id"""
         sql_dict = {"question_id": question_id}
-        question = sql_execute(sql_query, sql_dict)
+        question = await async_sql_execute(sql_query, sql_dict)
         if not question:
             raise HTTPException(
                 status_code=404, detail=f"Question with ID {question_id} not found"
@@ -183,7 +184,7 @@ async def get_question_children(question_id: str, category_text: str | None = No
         if not category_text:
             sql_query = """SELECT id FROM questions WHERE parent_id = :question_id ORDER BY id"""
             sql_dict = {"question_id": question_id}
-            children = sql_execute(sql_query, sql_dict)
+            children = await async_sql_execute(sql_query, sql_dict)
             return [child["id"] for child in children]
 
         sql_query = """
@@ -208,7 +209,7 @@ async def get_question_children(question_id: str, category_text: str | None = No
             ORDER BY c.id
             """
         sql_dict = {"parent_id": question_id, "category_text": category_text}
-        children = sql_execute(sql_query, sql_dict)
+        children = await async_sql_execute(sql_query, sql_dict)
         return [child["id"] for child in children]
     except HTTPException:
         raise
@@ -225,7 +226,7 @@ async def list_questions():
     try:
         sql_query = """SELECT * FROM questions"""
         sql_dict = {}
-        questions = sql_execute(sql_query, sql_dict)
+        questions = await async_sql_execute(sql_query, sql_dict)
 
         result = []
         for question in questions:
@@ -233,7 +234,7 @@ async def list_questions():
             if question["criteria"] == "categorical":
                 sql_query = """SELECT * FROM question_categories WHERE question_id = :question_id"""
                 sql_dict = {"question_id": question["id"]}
-                categories = [item["text"] for item in sql_execute(sql_query, sql_dict)]
+                categories = [item["text"] for item in await async_sql_execute(sql_query, sql_dict)]
 
             parent_category_texts = None
             if question["parent_id"]:
@@ -245,7 +246,7 @@ async def list_questions():
                     ORDER BY qc.text
                     """
                 sql_dict = {"child_id": question["id"]}
-                rows = sql_execute(sql_query, sql_dict)
+                rows = await async_sql_execute(sql_query, sql_dict)
                 if rows:
                     parent_category_texts = [row["text"] for row in rows]
 
@@ -300,7 +301,7 @@ WHERE q.id = :question_id
 GROUP BY q.id, q.text, q.criteria, q.scales, q.parent_id
 ORDER BY q.id;"""
         sql_dict = {"question_id": question_id}
-        question_texts = sql_execute(sql_query, sql_dict)
+        question_texts = await async_sql_execute(sql_query, sql_dict)
         return question_texts
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -315,78 +316,79 @@ async def edit_question(question: QuestionP):
     try:
         sql_query = """SELECT * FROM questions WHERE id = :question_id"""
         sql_dict = {"question_id": question.QueId}
-        res = sql_execute(sql_query, sql_dict)
+        res = await async_sql_execute(sql_query, sql_dict)
         if not res:
             raise HTTPException(
                 status_code=400,
                 detail=f"Question with ID {question.QueId} does not exist",
             )
 
-        sql_query = (
-            """DELETE FROM question_categories WHERE question_id = :question_id"""
-        )
-        sql_dict = {"question_id": question.QueId}
-        sql_execute(sql_query, sql_dict)
-
-        sql_query = """UPDATE questions SET text = :text, criteria = :criteria, scales = :scales, parent_id = :parent_id, autofill = :autofill WHERE id = :id"""
-        sql_dict = {
-            "id": question.QueId,
-            "text": question.QueText,
-            "criteria": question.QueCriteria,
-            "scales": question.QueScale,
-            "parent_id": question.ParentId,
-            "autofill": question.Autofill,
-        }
-        sql_execute(sql_query, sql_dict)
-        if question.QueCriteria == "categorical":
-            if question.QueCategories is None:
-                question.QueCategories = []
-            if "None of the above" not in question.QueCategories:
-                question.QueCategories.append("None of the above")
-            sql_dict = []
-            for category_text in question.QueCategories:
-                sql_dict.append(
+        async with async_transaction() as tx:
+            sql_query = (
+                """DELETE FROM question_categories WHERE question_id = :question_id"""
+            )
+            sql_dict = {"question_id": question.QueId}
+            await tx.execute(sql_query, sql_dict)
+
+            sql_query = """UPDATE questions SET text = :text, criteria = :criteria, scales = :scales, parent_id = :parent_id, autofill = :autofill WHERE id = :id"""
+            sql_dict = {
+                "id": question.QueId,
+                "text": question.QueText,
+                "criteria": question.QueCriteria,
+                "scales": question.QueScale,
+                "parent_id": question.ParentId,
+                "autofill": question.Autofill,
+            }
+            await tx.execute(sql_query, sql_dict)
+            if question.QueCriteria == "categorical":
+                if question.QueCategories is None:
+                    question.QueCategories = []
+                if "None of the above" not in question.QueCategories:
+                    question.QueCategories.append("None of the above")
+                sql_dict = []
+                for category_text in question.QueCategories:
+                    sql_dict.append(
+                        {
+                            "id": str(uuid4()),
+                            "question_id": question.QueId,
+                            "text": category_text,
+                        }
+                    )
+                sql_query = """
+                            INSERT INTO question_categories (id, question_id, text)
+                            VALUES (:id, :question_id, :text)
+                        """
+                await tx.execute(sql_query, sql_dict)
+
+            sql_query = """DELETE FROM question_category_mappings WHERE child_question_id = :child_id"""
+            sql_dict = {"child_id": question.QueId}
+            await tx.execute(sql_query, sql_dict)
+
+            if question.ParentId and question.ParentCategoryTexts:
+                sql_query = """SELECT id, text FROM question_categories WHERE question_id = :parent_id"""
+                sql_dict = {"parent_id": question.ParentId}
+                parent_categories = await tx.execute(sql_query, sql_dict)
+                text_to_id = {row["text"]: row["id"] for row in parent_categories}
+
+                missing = [t for t in question.ParentCategoryTexts if t not in text_to_id]
+                if missing:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Parent categories not found for texts: {missing}",
+                    )
+
+                mappings = [
                     {
-                        "id": str(uuid4()),
-                        "question_id": question.QueId,
-                        "text": category_text,
+                        "child_question_id": question.QueId,
+                        "parent_category_id": text_to_id[t],
                     }
-                )
-            sql_query = """
-                        INSERT INTO question_categories (id, question_id, text)
-                        VALUES (:id, :question_id, :text)
-                    """
-            sql_execute(sql_query, sql_dict)
-
-        sql_query = """DELETE FROM question_category_mappings WHERE child_question_id = :child_id"""
-        sql_dict = {"child_id": question.QueId}
-        sql_execute(sql_query, sql_dict)
-
-        if question.ParentId and question.ParentCategoryTexts:
-            sql_query = """SELECT id, text FROM question_categories WHERE question_id = :parent_id"""
-            sql_dict = {"parent_id": question.ParentId}
-            parent_categories = sql_execute(sql_query, sql_dict)
-            text_to_id = {row["text"]: row["id"] for row in parent_categories}
-
-            missing = [t for t in question.ParentCategoryTexts if t not in text_to_id]
-            if missing:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Parent categories not found for texts: {missing}",
-                )
-
-            mappings = [
-                {
-                    "child_question_id": question.QueId,
-                    "parent_category_id": text_to_id[t],
-                }
-                for t in question.ParentCategoryTexts
-            ]
-            sql_query = """
-                INSERT INTO question_category_mappings (child_question_id, parent_category_id)
-                VALUES (:child_question_id, :parent_category_id)
-            """
-            sql_execute(sql_query, mappings)
+                    for t in question.ParentCategoryTexts
+                ]
+                sql_query = """
+                    INSERT INTO question_category_mappings (child_question_id, parent_category_id)
+                    VALUES (:child_question_id, :parent_category_id)
+                """
+                await tx.execute(sql_query, mappings)
 
         return question
     except HTTPException:
@@ -402,19 +404,20 @@ async def edit_question(question: QuestionP):
 )
 async def delete_question(question_id: str):
     try:
-        sql_query = """DELETE FROM question_categories
- WHERE question_id = :question_id
-    OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)"""
-        sql_dict = {"question_id": question_id}
-        sql_execute(sql_query, sql_dict)
+        async with async_transaction() as tx:
+            sql_query = """DELETE FROM question_categories
+     WHERE question_id = :question_id
+        OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)"""
+            sql_dict = {"question_id": question_id}
+            await tx.execute(sql_query, sql_dict)
 
-        sql_query = """DELETE FROM questions WHERE parent_id = :question_id"""
-        sql_dict = {"question_id": question_id}
-        sql_execute(sql_query, sql_dict)
+            sql_query = """DELETE FROM questions WHERE parent_id = :question_id"""
+            sql_dict = {"question_id": question_id}
+            await tx.execute(sql_query, sql_dict)
 
-        sql_query = """DELETE FROM questions WHERE id = :question_id"""
-        sql_dict = {"question_id": question_id}
-        sql_execute(sql_query, sql_dict)
+            sql_query = """DELETE FROM questions WHERE id = :question_id"""
+            sql_dict = {"question_id": question_id}
+            await tx.execute(sql_query, sql_dict)
 
         return {"message": f"Question with ID {question_id} deleted successfully"}
     except Exception as e:
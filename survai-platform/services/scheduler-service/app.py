@@ -1,6 +1,6 @@
 """
 Scheduler Service -- Port 8070
-APScheduler for delayed calls and recurring campaigns.
+Postgres call queue for delayed calls and retries, APScheduler for recurring campaigns.
 """
 
 import sys
@@ -13,6 +13,10 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+
+from dialer import campaign_dialer
+from call_queue import call_queue
 from routes.scheduler import router as scheduler_router
 
 logging.basicConfig(level=logging.INFO)
@@ -25,9 +29,14 @@ async def lifespan(app: FastAPI):
     from routes.scheduler import get_scheduler
     sched = get_scheduler()
     sched.start()
+    await call_queue.startup()
+    await campaign_dialer.startup()
     yield
     logger.info("Scheduler Service shutting down...")
     sched.shutdown(wait=False)
+    await campaign_dialer.shutdown()
+    await call_queue.shutdown()
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -58,6 +67,11 @@ async def health():
     return {"status": "OK", "service": "scheduler-service"}
 
 
+@app.get("/health/db")
+async def health_db():
+    return {"service": "scheduler-service", "pools": pool_stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,305 @@
+"""
+Scheduled call queue for the Scheduler Service.
+
+Every call the scheduler places is a scheduled_calls row, one per attempt:
+
+  pending  ──claim──▶  claimed  ──make-call accepted──▶  dialing  ──outcome──▶  done
+                       (lease)                                                  (+ next attempt's row)
+
+schedule-call inserts a pending row. CALL_QUEUE_WORKERS async workers each
+claim up to CALL_QUEUE_BATCH due rows with UPDATE ... WHERE id IN (SELECT
+... FOR UPDATE SKIP LOCKED), so any number of replicas share the queue
+without double-dialing, and dial them concurrently. A claim holds a lease
+of CLAIM_LEASE_SECONDS; rows whose worker died mid make-call are reclaimed
+when it expires.
+
+The outcome, either the make-call HTTP status or the end reason voice-service
+reports to POST /scheduler/call-outcome, goes through retry_policy: a retry
+is a new pending row with attempt + 1 (campaign retries moved into the
+target's calling window), so the table doubles as the attempt history.
+Campaign dials (dialer.py) are recorded when placed, numbered after the
+survey's earlier attempts in the campaign, so MAX_CALL_ATTEMPTS holds
+across campaign runs rather than resetting with each one.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+
+import calling_window
+import retry_policy
+from shared.db import utc_now
+from db import async_sql_execute
+
+logger = logging.getLogger(__name__)
+
+CALL_QUEUE_WORKERS = int(os.getenv("CALL_QUEUE_WORKERS", "4"))
+CALL_QUEUE_BATCH = int(os.getenv("CALL_QUEUE_BATCH", "25"))
+CALL_QUEUE_POLL_SECONDS = float(os.getenv("CALL_QUEUE_POLL_SECONDS", "5"))
+# Covers voice-service DIAL_QUEUE_TIMEOUT_SECONDS plus dispatch time
+CALL_TIMEOUT_SECONDS = 90.0
+CLAIM_LEASE_SECONDS = CALL_TIMEOUT_SECONDS + 30
+# A dial with no outcome after this long (agent crashed, callback lost) is given up
+DIALING_STALE_SECONDS = 2 * 3600
+HOUSEKEEPING_EVERY_SECONDS = 60.0
+
+VOICE_SERVICE_URL = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
+
+
+async def place_call(client: httpx.AsyncClient, survey_id: str, phone: str, priority: str = "normal") -> str:
+    """POST make-call; returns retry_policy.DISPATCHED or the failure outcome."""
+    try:
+        r = await client.post(
+            f"{VOICE_SERVICE_URL}/api/voice/make-call",
+            params={"survey_id": survey_id, "phone": phone, "priority": priority},
+        )
+    except httpx.HTTPError as e:
+        logger.error(f"Call for survey {survey_id} not placed: {e}")
+        return retry_policy.classify_status(None)
+    outcome = retry_policy.classify_status(r.status_code)
+    if outcome == retry_policy.DISPATCHED:
+        logger.info(f"Call triggered: survey={survey_id}")
+    else:
+        logger.error(f"Call for survey {survey_id} refused ({r.status_code}): {r.text[:200]}")
+    return outcome
+
+
+class CallQueue:
+    def __init__(
+        self,
+        workers: int = CALL_QUEUE_WORKERS,
+        batch_size: int = CALL_QUEUE_BATCH,
+        poll_seconds: float = CALL_QUEUE_POLL_SECONDS,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────
+
+    async def startup(self) -> None:
+        concurrency = self.workers * self.batch_size
+        self._client = httpx.AsyncClient(
+            timeout=CALL_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=self.workers),
+        )
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._housekeeping()))
+
+    async def shutdown(self) -> None:
+        """Stop claiming; rows claimed by this process are reclaimed when their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._client:
+            await self._client.aclose()
+
+    # ─── Rows ─────────────────────────────────────────────────────────────
+
+    async def schedule(
+        self,
+        survey_id: str,
+        phone: str,
+        run_at: datetime,
+        campaign_id: Optional[str] = None,
+        attempt: int = 1,
+    ) -> str:
+        """Queue a call for run_at (naive UTC); returns the row id."""
+        call_id = str(uuid4())
+        now = utc_now()
+        await async_sql_execute(
+            """INSERT INTO scheduled_calls (id, survey_id, phone, campaign_id, attempt, state, run_at,
+                                            created_at, updated_at)
+               VALUES (:id, :survey_id, :phone, :campaign_id, :attempt, 'pending', :run_at, :now, :now)""",
+            {
+                "id": call_id, "survey_id": survey_id, "phone": phone, "campaign_id": campaign_id,
+                "attempt": attempt, "run_at": run_at, "now": now,
+            },
+        )
+        return call_id
+
+    async def cancel(self, call_id: str) -> bool:
+        rows = await async_sql_execute(
+            """UPDATE scheduled_calls SET state = 'cancelled', updated_at = :now
+               WHERE id = :id AND state = 'pending' RETURNING id""",
+            {"id": call_id, "now": utc_now()},
+        )
+        return bool(rows)
+
+    async def begin(self, survey_id: str, phone: str, campaign_id: Optional[str] = None) -> Optional[str]:
+        """
+        Record a dial placed outside the queue (campaign runs), superseding
+        pending retries. Its attempt number continues the survey's series in
+        the campaign across runs; returns None, recording nothing, when
+        MAX_CALL_ATTEMPTS dials have already been made.
+        """
+        call_id = str(uuid4())
+        now = utc_now()
+        await self._cancel_pending(survey_id, now)
+        # Dialed rows only: cancelled ones never went out, a 409 means another dial was live
+        rows = await async_sql_execute(
+            """INSERT INTO scheduled_calls (id, survey_id, phone, campaign_id, attempt, state, run_at,
+                                            created_at, updated_at)
+               SELECT CAST(:id AS text), CAST(:survey_id AS text), CAST(:phone AS text),
+                      CAST(:campaign_id AS text), prior.n + 1, 'claimed',
+                      CAST(:now AS timestamp), CAST(:now AS timestamp), CAST(:now AS timestamp)
+               FROM (SELECT COUNT(*) AS n FROM scheduled_calls
+                     WHERE survey_id = :survey_id
+                       AND campaign_id IS NOT DISTINCT FROM CAST(:campaign_id AS text)
+                       AND state IN ('claimed', 'dialing', 'done')
+                       AND COALESCE(last_outcome, '') <> 'http_409') prior
+               WHERE prior.n < :max_attempts
+               RETURNING id""",
+            {
+                "id": call_id, "survey_id": survey_id, "phone": phone, "campaign_id": campaign_id,
+                "now": now, "max_attempts": retry_policy.MAX_CALL_ATTEMPTS,
+            },
+        )
+        return call_id if rows else None
+
+    async def _cancel_pending(self, survey_id: str, now: datetime) -> None:
+        await async_sql_execute(
+            """UPDATE scheduled_calls SET state = 'cancelled', updated_at = :now
+               WHERE survey_id = :survey_id AND state = 'pending'""",
+            {"survey_id": survey_id, "now": now},
+        )
+
+    async def record(self, survey_id: str, outcome: str, call_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Apply the outcome of an attempt: call_id's, or the survey's live one
+        when the outcome comes from voice-service. Returns that row with
+        next_run_at set when another attempt was queued, or None if there is
+        no live attempt (manual make-call, already settled).
+        """
+        now = utc_now()
+        if outcome == "http_409":
+            # Another dial of this survey is live and owns the series: close this row, no retry
+            await async_sql_execute(
+                """UPDATE scheduled_calls SET state = 'done', lease_until = NULL, last_outcome = :outcome,
+                                              updated_at = :now
+                   WHERE id = :id AND state = 'claimed'""",
+                {"id": call_id, "outcome": outcome, "now": now},
+            )
+            return None
+        if outcome == retry_policy.DISPATCHED:
+            await async_sql_execute(
+                """UPDATE scheduled_calls SET state = 'dialing', lease_until = NULL, updated_at = :now
+                   WHERE id = :id AND state = 'claimed'""",
+                {"id": call_id, "now": now},
+            )
+            return None
+        rows = await async_sql_execute(
+            """UPDATE scheduled_calls SET state = 'done', lease_until = NULL, last_outcome = :outcome,
+                                          updated_at = :now
+               WHERE id = COALESCE(CAST(:id AS text), (
+                   SELECT id FROM scheduled_calls
+                   WHERE survey_id = :survey_id AND state IN ('claimed', 'dialing')
+                   ORDER BY updated_at DESC LIMIT 1
+               ))
+               RETURNING id, survey_id, phone, campaign_id, attempt""",
+            {"id": call_id, "survey_id": survey_id, "outcome": outcome, "now": now},
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        run_at = retry_policy.next_attempt_at(outcome, row["attempt"], now)
+        if run_at is None:
+            logger.info(f"Survey {survey_id}: attempt {row['attempt']} ended '{outcome}', no retry")
+            return {**row, "next_run_at": None}
+        if row["campaign_id"]:
+            run_at = await self._in_window(survey_id, run_at)
+        await self._cancel_pending(survey_id, now)
+        await self.schedule(survey_id, row["phone"], run_at, row["campaign_id"], row["attempt"] + 1)
+        logger.info(
+            f"Survey {survey_id}: attempt {row['attempt']} ended '{outcome}', "
+            f"retry at {run_at.isoformat()}"
+        )
+        return {**row, "next_run_at": run_at}
+
+    async def _in_window(self, survey_id: str, run_at: datetime) -> datetime:
+        rows = await async_sql_execute(
+            """SELECT COALESCE(NULLIF(s.timezone, ''), c.timezone) AS timezone,
+                      c.call_window_start, c.call_window_end
+               FROM surveys s JOIN campaigns c ON c.id = s.campaign_id
+               WHERE s.id = :survey_id""",
+            {"survey_id": survey_id},
+        )
+        if not rows:
+            return run_at
+        window = calling_window.resolve(rows[0]["timezone"], rows[0]["call_window_start"], rows[0]["call_window_end"])
+        return calling_window.next_eligible(run_at, *window)
+
+    # ─── Workers ──────────────────────────────────────────────────────────
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        """Lease up to batch_size due rows (or rows whose lease expired) to this worker."""
+        now = utc_now()
+        return await async_sql_execute(
+            """UPDATE scheduled_calls SET state = 'claimed', lease_until = :lease_until, updated_at = :now
+               WHERE id IN (
+                   SELECT q.id FROM scheduled_calls q
+                   WHERE ((q.state = 'pending' AND q.run_at <= :now)
+                          OR (q.state = 'claimed' AND q.lease_until < :now))
+                     AND NOT EXISTS (SELECT 1 FROM surveys s WHERE s.id = q.survey_id AND s.status = 'Completed')
+                   ORDER BY q.run_at
+                   LIMIT :limit
+                   FOR UPDATE SKIP LOCKED
+               )
+               RETURNING id, survey_id, phone, campaign_id, attempt""",
+            {"now": now, "lease_until": now + timedelta(seconds=CLAIM_LEASE_SECONDS), "limit": self.batch_size},
+        )
+
+    async def _dial(self, row: Dict[str, Any]) -> None:
+        if row["attempt"] > 1:
+            logger.info(f"Retrying survey {row['survey_id']} (attempt {row['attempt']}/{retry_policy.MAX_CALL_ATTEMPTS})")
+        priority = "low" if row["campaign_id"] else "normal"
+        try:
+            outcome = await place_call(self._client, row["survey_id"], row["phone"], priority)
+            await self.record(row["survey_id"], outcome, row["id"])
+        except Exception as e:
+            logger.error(f"Scheduled call {row['id']} for survey {row['survey_id']} failed: {e}")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                due = await self._claim()
+                if due:
+                    await asyncio.gather(*(self._dial(row) for row in due))
+                    if len(due) == self.batch_size:
+                        continue  # more are probably due
+            except Exception as e:
+                logger.error(f"Call queue worker {index}: claim failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _housekeeping(self) -> None:
+        """Close rows that no longer need a dial."""
+        while True:
+            try:
+                now = utc_now()
+                # Due calls for surveys completed some other way (a callback, the web link)
+                await async_sql_execute(
+                    """UPDATE scheduled_calls q SET state = 'cancelled', updated_at = :now
+                       FROM surveys s
+                       WHERE s.id = q.survey_id AND q.state = 'pending' AND q.run_at <= :now
+                         AND s.status = 'Completed'""",
+                    {"now": now},
+                )
+                await async_sql_execute(
+                    """UPDATE scheduled_calls SET state = 'done', last_outcome = 'lost', updated_at = :now
+                       WHERE (state = 'dialing' OR (state = 'claimed' AND lease_until IS NULL))
+                         AND updated_at < :stale""",
+                    {"now": now, "stale": now - timedelta(seconds=DIALING_STALE_SECONDS)},
+                )
+            except Exception as e:
+                logger.warning(f"Call queue housekeeping failed: {e}")
+            await asyncio.sleep(HOUSEKEEPING_EVERY_SECONDS)
+
+
+call_queue = CallQueue()
@@ -0,0 +1,58 @@
+"""
+Local-time calling windows for campaign dials.
+
+Each target is dialed only between window_start and window_end in its own
+timezone: surveys.timezone if set, else the campaign's timezone, else
+CALL_WINDOW_TIMEZONE. Windows come from the campaign, else the
+CALL_WINDOW_START / CALL_WINDOW_END defaults. A window whose start is after
+its end runs overnight (e.g. 18:00-02:00).
+
+All datetimes in and out are naive UTC, like the rest of the schema.
+"""
+
+import logging
+import os
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEZONE = os.getenv("CALL_WINDOW_TIMEZONE", "America/New_York")
+DEFAULT_WINDOW_START = time.fromisoformat(os.getenv("CALL_WINDOW_START", "09:00"))
+DEFAULT_WINDOW_END = time.fromisoformat(os.getenv("CALL_WINDOW_END", "20:00"))
+
+
+def resolve(tz_name: Optional[str], start: Optional[time], end: Optional[time]) -> Tuple[str, time, time]:
+    """Fill in defaults and fall back to DEFAULT_TIMEZONE for unknown zone names."""
+    tz_name = (tz_name or "").strip() or DEFAULT_TIMEZONE
+    try:
+        ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone {tz_name!r}, using {DEFAULT_TIMEZONE}")
+        tz_name = DEFAULT_TIMEZONE
+    return tz_name, start or DEFAULT_WINDOW_START, end or DEFAULT_WINDOW_END
+
+
+def _local(now_utc: datetime, tz_name: str) -> datetime:
+    return now_utc.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(tz_name))
+
+
+def _in_window(t: time, start: time, end: time) -> bool:
+    if start <= end:
+        return start <= t < end
+    return t >= start or t < end
+
+
+def is_open(now_utc: datetime, tz_name: str, start: time, end: time) -> bool:
+    return _in_window(_local(now_utc, tz_name).time(), start, end)
+
+
+def next_eligible(now_utc: datetime, tz_name: str, start: time, end: time) -> datetime:
+    """now_utc if the window is open, else the UTC time the next window opens."""
+    local = _local(now_utc, tz_name)
+    if _in_window(local.time(), start, end):
+        return now_utc
+    day = local.date() if local.time() < start else local.date() + timedelta(days=1)
+    opens = datetime.combine(day, start, tzinfo=ZoneInfo(tz_name))
+    return opens.astimezone(timezone.utc).replace(tzinfo=None)
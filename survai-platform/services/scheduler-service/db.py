@@ -3,44 +3,42 @@ Database operations for the Scheduler Service.
 Reads/Writes: campaigns, surveys, job_history.
 """
 
-import os
 import logging
 from typing import Any, Dict, List, Union
 
-from sqlalchemy import create_engine, text
+from shared.db import (
+    async_sql_execute as _async_sql_execute,
+    async_transaction as _async_transaction,
+    get_engine as _get_engine,
+    sql_execute as _sql_execute,
+)
 
 logger = logging.getLogger(__name__)
 
-_engine = None
+SERVICE_NAME = "scheduler-service"
 
 
 def get_engine():
-    global _engine
-    if _engine is None:
-        db_host = os.getenv("DB_HOST", "localhost")
-        db_port = os.getenv("DB_PORT", "5432")
-        db_user = os.getenv("DB_USER", "pguser")
-        db_password = os.getenv("DB_PASSWORD", "root")
-        url = f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/db"
-        _engine = create_engine(url, pool_size=5, max_overflow=10, pool_pre_ping=True)
-    return _engine
+    """This service's sync engine (pool sized via env, see shared.db)."""
+    return _get_engine(SERVICE_NAME)
 
 
 def sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
     """
     Execute a SQL query. For SELECT: returns list of dicts.
     For mutations: commits and returns empty list.
+    params: single dict or list of dicts for batch operations.
     """
-    engine = get_engine()
-    with engine.connect() as conn:
-        if isinstance(params, list):
-            result = conn.execute(text(query), params)
-            conn.commit()
-            return []
-        result = conn.execute(text(query), params or {})
-        if result.returns_rows:
-            rows = result.fetchall()
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in rows]
-        conn.commit()
-        return []
+    return _sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+# ─── Async access (route handlers) ───────────────────────────────────────────
+
+async def async_sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
+    """Non-blocking sql_execute for route handlers (asyncpg pool, see shared.db)."""
+    return await _async_sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+def async_transaction():
+    """Atomic multi-statement block on this service's async pool."""
+    return _async_transaction(SERVICE_NAME)
@@ -0,0 +1,559 @@
+"""
+Campaign dialer for the Scheduler Service.
+
+A campaign run dials every In-Progress survey with a phone in the campaign,
+in two steps that both resume after a restart:
+
+1. enqueue: targets are read in pages of CAMPAIGN_PAGE_SIZE, keyset-ordered
+   by surveys.id, and upserted into dial_queue with their calling window
+   (see calling_window.py) and next_eligible_at, the UTC time that window
+   next opens. campaign_runs.checkpoint_id is the last survey id enqueued.
+2. dispatch: eligible rows are claimed with one range query on
+   (run_id, next_eligible_at) FOR UPDATE SKIP LOCKED. A pacer releases at
+   most CAMPAIGN_CALLS_PER_MINUTE dials, and a pool of
+   CAMPAIGN_DIAL_CONCURRENCY workers posts them to voice-service make-call
+   (priority=low, so they queue behind one-off calls in admission control)
+   on one shared httpx.AsyncClient. Each dial is recorded as the survey's
+   next attempt in scheduled_calls (call_queue.py), so busy, unanswered and
+   refused calls are retried by the call queue, not by the run, and targets
+   that used MAX_CALL_ATTEMPTS in earlier runs are not enqueued. A row
+   whose window closed while it waited is put back with its next opening
+   time. When nothing is eligible the run sleeps until the earliest window
+   opens, so calls are only placed at reasonable local hours.
+
+A run belongs to the replica holding its lease (campaign_runs.owner /
+lease_until, renewed by every checkpoint), and a campaign has at most one
+running run, so several scheduler replicas never dial the same campaign.
+Runs still marked running whose lease is free or expired (a restart, or a
+replica that died) are adopted on startup and every RUN_LEASE_SECONDS.
+A run starting or resuming puts the campaign's rows left 'dialing' back in
+the queue, so only calls in flight at a crash can be dialed again
+(voice-service rejects a survey that is already on a call); a run that is
+cancelled or fails does the same on its way out. progress() reports
+counts, throughput and ETA for the live run.
+
+Runs execute on the app's event loop; APScheduler jobs (threads) hand
+campaigns over with submit().
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import httpx
+
+import calling_window
+import retry_policy
+from shared.db import utc_now
+from db import async_sql_execute
+from call_queue import call_queue, place_call
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_CALLS_PER_MINUTE = float(os.getenv("CAMPAIGN_CALLS_PER_MINUTE", "30"))
+CAMPAIGN_DIAL_CONCURRENCY = int(os.getenv("CAMPAIGN_DIAL_CONCURRENCY", "8"))
+CAMPAIGN_PAGE_SIZE = int(os.getenv("CAMPAIGN_PAGE_SIZE", "200"))
+# Covers voice-service DIAL_QUEUE_TIMEOUT_SECONDS plus dispatch time
+CAMPAIGN_CALL_TIMEOUT_SECONDS = 90.0
+CHECKPOINT_EVERY_SECONDS = 5.0
+# Longest sleep while every queued target is outside its calling window
+WINDOW_POLL_SECONDS = 60.0
+# A run whose lease is not renewed for this long is adopted by another replica
+RUN_LEASE_SECONDS = float(os.getenv("CAMPAIGN_RUN_LEASE_SECONDS", "30"))
+
+# Lease owner; stable across a restart of the same container, so it re-takes its runs at once
+_OWNER = f"{socket.gethostname()}-{os.getpid()}"
+
+# Targets that still have attempts left in this campaign (see CallQueue.begin)
+_TARGET_FILTER = """s.campaign_id = :cid AND s.status = 'In-Progress'
+                     AND s.phone IS NOT NULL AND s.phone != ''
+                     AND (SELECT COUNT(*) FROM scheduled_calls sc
+                          WHERE sc.survey_id = s.id AND sc.campaign_id = s.campaign_id
+                            AND sc.state IN ('claimed', 'dialing', 'done')
+                            AND COALESCE(sc.last_outcome, '') <> 'http_409') < :max_attempts"""
+
+
+class _RunState:
+    """Live counters for one run; the DB row is refreshed from this at each checkpoint."""
+
+    def __init__(self, row: Dict[str, Any]):
+        self.run_id: str = row["id"]
+        self.campaign_id: str = row["campaign_id"]
+        self.checkpoint_id: Optional[str] = row.get("checkpoint_id")
+        self.total: int = row.get("total") or 0
+        self.dialed: int = row.get("dialed") or 0
+        self.succeeded: int = row.get("succeeded") or 0
+        self.failed: int = row.get("failed") or 0
+        self.started_at = row.get("started_at")
+        self.resumed_dialed = self.dialed
+        self.resumed_at = time.monotonic()
+        self.in_flight = 0
+        # Queued targets outside their calling window, and when the first of those opens
+        self.waiting = 0
+        self.next_window_at: Optional[datetime] = None
+        # Why the run task was cancelled: "cancelled" by a user, "lost" its lease, None on shutdown
+        self.stop_reason: Optional[str] = None
+
+    def finished(self, ok: bool) -> None:
+        self.in_flight -= 1
+        self.dialed += 1
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.resumed_at
+        rate = (self.dialed - self.resumed_dialed) / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = max(self.total - self.dialed, 0)
+        pace = rate or CAMPAIGN_CALLS_PER_MINUTE
+        eta = remaining / pace * 60 if remaining else 0.0
+        if self.waiting and self.next_window_at:
+            eta = max(eta - self.waiting / pace * 60, (self.next_window_at - utc_now()).total_seconds())
+            eta += self.waiting / pace * 60
+        return {
+            "run_id": self.run_id,
+            "campaign_id": self.campaign_id,
+            "status": "running",
+            "total": self.total,
+            "dialed": self.dialed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "remaining": remaining,
+            "waiting_for_window": self.waiting,
+            "next_window_at": self.next_window_at.isoformat() if self.next_window_at else None,
+            "calls_per_minute": round(rate, 2),
+            "eta_seconds": round(eta),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+        }
+
+
+class CampaignDialer:
+    def __init__(
+        self,
+        calls_per_minute: float = CAMPAIGN_CALLS_PER_MINUTE,
+        concurrency: int = CAMPAIGN_DIAL_CONCURRENCY,
+        page_size: int = CAMPAIGN_PAGE_SIZE,
+    ):
+        self.calls_per_minute = calls_per_minute
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Dict[str, asyncio.Task] = {}   # campaign_id -> run task
+        self._runs: Dict[str, _RunState] = {}       # campaign_id -> live state
+        self._starting: set = set()
+        self._adopter: Optional[asyncio.Task] = None
+
+    # ─── Lifecycle ────────────────────────────────────────────────────────
+
+    async def startup(self) -> None:
+        """Bind to the app loop, resume runs interrupted by a restart and keep adopting orphaned ones."""
+        self._loop = asyncio.get_running_loop()
+        await self._adopt()
+        self._adopter = asyncio.create_task(self._adopt_loop())
+
+    async def shutdown(self) -> None:
+        """Stop dialing; runs stay 'running' in the DB with their lease released, for any replica to resume."""
+        if self._adopter is not None:
+            self._adopter.cancel()
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _adopt(self) -> None:
+        """Take and resume running runs no live replica holds."""
+        try:
+            rows = await async_sql_execute(
+                """SELECT id, campaign_id FROM campaign_runs
+                   WHERE status = 'running' AND (owner IS NULL OR owner = :owner OR lease_until < :now)
+                   ORDER BY started_at""",
+                {"owner": _OWNER, "now": utc_now()},
+            )
+        except Exception as e:
+            logger.error(f"Could not load interrupted campaign runs: {e}")
+            return
+        for candidate in rows:
+            if candidate["campaign_id"] in self._tasks:
+                continue
+            row = await self._acquire(candidate["id"])
+            if row is None:
+                continue  # another replica took it first
+            logger.info(f"Resuming campaign {row['campaign_id']} run {row['id']} after {row['checkpoint_id']}")
+            self._launch(row)
+
+    async def _adopt_loop(self) -> None:
+        while True:
+            await asyncio.sleep(RUN_LEASE_SECONDS)
+            await self._adopt()
+
+    async def _acquire(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Take the run's lease if it is free or expired; returns the run row when taken."""
+        now = utc_now()
+        rows = await async_sql_execute(
+            """UPDATE campaign_runs SET owner = :owner, lease_until = :lease_until
+               WHERE id = :id AND status = 'running'
+                 AND (owner IS NULL OR owner = :owner OR lease_until < :now)
+               RETURNING *""",
+            {"id": run_id, "owner": _OWNER, "now": now,
+             "lease_until": now + timedelta(seconds=RUN_LEASE_SECONDS)},
+        )
+        return rows[0] if rows else None
+
+    def submit(self, campaign_id: str) -> None:
+        """Start a run from a non-loop thread (APScheduler jobs)."""
+        if self._loop is None:
+            logger.error(f"Campaign {campaign_id}: dialer not started, skipping run")
+            return
+        asyncio.run_coroutine_threadsafe(self.start(campaign_id), self._loop)
+
+    async def start(self, campaign_id: str) -> Dict[str, Any]:
+        """Start a run for campaign_id unless one is already live; returns its progress."""
+        if campaign_id in self._tasks:
+            return self._runs[campaign_id].progress()
+        if campaign_id in self._starting:
+            return {"campaign_id": campaign_id, "status": "starting"}
+        self._starting.add(campaign_id)
+        try:
+            rows = await async_sql_execute(
+                f"SELECT COUNT(*) AS n FROM surveys s WHERE {_TARGET_FILTER}",
+                {"cid": campaign_id, "max_attempts": retry_policy.MAX_CALL_ATTEMPTS},
+            )
+            run_id = str(uuid4())
+            now = utc_now()
+            row = {
+                "id": run_id, "campaign_id": campaign_id, "total": rows[0]["n"], "started_at": now,
+                "owner": _OWNER, "lease_until": now + timedelta(seconds=RUN_LEASE_SECONDS),
+            }
+            # At most one running run per campaign (partial unique index), whichever replica holds it
+            inserted = await async_sql_execute(
+                """INSERT INTO campaign_runs (id, campaign_id, status, total, started_at, updated_at, owner, lease_until)
+                   VALUES (:id, :campaign_id, 'running', :total, :started_at, :started_at, :owner, :lease_until)
+                   ON CONFLICT (campaign_id) WHERE status = 'running' DO NOTHING
+                   RETURNING id""",
+                row,
+            )
+        finally:
+            self._starting.discard(campaign_id)
+        if not inserted:
+            logger.info(f"Campaign {campaign_id}: a run is already in progress, not starting another")
+            return await self.progress(campaign_id)
+        logger.info(f"Campaign {campaign_id}: run {run_id} started, {row['total']} targets")
+        self._launch(row)
+        return self._runs[campaign_id].progress()
+
+    async def cancel(self, campaign_id: str) -> bool:
+        task = self._tasks.get(campaign_id)
+        if task is not None:
+            self._runs[campaign_id].stop_reason = "cancelled"
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return True
+        # Held by another replica (or orphaned): its owner stops at the next lease renewal
+        rows = await async_sql_execute(
+            """UPDATE campaign_runs SET status = 'cancelled', finished_at = :now, updated_at = :now
+               WHERE campaign_id = :cid AND status = 'running'
+               RETURNING id""",
+            {"cid": campaign_id, "now": utc_now()},
+        )
+        return bool(rows)
+
+    def _launch(self, row: Dict[str, Any]) -> None:
+        state = _RunState(row)
+        self._runs[state.campaign_id] = state
+        task = asyncio.create_task(self._run(state))
+        self._tasks[state.campaign_id] = task
+        task.add_done_callback(lambda _t: self._forget(state))
+
+    def _forget(self, state: _RunState) -> None:
+        if self._runs.get(state.campaign_id) is state:
+            self._runs.pop(state.campaign_id, None)
+            self._tasks.pop(state.campaign_id, None)
+
+    # ─── Run ──────────────────────────────────────────────────────────────
+
+    async def _checkpoint(
+        self, state: _RunState, status: str = "running", error: Optional[str] = None, release: bool = False,
+    ) -> bool:
+        """
+        Write the run's counters and renew its lease, or release it when the
+        run stops. Returns False when this replica no longer holds the run:
+        the lease was taken over, or the run was cancelled from another replica.
+        """
+        now = utc_now()
+        holding = status == "running" and not release
+        rows = await async_sql_execute(
+            """UPDATE campaign_runs
+               SET status = :status, checkpoint_id = :checkpoint_id, total = :total, dialed = :dialed,
+                   succeeded = :succeeded, failed = :failed, updated_at = :now,
+                   finished_at = CASE WHEN :status = 'running' THEN NULL ELSE CAST(:now AS timestamp) END,
+                   error = :error, owner = :next_owner, lease_until = :lease_until
+               WHERE id = :id AND owner = :owner AND (status = 'running' OR :status <> 'running')
+               RETURNING id""",
+            {
+                "id": state.run_id, "status": status, "checkpoint_id": state.checkpoint_id,
+                "total": state.total, "dialed": state.dialed, "succeeded": state.succeeded,
+                "failed": state.failed, "now": now, "error": error, "owner": _OWNER,
+                "next_owner": _OWNER if holding else None,
+                "lease_until": now + timedelta(seconds=RUN_LEASE_SECONDS) if holding else None,
+            },
+        )
+        return bool(rows)
+
+    async def _stop(self, state: _RunState, status: str, error: Optional[str] = None) -> None:
+        """Put the run's rows still 'dialing' back in the queue and write its last checkpoint."""
+        await async_sql_execute(
+            "UPDATE dial_queue SET state = 'queued', updated_at = :now WHERE run_id = :run_id AND state = 'dialing'",
+            {"run_id": state.run_id, "now": utc_now()},
+        )
+        await self._checkpoint(state, status=status, error=error, release=True)
+
+    async def _enqueue(self, state: _RunState) -> None:
+        """Copy the campaign's targets into dial_queue, a page at a time, after the checkpoint."""
+        while True:
+            rows = await async_sql_execute(
+                f"""SELECT s.id, s.phone, COALESCE(NULLIF(s.timezone, ''), c.timezone) AS timezone,
+                           c.call_window_start, c.call_window_end
+                    FROM surveys s JOIN campaigns c ON c.id = s.campaign_id
+                    WHERE {_TARGET_FILTER} AND s.id > :after
+                    ORDER BY s.id LIMIT :limit""",
+                {
+                    "cid": state.campaign_id, "after": state.checkpoint_id or "", "limit": self.page_size,
+                    "max_attempts": retry_policy.MAX_CALL_ATTEMPTS,
+                },
+            )
+            if not rows:
+                return
+            now = utc_now()
+            batch = []
+            for row in rows:
+                tz_name, start, end = calling_window.resolve(
+                    row["timezone"], row["call_window_start"], row["call_window_end"],
+                )
+                batch.append({
+                    "survey_id": row["id"], "run_id": state.run_id, "campaign_id": state.campaign_id,
+                    "phone": row["phone"], "timezone": tz_name, "window_start": start, "window_end": end,
+                    "next_eligible_at": calling_window.next_eligible(now, tz_name, start, end), "now": now,
+                })
+            # A target another campaign's run is dialing keeps its row
+            await async_sql_execute(
+                """INSERT INTO dial_queue (survey_id, run_id, campaign_id, phone, timezone, window_start,
+                                           window_end, next_eligible_at, state, enqueued_at, updated_at)
+                   VALUES (:survey_id, :run_id, :campaign_id, :phone, :timezone, :window_start,
+                           :window_end, :next_eligible_at, 'queued', :now, :now)
+                   ON CONFLICT (survey_id) DO UPDATE SET
+                       run_id = EXCLUDED.run_id, campaign_id = EXCLUDED.campaign_id, phone = EXCLUDED.phone,
+                       timezone = EXCLUDED.timezone, window_start = EXCLUDED.window_start,
+                       window_end = EXCLUDED.window_end, next_eligible_at = EXCLUDED.next_eligible_at,
+                       state = 'queued', outcome = NULL, enqueued_at = EXCLUDED.enqueued_at,
+                       updated_at = EXCLUDED.updated_at
+                   WHERE dial_queue.state <> 'dialing'""",
+                batch,
+            )
+            state.checkpoint_id = rows[-1]["id"]
+            await self._checkpoint(state)
+
+    async def _claim(self, state: _RunState, limit: int) -> List[Dict[str, Any]]:
+        return await async_sql_execute(
+            """UPDATE dial_queue SET state = 'dialing', updated_at = :now
+               WHERE survey_id IN (
+                   SELECT survey_id FROM dial_queue
+                   WHERE run_id = :run_id AND state = 'queued' AND next_eligible_at <= :now
+                   ORDER BY next_eligible_at
+                   LIMIT :limit
+                   FOR UPDATE SKIP LOCKED
+               )
+               RETURNING survey_id, phone, timezone, window_start, window_end""",
+            {"run_id": state.run_id, "now": utc_now(), "limit": limit},
+        )
+
+    async def _queued(self, state: _RunState) -> Dict[str, Any]:
+        rows = await async_sql_execute(
+            """SELECT COUNT(*) AS queued, MIN(next_eligible_at) AS next_at
+               FROM dial_queue WHERE run_id = :run_id AND state = 'queued'""",
+            {"run_id": state.run_id},
+        )
+        return rows[0]
+
+    async def _settle(self, state: _RunState, target: Dict[str, Any], outcome: str) -> None:
+        await async_sql_execute(
+            """UPDATE dial_queue SET state = 'done', outcome = :outcome, updated_at = :now
+               WHERE survey_id = :survey_id AND run_id = :run_id""",
+            {"survey_id": target["survey_id"], "run_id": state.run_id, "outcome": outcome, "now": utc_now()},
+        )
+
+    async def _defer(self, state: _RunState, target: Dict[str, Any], eligible_at: datetime) -> None:
+        await async_sql_execute(
+            """UPDATE dial_queue SET state = 'queued', next_eligible_at = :eligible_at, updated_at = :now
+               WHERE survey_id = :survey_id AND run_id = :run_id""",
+            {"survey_id": target["survey_id"], "run_id": state.run_id, "eligible_at": eligible_at, "now": utc_now()},
+        )
+
+    async def _dial(self, client: httpx.AsyncClient, state: _RunState, target: Dict[str, Any]) -> str:
+        """Dial as the next attempt in scheduled_calls; the call queue schedules any retry."""
+        call_id = await call_queue.begin(target["survey_id"], target["phone"], state.campaign_id)
+        if call_id is None:
+            # Used its attempts since it was enqueued (retries between runs)
+            return retry_policy.ATTEMPTS_EXHAUSTED
+        outcome = await place_call(client, target["survey_id"], target["phone"], priority="low")
+        await call_queue.record(target["survey_id"], outcome, call_id)
+        return outcome
+
+    async def _worker(self, client: httpx.AsyncClient, state: _RunState, queue: asyncio.Queue) -> None:
+        while True:
+            target = await queue.get()
+            dialing = False
+            try:
+                if target is None:
+                    return
+                window = (target["timezone"], target["window_start"], target["window_end"])
+                now = utc_now()
+                if not calling_window.is_open(now, *window):
+                    await self._defer(state, target, calling_window.next_eligible(now, *window))
+                    continue
+                state.in_flight += 1
+                dialing = True
+                outcome = await self._dial(client, state, target)
+                dialing = False
+                state.finished(outcome == retry_policy.DISPATCHED)
+                await self._settle(state, target, outcome)
+            except Exception as e:
+                logger.error(f"Campaign {state.campaign_id}: target {target['survey_id']} error: {e}")
+                if dialing:
+                    state.finished(False)
+                # Settle it so the row is not left 'dialing'; the call may already have gone out
+                try:
+                    await self._settle(state, target, "error")
+                except Exception as settle_error:
+                    logger.error(f"Campaign {state.campaign_id}: could not settle {target['survey_id']}: {settle_error}")
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, state: _RunState, queue: asyncio.Queue, interval: float) -> None:
+        """Feed eligible targets to the workers, paced; returns once nothing is left queued."""
+        next_at = time.monotonic()
+        while True:
+            batch = await self._claim(state, self.concurrency)
+            if not batch:
+                queued = await self._queued(state)
+                state.waiting = queued["queued"]
+                state.next_window_at = queued["next_at"]
+                if not state.waiting:
+                    return
+                until_open = (state.next_window_at - utc_now()).total_seconds()
+                await asyncio.sleep(min(WINDOW_POLL_SECONDS, max(until_open, 1.0)))
+                continue
+            state.waiting, state.next_window_at = 0, None
+            for target in batch:
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_at = max(next_at, time.monotonic()) + interval
+                await queue.put(target)
+
+    async def _checkpointer(self, state: _RunState, run_task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(CHECKPOINT_EVERY_SECONDS)
+            try:
+                if await self._checkpoint(state):
+                    continue
+                rows = await async_sql_execute(
+                    "SELECT owner FROM campaign_runs WHERE id = :id", {"id": state.run_id},
+                )
+            except Exception as e:
+                logger.warning(f"Campaign {state.campaign_id}: checkpoint failed: {e}")
+                continue
+            # Still ours: cancelled through another replica; otherwise the lease went to another replica
+            state.stop_reason = "cancelled" if rows and rows[0]["owner"] == _OWNER else "lost"
+            logger.warning(f"Campaign {state.campaign_id}: run {state.run_id} stopping ({state.stop_reason})")
+            run_task.cancel()
+            return
+
+    async def _run(self, state: _RunState) -> None:
+        interval = 60.0 / self.calls_per_minute if self.calls_per_minute > 0 else 0.0
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        checkpointer = asyncio.create_task(self._checkpointer(state, asyncio.current_task()))
+        try:
+            # Rows the campaign was dialing when a run stopped without settling them;
+            # this run holds the campaign's only lease, so none of them is in flight
+            await async_sql_execute(
+                "UPDATE dial_queue SET state = 'queued' WHERE campaign_id = :cid AND state = 'dialing'",
+                {"cid": state.campaign_id},
+            )
+            await self._enqueue(state)
+            async with httpx.AsyncClient(timeout=CAMPAIGN_CALL_TIMEOUT_SECONDS, limits=limits) as client:
+                workers = [asyncio.create_task(self._worker(client, state, queue)) for _ in range(self.concurrency)]
+                try:
+                    while True:
+                        await self._dispatch(state, queue, interval)
+                        await queue.join()
+                        # Workers may have put targets back whose window closed while they waited
+                        if not (await self._queued(state))["queued"]:
+                            break
+                    for _ in workers:
+                        await queue.put(None)
+                    await asyncio.gather(*workers)
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+            checkpointer.cancel()
+            state.total = state.dialed  # targets finished elsewhere mid-run are not dialed
+            await self._checkpoint(state, status="completed", release=True)
+            logger.info(
+                f"Campaign {state.campaign_id}: run {state.run_id} completed — "
+                f"{state.succeeded} triggered, {state.failed} failed"
+            )
+        except asyncio.CancelledError:
+            checkpointer.cancel()
+            # A run that lost its lease leaves its rows to the new owner
+            if state.stop_reason != "lost":
+                await asyncio.shield(self._stop(state, state.stop_reason or "running"))
+            raise
+        except Exception as e:
+            checkpointer.cancel()
+            logger.error(f"Campaign {state.campaign_id}: run {state.run_id} failed: {e}")
+            await self._stop(state, "failed", error=str(e))
+
+    # ─── Reporting ────────────────────────────────────────────────────────
+
+    async def progress(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Live progress of the running run, or the latest finished run from the DB."""
+        state = self._runs.get(campaign_id)
+        if state is not None:
+            return state.progress()
+        rows = await async_sql_execute(
+            """SELECT * FROM campaign_runs WHERE campaign_id = :cid
+               ORDER BY started_at DESC LIMIT 1""",
+            {"cid": campaign_id},
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        duration = ((row["finished_at"] or row["updated_at"]) - row["started_at"]).total_seconds()
+        return {
+            "run_id": row["id"],
+            "campaign_id": campaign_id,
+            "status": row["status"],
+            "total": row["total"],
+            "dialed": row["dialed"],
+            "succeeded": row["succeeded"],
+            "failed": row["failed"],
+            "in_flight": 0,
+            "remaining": max(row["total"] - row["dialed"], 0),
+            "waiting_for_window": 0,
+            "next_window_at": None,
+            "calls_per_minute": round(row["dialed"] / duration * 60, 2) if duration > 0 else 0.0,
+            "eta_seconds": None,
+            "started_at": row["started_at"].isoformat(),
+            "finished_at": row["finished_at"].isoformat() if row["finished_at"] else None,
+            "error": row["error"],
+        }
+
+
+campaign_dialer = CampaignDialer()
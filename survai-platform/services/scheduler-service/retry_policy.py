@@ -0,0 +1,88 @@
+"""
+Retry rules for outbound survey calls.
+
+Every dial ends in one outcome: the survey's end_reason reported by the
+agent (completed, busy, no_answer, ...) or, when voice-service refused the
+make-call, the HTTP status (http_429, http_503, ...). RULES says per outcome
+whether another attempt is worth making and how long to wait: the delay
+doubles with each attempt from base_delay up to max_delay, and half of it
+is randomised so retries for a batch of riders do not land together.
+
+MAX_CALL_ATTEMPTS caps the attempts per survey, i.e. per rider per campaign,
+counted across all of the campaign's runs (see CallQueue.begin).
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+MAX_CALL_ATTEMPTS = int(os.getenv("MAX_CALL_ATTEMPTS", "3"))
+
+# make-call was accepted; the real outcome arrives later from voice-service
+DISPATCHED = "dispatched"
+# Not dialed: the survey already had MAX_CALL_ATTEMPTS attempts in the campaign
+ATTEMPTS_EXHAUSTED = "attempts_exhausted"
+
+
+@dataclass(frozen=True)
+class RetryRule:
+    retry: bool
+    base_delay: float = 0.0   # seconds before the 2nd attempt
+    max_delay: float = 0.0
+
+
+FINAL = RetryRule(retry=False)
+
+RULES = {
+    # Agent end reasons
+    "completed": FINAL,
+    "declined": FINAL,
+    "wrong_person": FINAL,
+    "link_sent": FINAL,
+    "callback_scheduled": FINAL,  # the agent already booked the callback
+    "not_available": RetryRule(True, 2 * 3600, 8 * 3600),
+    "disconnected": RetryRule(True, 15 * 60, 2 * 3600),
+    "time_limit": RetryRule(True, 15 * 60, 2 * 3600),
+    # SIP dial failures (reported by the agent as end reasons)
+    "busy": RetryRule(True, 10 * 60, 2 * 3600),
+    "no_answer": RetryRule(True, 60 * 60, 6 * 3600),
+    "dial_failed": RetryRule(True, 5 * 60, 60 * 60),
+    # make-call refused by voice-service
+    "http_409": FINAL,                                 # survey already on a call
+    "http_429": RetryRule(True, 2 * 60, 30 * 60),     # number busy with another survey
+    "http_503": RetryRule(True, 60, 15 * 60),         # dial queue full / slot not reserved
+    "http_5xx": RetryRule(True, 30, 10 * 60),
+    "unreachable": RetryRule(True, 30, 10 * 60),      # voice-service down or timed out
+}
+
+
+def classify_status(status_code: Optional[int]) -> str:
+    """Outcome of a make-call request from its HTTP status (None: no response)."""
+    if status_code is None:
+        return "unreachable"
+    if status_code < 400:
+        return DISPATCHED
+    if f"http_{status_code}" in RULES:
+        return f"http_{status_code}"
+    return "http_5xx" if status_code >= 500 else f"http_{status_code}"
+
+
+def rule_for(outcome: str) -> RetryRule:
+    """Unknown outcomes (e.g. http_404) are final, so bad requests are never hammered."""
+    return RULES.get((outcome or "").strip().lower(), FINAL)
+
+
+def backoff_seconds(rule: RetryRule, attempt: int) -> float:
+    """Delay before attempt + 1: base * 2^(attempt - 1), capped, with equal jitter."""
+    delay = min(rule.max_delay, rule.base_delay * 2 ** max(attempt - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def next_attempt_at(outcome: str, attempt: int, now: datetime) -> Optional[datetime]:
+    """When to dial again after `attempt` ended in `outcome`, or None to give up."""
+    rule = rule_for(outcome)
+    if not rule.retry or attempt >= MAX_CALL_ATTEMPTS:
+        return None
+    return now + timedelta(seconds=backoff_seconds(rule, attempt))
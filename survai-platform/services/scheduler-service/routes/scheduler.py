@@ -1,28 +1,31 @@
 """
 Scheduler routes: schedule calls, campaigns, cancel jobs, list jobs.
-Jobs persist in Postgres — survive container restarts.
+Calls are scheduled_calls rows (call_queue.py), campaigns APScheduler jobs;
+both persist in Postgres and survive container restarts.
 """
 
 import logging
-import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import uuid4
 
-import httpx
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from fastapi import APIRouter, HTTPException
 
-from db import get_engine, sql_execute
+from shared.db import utc_now
+from shared.models.common import CallOutcomeRequest
+
+from db import async_sql_execute, get_engine, sql_execute
+from call_queue import call_queue
+from dialer import campaign_dialer
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scheduler", tags=["scheduler"])
 
 _scheduler: Optional[BackgroundScheduler] = None
 
-MAX_RETRIES = 2
-RETRY_DELAY_SECONDS = 10
+MAX_LISTED_CALLS = 500
 
 
 def get_scheduler() -> BackgroundScheduler:
@@ -38,27 +41,20 @@ def get_scheduler() -> BackgroundScheduler:
 
 
 def _make_call_job(survey_id: str, phone: str, attempt: int = 1):
-    """Background job: call voice-service with retry."""
-    voice_url = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
-    url = f"{voice_url}/api/voice/make-call"
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            r = client.post(url, params={"survey_id": survey_id, "phone": phone})
-            r.raise_for_status()
-            logger.info(f"Scheduled call completed: survey={survey_id}, phone={phone}")
-    except Exception as e:
-        logger.error(f"Scheduled call failed (attempt {attempt}/{MAX_RETRIES+1}): survey={survey_id}, error={e}")
-        if attempt <= MAX_RETRIES:
-            sched = get_scheduler()
-            retry_at = datetime.now(timezone.utc) + timedelta(seconds=RETRY_DELAY_SECONDS * attempt)
-            sched.add_job(
-                _make_call_job,
-                "date",
-                run_date=retry_at,
-                args=[survey_id, phone, attempt + 1],
-                id=f"retry_{survey_id}_{attempt + 1}",
-            )
-            logger.info(f"Retrying in {RETRY_DELAY_SECONDS * attempt}s (attempt {attempt + 1})")
+    """Call jobs scheduled before the call queue existed: hand them to the queue, due now."""
+    logger.info(f"Moving legacy call job to the call queue: survey={survey_id}, phone={phone}")
+    now = utc_now()
+    sql_execute(
+        """INSERT INTO scheduled_calls (id, survey_id, phone, attempt, state, run_at, created_at, updated_at)
+           VALUES (:id, :survey_id, :phone, :attempt, 'pending', :now, :now, :now)""",
+        {"id": str(uuid4()), "survey_id": survey_id, "phone": phone, "attempt": attempt, "now": now},
+    )
+
+
+def _campaign_job(campaign_id: str):
+    """Scheduled campaign run: hand the campaign to the async dialer and free the job thread."""
+    logger.info(f"Campaign job executing: {campaign_id}")
+    campaign_dialer.submit(campaign_id)
 
 
 @router.post("/schedule-call")
@@ -67,24 +63,15 @@ async def schedule_call(
     phone: str,
     delay_seconds: int = 60,
 ):
-    """Schedule a delayed call. Job persists in Postgres."""
+    """Schedule a delayed call. Queued in Postgres (scheduled_calls)."""
     try:
-        job_id = str(uuid4())
-        run_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
-
-        sched = get_scheduler()
-        sched.add_job(
-            _make_call_job,
-            "date",
-            run_date=run_at,
-            id=job_id,
-            args=[survey_id, phone, 1],
-        )
+        run_at = utc_now() + timedelta(seconds=delay_seconds)
+        job_id = await call_queue.schedule(survey_id, phone, run_at)
 
         return {
             "status": "scheduled",
             "job_id": job_id,
-            "run_at": run_at.isoformat(),
+            "run_at": run_at.replace(tzinfo=timezone.utc).isoformat(),
             "survey_id": survey_id,
             "phone": phone,
         }
@@ -101,7 +88,7 @@ async def schedule_campaign(
 ):
     """Schedule a recurring campaign. Job persists in Postgres."""
     try:
-        campaign = sql_execute("SELECT * FROM campaigns WHERE id = :id", {"id": campaign_id})
+        campaign = await async_sql_execute("SELECT * FROM campaigns WHERE id = :id", {"id": campaign_id})
         if not campaign:
             raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
 
@@ -120,39 +107,13 @@ async def schedule_campaign(
 
         run_date = datetime.now(timezone.utc) + timedelta(minutes=next_run_offset_minutes)
 
-        def _campaign_job():
-            """Execute campaign: find all pending surveys and trigger calls."""
-            logger.info(f"Campaign job executing: {campaign_id}")
-            try:
-                surveys = sql_execute(
-                    """SELECT s.id, s.phone, s.rider_name
-                       FROM surveys s
-                       WHERE s.campaign_id = :cid AND s.status = 'In-Progress'
-                       AND s.phone IS NOT NULL AND s.phone != ''""",
-                    {"cid": campaign_id},
-                )
-                voice_url = os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017")
-                for survey in surveys:
-                    try:
-                        with httpx.Client(timeout=30.0) as client:
-                            r = client.post(
-                                f"{voice_url}/api/voice/make-call",
-                                params={"survey_id": survey["id"], "phone": survey["phone"]},
-                            )
-                            r.raise_for_status()
-                            logger.info(f"Campaign call triggered: survey={survey['id']}")
-                    except Exception as call_err:
-                        logger.error(f"Campaign call failed for survey {survey['id']}: {call_err}")
-                logger.info(f"Campaign {campaign_id}: triggered {len(surveys)} calls")
-            except Exception as e:
-                logger.error(f"Campaign job error: {e}")
-
         if interval_hours == 0:
             sched.add_job(
                 _campaign_job,
                 "date",
                 run_date=run_date,
                 id=job_id,
+                args=[campaign_id],
             )
         else:
             sched.add_job(
@@ -161,6 +122,7 @@ async def schedule_campaign(
                 hours=interval_hours,
                 id=job_id,
                 start_date=run_date,
+                args=[campaign_id],
             )
 
         return {
@@ -176,10 +138,64 @@ async def schedule_campaign(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/campaigns/{campaign_id}/run")
+async def run_campaign_now(campaign_id: str):
+    """Start dialing a campaign now (no-op if a run is already in progress)."""
+    campaign = await async_sql_execute("SELECT id FROM campaigns WHERE id = :id", {"id": campaign_id})
+    if not campaign:
+        raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
+    return await campaign_dialer.start(campaign_id)
+
+
+@router.get("/campaigns/{campaign_id}/progress")
+async def campaign_progress(campaign_id: str):
+    """Dialed / succeeded / failed counts, throughput and ETA of the campaign's current or last run."""
+    progress = await campaign_dialer.progress(campaign_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"No runs for campaign {campaign_id}")
+    return progress
+
+
+@router.post("/campaigns/{campaign_id}/cancel-run")
+async def cancel_campaign_run(campaign_id: str):
+    """Stop the campaign's running dialer; undialed targets are left for the next run."""
+    if not await campaign_dialer.cancel(campaign_id):
+        raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} has no run in progress")
+    return {"status": "cancelled", "campaign_id": campaign_id}
+
+
+@router.post("/call-outcome")
+async def call_outcome(payload: CallOutcomeRequest):
+    """How a call ended (agent end_reason); queues the next attempt if the retry policy allows."""
+    attempt = await call_queue.record(payload.survey_id, payload.reason)
+    if attempt is None:
+        return {"status": "ignored", "survey_id": payload.survey_id}
+    next_run_at = attempt["next_run_at"]
+    return {
+        "status": "retry_scheduled" if next_run_at else "done",
+        "survey_id": payload.survey_id,
+        "attempt": attempt["attempt"],
+        "run_at": next_run_at.isoformat() if next_run_at else None,
+    }
+
+
+@router.get("/retries")
+async def list_retries(limit: int = 100):
+    """Pending call retries, soonest first."""
+    rows = await async_sql_execute(
+        """SELECT id AS job_id, survey_id, campaign_id, attempt, run_at FROM scheduled_calls
+           WHERE state = 'pending' AND attempt > 1 ORDER BY run_at LIMIT :limit""",
+        {"limit": min(max(limit, 1), 1000)},
+    )
+    return {"retries": [{**r, "run_at": r["run_at"].isoformat()} for r in rows]}
+
+
 @router.delete("/cancel/{job_id}")
 async def cancel_job(job_id: str):
     """Cancel a scheduled job."""
     try:
+        if await call_queue.cancel(job_id):
+            return {"status": "cancelled", "job_id": job_id}
         sched = get_scheduler()
         try:
             sched.remove_job(job_id)
@@ -193,7 +209,7 @@ async def cancel_job(job_id: str):
 
 @router.get("/jobs")
 async def list_jobs():
-    """List pending jobs."""
+    """List pending jobs: campaign jobs and the next MAX_LISTED_CALLS queued calls."""
     try:
         sched = get_scheduler()
         jobs = []
@@ -203,6 +219,18 @@ async def list_jobs():
                 "next_run": j.next_run_time.isoformat() if j.next_run_time else None,
                 "name": j.name,
             })
+        calls = await async_sql_execute(
+            """SELECT id, survey_id, attempt, run_at FROM scheduled_calls
+               WHERE state = 'pending' ORDER BY run_at LIMIT :limit""",
+            {"limit": MAX_LISTED_CALLS},
+        )
+        for c in calls:
+            jobs.append({
+                "job_id": c["id"],
+                "next_run": c["run_at"].replace(tzinfo=timezone.utc).isoformat(),
+                "name": "scheduled_call" if c["attempt"] == 1 else f"retry (attempt {c['attempt']})",
+                "survey_id": c["survey_id"],
+            })
         return {"jobs": jobs}
     except Exception as e:
         logger.error(f"List jobs error: {e}")
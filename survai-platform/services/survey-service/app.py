@@ -14,6 +14,9 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+from shared.service_client import service_client
+
 from routes.surveys import router as surveys_router
 
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +28,8 @@ async def lifespan(app: FastAPI):
     logger.info("Survey Service starting up...")
     yield
     logger.info("Survey Service shutting down...")
+    await service_client.close()
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -55,6 +60,11 @@ async def health():
     return {"status": "OK", "service": "survey-service"}
 
 
+@app.get("/health/db")
+async def health_db():
+    return {"service": "survey-service", "pools": pool_stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
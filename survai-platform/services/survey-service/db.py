@@ -9,53 +9,91 @@ import asyncio
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
-import httpx
 import requests
 from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy import create_engine, text
 
 from shared.models.common import SurveyQuestionAnswerP
+from shared.service_client import service_client
+from shared.db import (
+    async_sql_execute as _async_sql_execute,
+    async_transaction as _async_transaction,
+    get_engine as _get_engine,
+    sql_execute as _sql_execute,
+    utc_now,
+)
 
 logger = logging.getLogger(__name__)
 
-BRAIN_SERVICE_URL = os.getenv("BRAIN_SERVICE_URL", "http://brain-service:8016")
+BRAIN_TIMEOUT = float(os.getenv("BRAIN_TIMEOUT", "15"))
+BRAIN_BATCH_TIMEOUT = float(os.getenv("BRAIN_BATCH_TIMEOUT", "60"))
+# Cap on in-flight brain-service calls across all requests in this process
+BRAIN_MAX_CONCURRENCY = int(os.getenv("BRAIN_MAX_CONCURRENCY", "8"))
+_brain_semaphore = asyncio.Semaphore(BRAIN_MAX_CONCURRENCY)
 
 
-def get_engine():
-    db_host = os.getenv("DB_HOST", "localhost")
-    db_port = os.getenv("DB_PORT", "5432")
-    db_user = os.getenv("DB_USER", "pguser")
-    db_password = os.getenv("DB_PASSWORD", "root")
-    url = f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/db"
-    return create_engine(url, pool_size=5, max_overflow=10, pool_pre_ping=True)
-
-
-_engine = None
-
-
-def _get_engine():
-    global _engine
-    if _engine is None:
-        _engine = get_engine()
-    return _engine
+SERVICE_NAME = "survey-service"
 
 
-def sql_execute(query: str, params: Union[dict, list, None] = None):
-    """Execute SQL query. Returns list of dicts for SELECT, rowcount for mutations.
-    For batch operations, params can be a list of dicts."""
-    engine = _get_engine()
-    with engine.begin() as conn:
-        if isinstance(params, list) and params:
-            for p in params:
-                conn.execute(text(query), p)
-            return len(params)
-        result = conn.execute(text(query), params or {})
-    if result.returns_rows:
-        return result.mappings().all()
-    return result.rowcount
+def get_engine():
+    """This service's sync engine (pool sized via env, see shared.db)."""
+    return _get_engine(SERVICE_NAME)
+
+
+def sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
+    """Execute SQL query. Returns list of dicts for SELECT, [] for mutations.
+    For batch operations, params can be a list of dicts (executemany)."""
+    return _sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+# ─── Async access (route handlers) ───────────────────────────────────────────
+
+async def async_sql_execute(query: str, params: Union[dict, List[dict], None] = None) -> List[Dict[str, Any]]:
+    """Non-blocking sql_execute for route handlers (asyncpg pool, see shared.db)."""
+    return await _async_sql_execute(query, params, service_name=SERVICE_NAME)
+
+
+def async_transaction():
+    """Atomic multi-statement block on this service's async pool."""
+    return _async_transaction(SERVICE_NAME)
+
+
+async def save_survey_answers(survey_id: str, items: List[dict], status: str = "Completed") -> None:
+    """
+    Upsert all of a survey's answers and set its status in one statement.
+
+    Rows are sent as parallel arrays and expanded with unnest(), and the
+    upsert runs as a data-modifying CTE in front of the status UPDATE, so a
+    15-question submission is one round trip and commits atomically.
+    items use the SurveyQuestionAnswerP keys (QueId, Ans, RawAns, Order).
+    """
+    # ON CONFLICT can't touch the same row twice in one statement; last answer wins.
+    by_question = {str(item["QueId"]): item for item in items}
+    rows = list(by_question.values())
+    await async_sql_execute(
+        """WITH upserted AS (
+               INSERT INTO survey_response_items (survey_id, question_id, answer, raw_answer, ord)
+               SELECT CAST(:survey_id AS TEXT), t.question_id, t.answer, t.raw_answer, t.ord
+               FROM unnest(CAST(:question_ids AS TEXT[]), CAST(:answers AS TEXT[]),
+                           CAST(:raw_answers AS TEXT[]), CAST(:ords AS SMALLINT[]))
+                    AS t(question_id, answer, raw_answer, ord)
+               ON CONFLICT (survey_id, question_id)
+               DO UPDATE SET answer = EXCLUDED.answer, raw_answer = EXCLUDED.raw_answer, ord = EXCLUDED.ord
+           )
+           UPDATE surveys SET status = :status, completion_date = :completion_date
+           WHERE id = CAST(:survey_id AS TEXT)""",
+        {
+            "survey_id": survey_id,
+            "question_ids": list(by_question.keys()),
+            "answers": [item.get("Ans") for item in rows],
+            "raw_answers": [item.get("RawAns") for item in rows],
+            "ords": [int(item.get("Order") or 0) for item in rows],
+            "status": status,
+            "completion_date": utc_now(),
+        },
+    )
 
 
 def get_current_time() -> str:
@@ -68,56 +106,46 @@ def filtering(biodata: str, question: str) -> str:
     return "Yes"
 
 
-def parse_via_brain(question: str, response: str, options: list, criteria: str = "categorical") -> Optional[str]:
-    """Parse user response via brain-service."""
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            resp = client.post(
-                f"{BRAIN_SERVICE_URL}/api/brain/parse",
-                json={"question": question, "response": response, "options": options, "criteria": criteria},
-            )
-            if resp.status_code == 200:
-                return resp.json().get("answer")
-    except Exception as e:
-        logger.warning(f"Brain service parse error: {e}")
+async def _brain_post(path: str, payload: dict, op: str, timeout: float = BRAIN_TIMEOUT) -> Optional[dict]:
+    """POST to brain-service on the shared keep-alive client, bounded by BRAIN_MAX_CONCURRENCY."""
+    async with _brain_semaphore:
+        try:
+            return await service_client.post("brain-service", path, json=payload, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Brain service {op} error: {e}")
     return None
 
 
-def autofill_via_brain(context: str, question: str, options: list, criteria: str = "categorical") -> Optional[str]:
+async def parse_via_brain(question: str, response: str, options: list, criteria: str = "categorical") -> Optional[str]:
+    """Parse user response via brain-service."""
+    data = await _brain_post(
+        "/api/brain/parse",
+        {"question": question, "response": response, "options": options, "criteria": criteria},
+        "parse",
+    )
+    return data.get("answer") if data else None
+
+
+async def autofill_via_brain(context: str, question: str, options: list, criteria: str = "categorical") -> Optional[str]:
     """Autofill answer via brain-service."""
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            resp = client.post(
-                f"{BRAIN_SERVICE_URL}/api/brain/autofill",
-                json={"context": context, "question": question, "options": options, "criteria": criteria},
-            )
-            if resp.status_code == 200:
-                return resp.json().get("answer")
-    except Exception as e:
-        logger.warning(f"Brain service autofill error: {e}")
-    return None
+    data = await _brain_post(
+        "/api/brain/autofill",
+        {"context": context, "question": question, "options": options, "criteria": criteria},
+        "autofill",
+    )
+    return data.get("answer") if data else None
 
 
-def summarize(question: str, response: str) -> str:
+async def summarize(question: str, response: str) -> str:
     """Summarize long responses via brain-service."""
     if len(response) <= 300:
         return response
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            resp = client.post(
-                f"{BRAIN_SERVICE_URL}/api/brain/summarize",
-                json={"question": question, "response": response},
-            )
-            if resp.status_code == 200:
-                return resp.json().get("summary", response)
-    except Exception as e:
-        logger.warning(f"Brain service summarize error: {e}")
-    return response
-
-
-def process_question_sync(question_data, biodata: str) -> Optional[SurveyQuestionAnswerP]:
-    """Synchronous wrapper for process_question."""
-    return asyncio.run(process_question(question_data, biodata))
+    data = await _brain_post(
+        "/api/brain/summarize",
+        {"question": question, "response": response},
+        "summarize",
+    )
+    return data.get("summary", response) if data else response
 
 
 async def process_question(question, biodata: str) -> Optional[SurveyQuestionAnswerP]:
@@ -132,16 +160,16 @@ async def process_question(question, biodata: str) -> Optional[SurveyQuestionAns
         if que_criteria == "scale":
             scale_max = question.QueScale
             scale_list = [str(i) for i in range(1, int(scale_max) + 1)]
-            filled = autofill_via_brain(biodata, question.QueText, scale_list, "scale")
+            filled = await autofill_via_brain(biodata, question.QueText, scale_list, "scale")
 
         elif que_criteria == "categorical":
             que_categories = list(question.QueCategories or [])
             if "None of the above" in que_categories:
                 que_categories.remove("None of the above")
-            filled = autofill_via_brain(biodata, question.QueText, que_categories, "categorical")
+            filled = await autofill_via_brain(biodata, question.QueText, que_categories, "categorical")
 
         elif que_criteria == "open":
-            filled = autofill_via_brain(biodata, question.QueText, [], "open")
+            filled = await autofill_via_brain(biodata, question.QueText, [], "open")
 
         return SurveyQuestionAnswerP(
             QueId=que_id,
@@ -157,7 +185,7 @@ async def process_question(question, biodata: str) -> Optional[SurveyQuestionAns
     return None
 
 
-def process_survey_question(question: dict) -> dict:
+async def process_survey_question(question: dict) -> dict:
     """Process a single survey question to parse the answer from RawAns via brain-service."""
     if question.get("Ans"):
         return question
@@ -167,20 +195,62 @@ def process_survey_question(question: dict) -> dict:
     if question.get("QueCriteria") == "scale":
         scale_max = question["QueScale"]
         scale_list = [str(i) for i in range(1, int(scale_max) + 1)]
-        answer = parse_via_brain(question.get("QueText", ""), raw_ans, scale_list, "scale")
+        answer = await parse_via_brain(question.get("QueText", ""), raw_ans, scale_list, "scale")
         question["Ans"] = answer if answer else "None of the above"
 
     elif question.get("QueCriteria") == "categorical":
         que_categories = question.get("QueCategories") or []
-        answer = parse_via_brain(question.get("QueText", ""), raw_ans, que_categories, "categorical")
+        answer = await parse_via_brain(question.get("QueText", ""), raw_ans, que_categories, "categorical")
         question["Ans"] = answer if answer else "None of the above"
 
     else:
-        question["Ans"] = summarize(question.get("QueText", ""), raw_ans)
+        question["Ans"] = await summarize(question.get("QueText", ""), raw_ans)
 
     return question
 
 
+async def process_survey_questions(questions: List[dict]) -> List[dict]:
+    """
+    Fill Ans from RawAns for every unanswered question with a single
+    /api/brain/parse-batch call. Same outcome as process_survey_question per
+    item; falls back to it if the batch endpoint can't be reached.
+    """
+    todo = [q for q in questions if not q.get("Ans")]
+    if not todo:
+        return questions
+
+    items = []
+    for q in todo:
+        criteria = q.get("QueCriteria")
+        if criteria == "scale":
+            options = [str(i) for i in range(1, int(q.get("QueScale") or 5) + 1)]
+        elif criteria == "categorical":
+            options = list(q.get("QueCategories") or [])
+        else:
+            criteria, options = "open", []
+        items.append({
+            "id": str(q["QueId"]),
+            "question": q.get("QueText", "") or "",
+            "response": q.get("RawAns", "") or "",
+            "options": options,
+            "criteria": criteria,
+        })
+
+    data = await _brain_post("/api/brain/parse-batch", {"items": items}, "parse-batch", BRAIN_BATCH_TIMEOUT)
+    if data is None:
+        await asyncio.gather(*(process_survey_question(q) for q in todo))
+        return questions
+
+    answers = data.get("answers") or {}
+    for q, item in zip(todo, items):
+        answer = answers.get(item["id"])
+        if item["criteria"] == "open":
+            q["Ans"] = answer if answer is not None else item["response"]
+        else:
+            q["Ans"] = answer or "None of the above"
+    return questions
+
+
 def build_html_email(url: str, language: str = "en") -> str:
     """Build HTML email body for survey link with bilingual support."""
     if language == "bilingual":
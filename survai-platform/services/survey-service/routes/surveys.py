@@ -2,13 +2,13 @@
 Survey routes for the Survey Service.
 """
 
+import asyncio
 import json
 import logging
 import os
 import smtplib
 import resend
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
-from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
@@ -38,12 +38,15 @@ from shared.models.common import (
 from shared.service_client import service_client
 
 from db import (
+    async_sql_execute,
+    async_transaction,
     build_html_email,
     build_text_email,
     get_current_time,
-    process_question_sync,
-    process_survey_question,
-    sql_execute,
+    process_question,
+    process_survey_questions,
+    save_survey_answers,
+    utc_now,
 )
 
 logger = logging.getLogger(__name__)
@@ -71,9 +74,17 @@ async def get_template_questions(template_name: str) -> dict:
         )
 
 
+async def prebuild_voice_prompts(survey_id: str) -> None:
+    """Ask voice-service to build and store call prompts so make-call skips that work."""
+    try:
+        await service_client.post("voice-service", f"/api/voice/prompts/{survey_id}", timeout=60.0)
+    except Exception as e:
+        logger.warning(f"Voice prompt prebuild failed for survey {survey_id}: {e}")
+
+
 async def get_survey_questions(survey_id: str) -> dict:
     """Get survey questions with answers from DB."""
-    survey_row = sql_execute(
+    survey_row = await async_sql_execute(
         "SELECT template_name, name FROM surveys WHERE id = :survey_id",
         {"survey_id": survey_id},
     )
@@ -106,7 +117,7 @@ async def get_survey_questions(survey_id: str) -> dict:
  ) pm ON pm.child_question_id = q.id
  WHERE sri.survey_id = :survey_id
  ORDER BY sri.ord;"""
-    rows = sql_execute(sql_query, {"survey_id": survey_id})
+    rows = await async_sql_execute(sql_query, {"survey_id": survey_id})
     return {"SurveyId": survey_id, "TemplateName": template_name, "Questions": rows}
 
 
@@ -131,7 +142,7 @@ def _resolve_company_name(row: dict) -> str:
 
 async def get_survey_recipient(survey_id: str) -> dict:
     """Get recipient info for a survey."""
-    rows = sql_execute(
+    rows = await async_sql_execute(
         "SELECT recipient, name, ride_id, tenant_id, rider_name, biodata, bilingual, company_name FROM surveys WHERE id = :survey_id",
         {"survey_id": survey_id},
     )
@@ -192,43 +203,17 @@ async def process_survey_questions_background(qna_data: dict):
                     "Order": detailed.get("order", 0),
                 })
 
-        with ThreadPoolExecutor() as executor:
-            processed = list(executor.map(process_survey_question, questions_dicts))
-
-        for i, q in enumerate(questions_dicts):
-            if not q.get("Ans") and processed[i].get("Ans"):
-                q["Ans"] = processed[i]["Ans"]
+        # All RawAns -> Ans in one brain-service round trip
+        await process_survey_questions(questions_dicts)
 
-        for item in questions_dicts:
-            sql_execute(
-                """INSERT INTO survey_response_items (survey_id, question_id, answer, raw_answer, ord)
-                VALUES (:survey_id, :question_id, :answer, :raw_answer, :ord)
-                ON CONFLICT (survey_id, question_id)
-                DO UPDATE SET answer = EXCLUDED.answer, raw_answer = EXCLUDED.raw_answer, ord = EXCLUDED.ord""",
-                {
-                    "survey_id": survey_id,
-                    "question_id": item["QueId"],
-                    "answer": item.get("Ans"),
-                    "raw_answer": item.get("RawAns"),
-                    "ord": item.get("Order", 0),
-                },
-            )
-
-        sql_execute(
-            """UPDATE surveys SET status = :status, completion_date = :completion_date WHERE id = :survey_id""",
-            {
-                "survey_id": survey_id,
-                "status": "Completed",
-                "completion_date": str(get_current_time())[:19].replace("T", " "),
-            },
-        )
+        await save_survey_answers(survey_id, questions_dicts, status="Completed")
         logger.info(f"Processed survey questions for survey {survey_id}")
     except Exception as e:
         logger.warning(f"Error processing survey questions: {e}")
 
 
 class _QuestionObj:
-    """Simple object for process_question_sync."""
+    """Simple object for process_question."""
     def __init__(self, d):
         for k, v in d.items():
             setattr(self, k, v)
@@ -269,7 +254,7 @@ async def survey_stat(tenant_id: Optional[str] = None):
 async def get_survey_stats(tenant_id: Optional[str] = None):
     """Get survey statistics. Optionally filter by tenant_id."""
     if tenant_id:
-        rows = sql_execute("""
+        rows = await async_sql_execute("""
             SELECT
                 COUNT(*) FILTER (WHERE TRUE) AS total_surveys,
                 COUNT(*) FILTER (WHERE status = 'Completed') AS total_completed_surveys,
@@ -283,7 +268,7 @@ async def get_survey_stats(tenant_id: Optional[str] = None):
             WHERE tenant_id = :tid
         """, {"tid": tenant_id})
     else:
-        rows = sql_execute("""
+        rows = await async_sql_execute("""
             SELECT
                 COUNT(*) FILTER (WHERE TRUE) AS total_surveys,
                 COUNT(*) FILTER (WHERE status = 'Completed') AS total_completed_surveys,
@@ -339,9 +324,9 @@ async def get_dashboard_data(tenant_id: Optional[str] = None):
 async def list_surveys(tenant_id: Optional[str] = None):
     """List all surveys. Optionally filter by tenant_id."""
     if tenant_id:
-        rows = sql_execute("SELECT * FROM surveys WHERE tenant_id = :tid", {"tid": tenant_id})
+        rows = await async_sql_execute("SELECT * FROM surveys WHERE tenant_id = :tid", {"tid": tenant_id})
     else:
-        rows = sql_execute("SELECT * FROM surveys", {})
+        rows = await async_sql_execute("SELECT * FROM surveys", {})
     return [_row_to_survey(r) for r in rows]
 
 
@@ -355,9 +340,9 @@ async def list_surveys_alias(tenant_id: Optional[str] = None):
 async def list_completed_surveys(tenant_id: Optional[str] = None):
     """List only completed surveys."""
     if tenant_id:
-        rows = sql_execute("SELECT * FROM surveys WHERE status = 'Completed' AND tenant_id = :tid", {"tid": tenant_id})
+        rows = await async_sql_execute("SELECT * FROM surveys WHERE status = 'Completed' AND tenant_id = :tid", {"tid": tenant_id})
     else:
-        rows = sql_execute("SELECT * FROM surveys WHERE status = 'Completed'", {})
+        rows = await async_sql_execute("SELECT * FROM surveys WHERE status = 'Completed'", {})
     return [_row_to_survey(r) for r in rows]
 
 
@@ -365,16 +350,16 @@ async def list_completed_surveys(tenant_id: Optional[str] = None):
 async def list_inprogress_surveys(tenant_id: Optional[str] = None):
     """List only in-progress surveys."""
     if tenant_id:
-        rows = sql_execute("SELECT * FROM surveys WHERE status = 'In-Progress' AND tenant_id = :tid", {"tid": tenant_id})
+        rows = await async_sql_execute("SELECT * FROM surveys WHERE status = 'In-Progress' AND tenant_id = :tid", {"tid": tenant_id})
     else:
-        rows = sql_execute("SELECT * FROM surveys WHERE status = 'In-Progress'", {})
+        rows = await async_sql_execute("SELECT * FROM surveys WHERE status = 'In-Progress'", {})
     return [_row_to_survey(r) for r in rows]
 
 
 @router.get("/surveys/fromtemplate/{template_name}", response_model=SurveyFromTemplateP)
 async def get_surveys_from_template(template_name: str):
     """Get survey stats for template."""
-    rows = sql_execute("""
+    rows = await async_sql_execute("""
         SELECT
             COUNT(*) FILTER (WHERE template_name = :template_name) AS total_surveys,
             SUM(CASE WHEN status = 'Completed' AND template_name = :template_name THEN 1 ELSE 0 END) AS total_completed_surveys,
@@ -396,7 +381,7 @@ async def get_surveys_from_template(template_name: str):
 @router.get("/surveys/{survey_id}", response_model=SurveyP)
 async def get_survey(survey_id: str):
     """Get survey by ID."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     return _row_to_survey(rows[0])
@@ -405,7 +390,7 @@ async def get_survey(survey_id: str):
 @router.get("/surveys/{survey_id}/status")
 async def get_survey_status(survey_id: str):
     """Get survey status (recipient app expects this)."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     r = rows[0]
@@ -433,7 +418,7 @@ async def get_survey_recipient_info(survey_id: str):
 @router.get("/surveys/{survey_id}/questions")
 async def get_survey_questions_endpoint(survey_id: str):
     """Get survey questions with answers."""
-    rows = sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     return await get_survey_questions(survey_id)
@@ -442,10 +427,10 @@ async def get_survey_questions_endpoint(survey_id: str):
 @router.get("/surveys/{survey_id}/questions_unanswered")
 async def get_survey_questions_unanswered(survey_id: str):
     """Get only unanswered questions for a survey."""
-    rows = sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
-    questions = sql_execute("""
+    questions = await async_sql_execute("""
         SELECT q.id AS id, q.text, q.criteria, q.scales, q.parent_id,
                sri.ord AS "order", sri.answer, sri.raw_answer, sri.autofill,
                COALESCE(qc.categories, null::json) AS categories,
@@ -463,7 +448,7 @@ async def get_survey_questions_unanswered(survey_id: str):
 @router.get("/surveys/{survey_id}/questionsonly")
 async def get_survey_questions_only(survey_id: str):
     """Get just question texts for a survey."""
-    rows = sql_execute(
+    rows = await async_sql_execute(
         "SELECT q.text FROM survey_response_items sri JOIN questions q ON sri.question_id = q.id WHERE sri.survey_id = :survey_id",
         {"survey_id": survey_id},
     )
@@ -473,7 +458,7 @@ async def get_survey_questions_only(survey_id: str):
 @router.get("/surveys/{survey_id}/transcript")
 async def get_transcript(survey_id: str):
     """Get call transcript."""
-    rows = sql_execute("SELECT call_id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT call_id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     call_id = rows[0].get("call_id")
@@ -491,14 +476,14 @@ async def get_transcript(survey_id: str):
 # ─── POST/PATCH/DELETE routes ────────────────────────────────────────────────
 
 @router.post("/surveys/generate", response_model=SurveyQuestionsP)
-async def generate_survey(survey_data: SurveyCreateP):
+async def generate_survey(survey_data: SurveyCreateP, background_tasks: BackgroundTasks):
     """Generate survey from template."""
     try:
-        res = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
+        res = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
         if res:
             raise HTTPException(status_code=400, detail=f"Survey with ID {survey_data.SurveyId} already exists")
 
-        res = sql_execute("SELECT * FROM templates WHERE name = :template_name", {"template_name": survey_data.template_name})
+        res = await async_sql_execute("SELECT * FROM templates WHERE name = :template_name", {"template_name": survey_data.template_name})
         if not res:
             raise HTTPException(status_code=404, detail=f"Template with Name {survey_data.template_name} not found")
     except HTTPException:
@@ -511,13 +496,13 @@ async def generate_survey(survey_data: SurveyCreateP):
         req_company = getattr(survey_data, "CompanyName", None) or ""
         if not req_company:
             try:
-                tpl_rows = sql_execute("SELECT company_name FROM templates WHERE name = :tn", {"tn": survey_data.template_name})
+                tpl_rows = await async_sql_execute("SELECT company_name FROM templates WHERE name = :tn", {"tn": survey_data.template_name})
                 if tpl_rows and tpl_rows[0].get("company_name"):
                     req_company = tpl_rows[0]["company_name"]
             except Exception:
                 pass  # templates.company_name may not exist on older DBs
 
-        sql_execute(
+        await async_sql_execute(
             """INSERT INTO surveys (id, template_name, url, biodata, status, name, recipient, launch_date, rider_name, ride_id, tenant_id, phone, bilingual, company_name)
             VALUES (:id, :template_name, :url, :biodata, :status, :name, :recipient, :launch_date, :rider_name, :ride_id, :tenant_id, :phone, :bilingual, :company_name)""",
             {
@@ -528,7 +513,7 @@ async def generate_survey(survey_data: SurveyCreateP):
                 "status": "In-Progress",
                 "name": survey_data.Name,
                 "recipient": survey_data.Recipient,
-                "launch_date": str(get_current_time())[:19].replace("T", " "),
+                "launch_date": utc_now(),
                 "rider_name": survey_data.RiderName,
                 "ride_id": survey_data.RideId,
                 "tenant_id": survey_data.TenantId,
@@ -577,11 +562,9 @@ async def generate_survey(survey_data: SurveyCreateP):
         biodata = survey_data.Biodata or ""
 
         if autofill_questions and biodata:
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(
-                    lambda q: process_question_sync(_QuestionObj(q), biodata),
-                    autofill_questions,
-                ))
+            results = await asyncio.gather(
+                *(process_question(_QuestionObj(q), biodata) for q in autofill_questions)
+            )
             autofill_lookup = {item.QueId: item for item in results if item is not None}
         else:
             autofill_lookup = {}
@@ -598,13 +581,14 @@ async def generate_survey(survey_data: SurveyCreateP):
             })
 
         if insert_params:
-            sql_execute(
+            await async_sql_execute(
                 """INSERT INTO survey_response_items (survey_id, question_id, answer, ord, autofill)
                 VALUES (:survey_id, :question_id, :answer, :ord, :autofill)
                 ON CONFLICT (survey_id, question_id)
                 DO UPDATE SET answer = EXCLUDED.answer, autofill = EXCLUDED.autofill""",
                 insert_params,
             )
+            background_tasks.add_task(prebuild_voice_prompts, survey_data.SurveyId)
 
         return SurveyQuestionsP(SurveyId=survey_data.SurveyId, QuestionswithAns=questions)
     except HTTPException:
@@ -615,11 +599,11 @@ async def generate_survey(survey_data: SurveyCreateP):
 
 
 @router.post("/surveys/create")
-async def create_survey(survey_data: SurveyQuestionsP):
+async def create_survey(survey_data: SurveyQuestionsP, background_tasks: BackgroundTasks):
     """Create survey questions and autofill where needed (dashboard uses this after generate)."""
     try:
         # Ensure survey exists (from generate step)
-        rows = sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
+        rows = await async_sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
         if not rows:
             raise HTTPException(
                 status_code=404,
@@ -630,7 +614,7 @@ async def create_survey(survey_data: SurveyQuestionsP):
 
         biodata = ""
         try:
-            rows = sql_execute("SELECT biodata FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
+            rows = await async_sql_execute("SELECT biodata FROM surveys WHERE id = :survey_id", {"survey_id": survey_data.SurveyId})
             if rows:
                 biodata = rows[0]["biodata"] or ""
         except Exception:
@@ -638,11 +622,9 @@ async def create_survey(survey_data: SurveyQuestionsP):
 
         autofill_lookup = {}
         if autofill_questions and biodata:
-            with ThreadPoolExecutor() as executor:
-                results = list(executor.map(
-                    lambda q: process_question_sync(_QuestionObj(q.model_dump()), biodata),
-                    autofill_questions,
-                ))
+            results = await asyncio.gather(
+                *(process_question(_QuestionObj(q.model_dump()), biodata) for q in autofill_questions)
+            )
             autofill_lookup = {item.QueId: item for item in results if item is not None}
 
         insert_params = []
@@ -658,7 +640,7 @@ async def create_survey(survey_data: SurveyQuestionsP):
             })
 
         if insert_params:
-            sql_execute(
+            await async_sql_execute(
                 """INSERT INTO survey_response_items (survey_id, question_id, answer, ord, autofill)
                 VALUES (:survey_id, :question_id, :answer, :ord, :autofill)
                 ON CONFLICT (survey_id, question_id)
@@ -667,13 +649,15 @@ async def create_survey(survey_data: SurveyQuestionsP):
             )
 
         try:
-            sql_execute(
+            await async_sql_execute(
                 "UPDATE surveys SET ai_augmented = :ai_augmented WHERE id = :survey_id",
                 {"ai_augmented": survey_data.AiAugmented, "survey_id": survey_data.SurveyId},
             )
         except Exception:
             pass
 
+        if insert_params:
+            background_tasks.add_task(prebuild_voice_prompts, survey_data.SurveyId)
         return {"message": f"Questions added to SurveyId {survey_data.SurveyId}"}
     except HTTPException:
         raise
@@ -685,14 +669,14 @@ async def create_survey(survey_data: SurveyQuestionsP):
 @router.patch("/surveys/{survey_id}/status")
 async def update_survey_status(survey_id: str, status_update: SurveyStatusUpdateP):
     """Update survey status."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     if rows[0]["status"] == "Completed":
         return {"message": f"Survey {survey_id} already completed"}
 
-    comp_date = str(get_current_time())[:19].replace("T", " ") if status_update.Status == "Completed" else None
-    sql_execute(
+    comp_date = utc_now() if status_update.Status == "Completed" else None
+    await async_sql_execute(
         "UPDATE surveys SET status = :status, completion_date = :completion_date WHERE id = :survey_id",
         {"survey_id": survey_id, "status": status_update.Status, "completion_date": comp_date},
     )
@@ -702,7 +686,7 @@ async def update_survey_status(survey_id: str, status_update: SurveyStatusUpdate
 @router.patch("/surveys/{survey_id}/csat")
 async def update_survey_csat(survey_id: str, csat_update: SurveyCSATUpdateP):
     """Update CSAT score."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     if rows[0]["status"] == "In-Progress":
@@ -710,7 +694,7 @@ async def update_survey_csat(survey_id: str, csat_update: SurveyCSATUpdateP):
     if rows[0].get("csat"):
         raise HTTPException(status_code=400, detail=f"Survey {survey_id} already has CSAT")
 
-    sql_execute(
+    await async_sql_execute(
         "UPDATE surveys SET csat = :csat WHERE id = :survey_id",
         {"survey_id": survey_id, "csat": csat_update.CSAT},
     )
@@ -720,7 +704,7 @@ async def update_survey_csat(survey_id: str, csat_update: SurveyCSATUpdateP):
 @router.patch("/surveys/{survey_id}/duration")
 async def update_survey_duration(survey_id: str, duration_update: SurveyDurationUpdateP):
     """Update completion duration."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     if rows[0]["status"] == "In-Progress":
@@ -728,7 +712,7 @@ async def update_survey_duration(survey_id: str, duration_update: SurveyDuration
     if rows[0].get("completion_duration"):
         raise HTTPException(status_code=400, detail=f"Survey {survey_id} already has duration")
 
-    sql_execute(
+    await async_sql_execute(
         "UPDATE surveys SET completion_duration = :completion_duration WHERE id = :survey_id",
         {"survey_id": survey_id, "completion_duration": duration_update.CompletionDuration},
     )
@@ -738,7 +722,7 @@ async def update_survey_duration(survey_id: str, duration_update: SurveyDuration
 @router.patch("/surveys/{survey_id}/details")
 async def update_survey_details(survey_id: str, recipient: str = None, rider_name: str = None, phone: str = None):
     """Update editable survey fields (recipient, rider_name, phone)."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     if rows[0]["status"] == "Completed":
@@ -759,7 +743,7 @@ async def update_survey_details(survey_id: str, recipient: str = None, rider_nam
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
-    sql_execute(f"UPDATE surveys SET {', '.join(updates)} WHERE id = :survey_id", params)
+    await async_sql_execute(f"UPDATE surveys SET {', '.join(updates)} WHERE id = :survey_id", params)
     return {"message": f"Survey {survey_id} updated"}
 
 
@@ -771,41 +755,15 @@ async def get_survey_questions_with_answers(body: SurveyQuestionsP):
 
 @router.post("/surveys/submit", response_model=SurveyQnAP)
 async def submit_survey(qna_data: SurveyQnAP):
-    """Submit/update survey answers. Uses process_survey_question in parallel."""
+    """Submit/update survey answers. Raw answers are parsed with one brain-service batch call."""
     survey_id = qna_data.SurveyId
     questions = [q.model_dump() for q in qna_data.QuestionswithAns]
 
-    with ThreadPoolExecutor() as executor:
-        processed = list(executor.map(process_survey_question, questions))
-
-    for i, q in enumerate(questions):
-        if not q.get("Ans") and processed[i].get("Ans"):
-            q["Ans"] = processed[i]["Ans"]
+    # All RawAns -> Ans in one brain-service round trip
+    await process_survey_questions(questions)
 
-    for item in questions:
-        sql_execute(
-            """INSERT INTO survey_response_items (survey_id, question_id, answer, raw_answer, ord)
-            VALUES (:survey_id, :question_id, :answer, :raw_answer, :ord)
-            ON CONFLICT (survey_id, question_id)
-            DO UPDATE SET answer = EXCLUDED.answer, raw_answer = EXCLUDED.raw_answer, ord = EXCLUDED.ord""",
-            {
-                "survey_id": survey_id,
-                "question_id": item["QueId"],
-                "answer": item.get("Ans"),
-                "raw_answer": item.get("RawAns"),
-                "ord": item.get("Order", 0),
-            },
-        )
-
-    # Update survey status to Completed after submission
-    sql_execute(
-        """UPDATE surveys SET status = :status, completion_date = :completion_date WHERE id = :survey_id""",
-        {
-            "survey_id": survey_id,
-            "status": "Completed",
-            "completion_date": str(get_current_time())[:19].replace("T", " "),
-        },
-    )
+    # Answers and the Completed status go out in one statement / transaction
+    await save_survey_answers(survey_id, questions, status="Completed")
 
     return SurveyQnAP(SurveyId=survey_id, QuestionswithAns=[SurveyQuestionAnswerP(**q) for q in questions])
 
@@ -1021,7 +979,7 @@ async def schedule_callback(request: CallbackRequest):
 @router.get("/surveys/{survey_id}/questions_translated")
 async def get_questions_translated(survey_id: str, lang: str = "es"):
     """Return survey questions with text translated to the target language."""
-    rows = sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
 
@@ -1079,16 +1037,17 @@ async def update_survey_duration_post(survey_id: str, duration_update: SurveyDur
 @router.delete("/surveys/{survey_id}")
 async def delete_survey(survey_id: str):
     """Delete a survey and all its responses, transcripts, and analytics."""
-    rows = sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT * FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
     
     # Delete related records in other tables first to avoid FK constraints
-    sql_execute("DELETE FROM survey_analytics WHERE survey_id = :survey_id", {"survey_id": survey_id})
-    sql_execute("DELETE FROM call_transcripts WHERE survey_id = :survey_id", {"survey_id": survey_id})
-    sql_execute("DELETE FROM survey_response_items WHERE survey_id = :survey_id", {"survey_id": survey_id})
-    # Finally delete the survey record
-    sql_execute("DELETE FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    async with async_transaction() as tx:
+        await tx.execute("DELETE FROM survey_analytics WHERE survey_id = :survey_id", {"survey_id": survey_id})
+        await tx.execute("DELETE FROM call_transcripts WHERE survey_id = :survey_id", {"survey_id": survey_id})
+        await tx.execute("DELETE FROM survey_response_items WHERE survey_id = :survey_id", {"survey_id": survey_id})
+        # Finally delete the survey record
+        await tx.execute("DELETE FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     return {"message": f"Survey {survey_id} and all related data deleted successfully"}
 
 
@@ -1101,7 +1060,7 @@ async def delete_template_proxy(request: dict = Body(...)):
         
     try:
         # Check if there are any surveys using this template
-        surveys = sql_execute("SELECT id FROM surveys WHERE template_name = :name LIMIT 1", {"name": template_name})
+        surveys = await async_sql_execute("SELECT id FROM surveys WHERE template_name = :name LIMIT 1", {"name": template_name})
         if surveys:
             # If there are surveys, we can either block or delete them.
             # Usually better to block to prevent accidental massive data loss.
@@ -1306,11 +1265,11 @@ async def get_transcript_post(survey_id: str):
 async def get_survey_question_answer(survey_id: str, request: dict):
     """Get a specific question's answer within a survey."""
     que_id = request.get("QueId", "")
-    rows = sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
+    rows = await async_sql_execute("SELECT id FROM surveys WHERE id = :survey_id", {"survey_id": survey_id})
     if not rows:
         raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
 
-    question_rows = sql_execute("""
+    question_rows = await async_sql_execute("""
         SELECT q.id, q.text, q.criteria, q.scales, q.parent_id,
                sri.ord AS "order", sri.answer, sri.raw_answer, sri.autofill,
                COALESCE(qc.categories, null::json) AS categories,
@@ -13,6 +13,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+
 from routes.templates import router as templates_router
 from routes.template_questions import router as template_questions_router
 
@@ -25,6 +27,7 @@ async def lifespan(app: FastAPI):
     logger.info("Template Service starting up...")
     yield
     logger.info("Template Service shutting down...")
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -56,6 +59,11 @@ async def health():
     return {"status": "OK", "service": "template-service"}
 
 
+@app.get("/health/db")
+async def health_db():
+    return {"service": "template-service", "pools": pool_stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -10,7 +10,7 @@ from shared.models.common import (
     TemplateQuestionDeleteRequestP,
 )
 
-from db import process_question_stats, sql_execute
+from db import async_sql_execute, async_transaction, process_question_stats
 
 router = APIRouter()
 
@@ -22,7 +22,7 @@ router = APIRouter()
 )
 async def add_question_to_template(template_question: TemplateQuestionCreateP):
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_question.TemplateName},
         )
@@ -32,7 +32,7 @@ async def add_question_to_template(template_question: TemplateQuestionCreateP):
                 detail=f"Template with Name {template_question.TemplateName} not found",
             )
 
-        question_response = sql_execute(
+        question_response = await async_sql_execute(
             "SELECT * FROM questions WHERE id = :question_id",
             {"question_id": template_question.QueId},
         )
@@ -42,7 +42,7 @@ async def add_question_to_template(template_question: TemplateQuestionCreateP):
                 detail=f"Question with ID {template_question.QueId} not found",
             )
 
-        sql_execute(
+        await async_sql_execute(
             "INSERT INTO template_questions (template_name, ord, question_id) VALUES (:template_name, :ord, :question_id)",
             {
                 "template_name": template_question.TemplateName,
@@ -66,7 +66,7 @@ async def add_question_to_template(template_question: TemplateQuestionCreateP):
 async def get_template_questions(request: GetTemplateQuestionsRequestP):
     template_name = request.TemplateName
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_name},
         )
@@ -76,7 +76,7 @@ async def get_template_questions(request: GetTemplateQuestionsRequestP):
                 detail=f"Template with Name {template_name} not found",
             )
 
-        questions = sql_execute(
+        questions = await async_sql_execute(
             """SELECT
   q.id,
   q.text,
@@ -121,29 +121,30 @@ async def delete_template_question_fromid_with_parent_child(
         template_name = request.TemplateName
         queid = request.QueId
 
-        sql_execute(
-            """DELETE FROM question_categories
-            WHERE question_id = :question_id
-            OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)""",
-            {"question_id": queid},
-        )
+        async with async_transaction() as tx:
+            await tx.execute(
+                """DELETE FROM question_categories
+                WHERE question_id = :question_id
+                OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)""",
+                {"question_id": queid},
+            )
 
-        sql_execute(
-            """DELETE FROM template_questions
-            WHERE question_id = :question_id
-            OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)""",
-            {"question_id": queid},
-        )
+            await tx.execute(
+                """DELETE FROM template_questions
+                WHERE question_id = :question_id
+                OR question_id IN (SELECT id FROM questions WHERE parent_id = :question_id)""",
+                {"question_id": queid},
+            )
 
-        sql_execute(
-            "DELETE FROM questions WHERE parent_id = :question_id",
-            {"question_id": queid},
-        )
+            await tx.execute(
+                "DELETE FROM questions WHERE parent_id = :question_id",
+                {"question_id": queid},
+            )
 
-        sql_execute(
-            "DELETE FROM questions WHERE id = :question_id",
-            {"question_id": queid},
-        )
+            await tx.execute(
+                "DELETE FROM questions WHERE id = :question_id",
+                {"question_id": queid},
+            )
 
         return {
             "message": f"Question with ID '{queid}' deleted from template '{template_name}'"
@@ -161,7 +162,7 @@ async def delete_template_question_fromid_with_parent_child(
 async def get_template_answers(request: GetTemplateQuestionsRequestP):
     template_name = request.TemplateName
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_name},
         )
@@ -171,7 +172,7 @@ async def get_template_answers(request: GetTemplateQuestionsRequestP):
                 detail=f"Template with Name {template_name} not found",
             )
 
-        question_texts = sql_execute(
+        question_texts = await async_sql_execute(
             """SELECT
   q.id AS question_id,
   q.text AS question_text,
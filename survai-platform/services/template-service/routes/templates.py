@@ -10,6 +10,7 @@ from uuid import uuid4
 from fastapi import APIRouter, Body, HTTPException
 from sqlalchemy.exc import IntegrityError
 
+from shared.db import utc_now
 from shared.models.common import (
     CloneTemplateRequestP,
     GetTemplateQuestionsRequestP,
@@ -21,7 +22,12 @@ from shared.models.common import (
     TranslateTemplateRequestP,
 )
 
-from db import get_current_time, process_question_translation, sql_execute
+from db import (
+    async_sql_execute,
+    async_transaction,
+    get_current_time,
+    process_question_translation,
+)
 from .template_questions import get_template_questions
 
 logger = logging.getLogger(__name__)
@@ -35,7 +41,7 @@ router = APIRouter()
 )
 async def create_template(template_data: TemplateCreateP):
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_data.TemplateName},
         )
@@ -45,12 +51,12 @@ async def create_template(template_data: TemplateCreateP):
                 detail=f"Template with Name {template_data.TemplateName} already exists",
             )
 
-        sql_execute(
+        await async_sql_execute(
             "INSERT INTO templates (name, status, created_at) VALUES (:template_name, :status, :created_at)",
             {
                 "template_name": template_data.TemplateName,
                 "status": "Draft",
-                "created_at": str(get_current_time())[:19].replace("T", " "),
+                "created_at": utc_now(),
             },
         )
         return f"Template with Name {template_data.TemplateName} added successfully"
@@ -67,7 +73,7 @@ async def create_template(template_data: TemplateCreateP):
 )
 async def list_templates():
     try:
-        templates = sql_execute("SELECT * FROM templates", {})
+        templates = await async_sql_execute("SELECT * FROM templates", {})
         return [
             {
                 "TemplateName": item["name"],
@@ -87,7 +93,7 @@ async def list_templates():
 )
 async def list_draft_templates():
     try:
-        templates = sql_execute("SELECT * FROM templates WHERE status = 'Draft'", {})
+        templates = await async_sql_execute("SELECT * FROM templates WHERE status = 'Draft'", {})
         return [
             {
                 "TemplateName": item["name"],
@@ -117,7 +123,7 @@ async def templates_stat():
 )
 async def templates_stats():
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             """SELECT
             COUNT(*) AS total_templates,
             SUM(CASE WHEN status = 'Published' THEN 1 ELSE 0 END) AS total_published_templates,
@@ -159,7 +165,7 @@ async def templates_stats():
 )
 async def get_template(template_name: str):
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_name},
         )
@@ -201,7 +207,7 @@ async def delete_template(template_name: str):
 
 async def _delete_template_impl(template_name: str):
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_name},
         )
@@ -214,7 +220,7 @@ async def _delete_template_impl(template_name: str):
         # Status check removed to allow deleting published templates if no surveys exist.
         # Template deletes route directly here through the gateway, so enforce the
         # survey dependency check in this service before attempting the delete.
-        linked_surveys = sql_execute(
+        linked_surveys = await async_sql_execute(
             "SELECT id FROM surveys WHERE template_name = :template_name LIMIT 1",
             {"template_name": template_name},
         )
@@ -224,39 +230,40 @@ async def _delete_template_impl(template_name: str):
                 detail=f"Cannot delete template '{template_name}' because it has existing surveys. Delete surveys first.",
             )
 
-        sql_execute(
-            """DELETE FROM question_category_mappings qcm
-            USING template_questions tq
-            WHERE qcm.child_question_id = tq.question_id
-            AND tq.template_name = :template_name""",
-            {"template_name": template_name},
-        )
+        async with async_transaction() as tx:
+            await tx.execute(
+                """DELETE FROM question_category_mappings qcm
+                USING template_questions tq
+                WHERE qcm.child_question_id = tq.question_id
+                AND tq.template_name = :template_name""",
+                {"template_name": template_name},
+            )
 
-        sql_execute(
-            """DELETE FROM question_categories qc
-            USING template_questions tq
-            WHERE qc.question_id = tq.question_id
-            AND tq.template_name = :template_name""",
-            {"template_name": template_name},
-        )
+            await tx.execute(
+                """DELETE FROM question_categories qc
+                USING template_questions tq
+                WHERE qc.question_id = tq.question_id
+                AND tq.template_name = :template_name""",
+                {"template_name": template_name},
+            )
 
-        sql_execute(
-            "DELETE FROM template_questions WHERE template_name = :template_name",
-            {"template_name": template_name},
-        )
+            await tx.execute(
+                "DELETE FROM template_questions WHERE template_name = :template_name",
+                {"template_name": template_name},
+            )
 
-        sql_execute(
-            """DELETE FROM questions q
-            USING template_questions tq
-            WHERE q.id = tq.question_id
-            AND tq.template_name = :template_name""",
-            {"template_name": template_name},
-        )
+            await tx.execute(
+                """DELETE FROM questions q
+                USING template_questions tq
+                WHERE q.id = tq.question_id
+                AND tq.template_name = :template_name""",
+                {"template_name": template_name},
+            )
 
-        sql_execute(
-            "DELETE FROM templates WHERE name = :template_name",
-            {"template_name": template_name},
-        )
+            await tx.execute(
+                "DELETE FROM templates WHERE name = :template_name",
+                {"template_name": template_name},
+            )
 
         return {"message": f"Template '{template_name}' deleted successfully"}
     except HTTPException:
@@ -277,7 +284,7 @@ async def _delete_template_impl(template_name: str):
 )
 async def update_template_status(request: TemplateStatusUpdateP):
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": request.TemplateName},
         )
@@ -287,7 +294,7 @@ async def update_template_status(request: TemplateStatusUpdateP):
                 detail=f"Template with Name {request.TemplateName} not found",
             )
 
-        sql_execute(
+        await async_sql_execute(
             "UPDATE templates SET status = :status WHERE name = :template_name",
             {"template_name": request.TemplateName, "status": request.Status},
         )
@@ -310,7 +317,7 @@ async def update_template_config(request: dict):
             raise HTTPException(status_code=400, detail="TemplateName is required")
         
         # Check if template exists
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": template_name},
         )
@@ -337,7 +344,7 @@ async def update_template_config(request: dict):
         
         if update_fields:
             sql = f"UPDATE templates SET {', '.join(update_fields)} WHERE name = :template_name"
-            sql_execute(sql, params)
+            await async_sql_execute(sql, params)
             
             updated_fields = ", ".join([f.replace(" = ", ":") for f in update_fields])
             return f"Template '{template_name}' updated successfully: {updated_fields}"
@@ -360,7 +367,7 @@ async def clone_template(request: CloneTemplateRequestP):
         src_template_name = request.SourceTemplateName
         new_template_name = request.NewTemplateName
 
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": src_template_name},
         )
@@ -376,7 +383,7 @@ async def clone_template(request: CloneTemplateRequestP):
                 detail=f"Template with Name {src_template_name} is in Draft Mode and cannot be cloned",
             )
 
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": new_template_name},
         )
@@ -386,16 +393,16 @@ async def clone_template(request: CloneTemplateRequestP):
                 detail=f"Destination Template with Name {new_template_name} already exists",
             )
 
-        sql_execute(
+        await async_sql_execute(
             "INSERT INTO templates (name, status, created_at) VALUES (:template_name, :status, :created_at)",
             {
                 "template_name": new_template_name,
                 "status": "Draft",
-                "created_at": str(get_current_time())[:19].replace("T", " "),
+                "created_at": utc_now(),
             },
         )
 
-        questions_response = sql_execute(
+        questions_response = await async_sql_execute(
             "SELECT * FROM template_questions WHERE template_name = :template_name",
             {"template_name": src_template_name},
         )
@@ -410,7 +417,7 @@ async def clone_template(request: CloneTemplateRequestP):
         ]
 
         if sql_dict_upd:
-            sql_execute(
+            await async_sql_execute(
                 "INSERT INTO template_questions (template_name, ord, question_id) VALUES (:template_name, :ord, :question_id)",
                 sql_dict_upd,
             )
@@ -437,7 +444,7 @@ async def translate_template(request: TranslateTemplateRequestP):
     new_template_language = request.NewTemplateLanguage
 
     try:
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": src_template_name},
         )
@@ -453,7 +460,7 @@ async def translate_template(request: TranslateTemplateRequestP):
                 detail=f"Template with Name {src_template_name} is in Draft Mode and cannot be translated",
             )
 
-        res = sql_execute(
+        res = await async_sql_execute(
             "SELECT * FROM templates WHERE name = :template_name",
             {"template_name": new_template_name},
         )
@@ -463,12 +470,12 @@ async def translate_template(request: TranslateTemplateRequestP):
                 detail=f"Translated Template with Name {new_template_name} already exists",
             )
 
-        sql_execute(
+        await async_sql_execute(
             "INSERT INTO templates (name, status, created_at) VALUES (:template_name, :status, :created_at)",
             {
                 "template_name": new_template_name,
                 "status": "Draft",
-                "created_at": str(get_current_time())[:19].replace("T", " "),
+                "created_at": utc_now(),
             },
         )
 
@@ -504,7 +511,7 @@ async def translate_template(request: TranslateTemplateRequestP):
                 q["parent_id"] = old_to_new.get(old_parent)
 
         if translated_questions:
-            sql_execute(
+            await async_sql_execute(
                 """INSERT INTO questions (id, text, criteria, scales, parent_id, autofill)
                 VALUES (:id, :text, :criteria, :scales, :parent_id, :autofill)""",
                 [
@@ -523,7 +530,7 @@ async def translate_template(request: TranslateTemplateRequestP):
         for item in translated_questions:
             if item["criteria"] == "categorical" and item.get("categories"):
                 for category_text in item["categories"]:
-                    sql_execute(
+                    await async_sql_execute(
                         "INSERT INTO question_categories (id, question_id, text) VALUES (:id, :question_id, :text)",
                         {
                             "id": str(uuid4()),
@@ -537,7 +544,7 @@ async def translate_template(request: TranslateTemplateRequestP):
             parent_id = item.get("parent_id")
             if not pct or not parent_id:
                 continue
-            parent_cats = sql_execute(
+            parent_cats = await async_sql_execute(
                 "SELECT id, text FROM question_categories WHERE question_id = :parent_id",
                 {"parent_id": parent_id},
             )
@@ -552,13 +559,13 @@ async def translate_template(request: TranslateTemplateRequestP):
                         }
                     )
             if mappings:
-                sql_execute(
+                await async_sql_execute(
                     """INSERT INTO question_category_mappings (child_question_id, parent_category_id)
                     VALUES (:child_question_id, :parent_category_id)""",
                     mappings,
                 )
 
-        sql_execute(
+        await async_sql_execute(
             """INSERT INTO template_questions (template_name, ord, question_id)
             VALUES (:template_name, :ord, :question_id)""",
             [
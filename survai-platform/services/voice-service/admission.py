@@ -0,0 +1,190 @@
+"""
+Admission control for outbound calls.
+
+Every make_call waits here before it reserves a number and dispatches to
+LiveKit, so campaign bursts and bulk launches are smoothed instead of
+failing at the SIP trunk:
+
+- token bucket: DIAL_RATE_PER_SECOND sustained, DIAL_BURST at once
+- ceiling: at most MAX_ACTIVE_CALLS live reservations cluster-wide
+  (call_reservations rows, dialing or connected) plus calls admitted here
+  that have not reserved yet
+- priority queue: "high" (dashboard one-offs) before "normal" before "low"
+  (campaigns), FIFO within a priority; at most DIAL_QUEUE_MAX waiting and
+  DIAL_QUEUE_TIMEOUT_SECONDS of wait before the request is rejected
+
+The bucket and queue are per process; the ceiling is shared through Postgres.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import call_reservations
+
+logger = logging.getLogger(__name__)
+
+DIAL_RATE_PER_SECOND = float(os.getenv("DIAL_RATE_PER_SECOND", "2"))
+DIAL_BURST = int(os.getenv("DIAL_BURST", "5"))
+MAX_ACTIVE_CALLS = int(os.getenv("MAX_ACTIVE_CALLS", "20"))
+DIAL_QUEUE_MAX = int(os.getenv("DIAL_QUEUE_MAX", "200"))
+DIAL_QUEUE_TIMEOUT_SECONDS = float(os.getenv("DIAL_QUEUE_TIMEOUT_SECONDS", "45"))
+CAPACITY_POLL_SECONDS = 0.5
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted (queue full or wait timed out)."""
+
+
+class DialGovernor:
+    def __init__(
+        self,
+        rate: float = DIAL_RATE_PER_SECOND,
+        burst: int = DIAL_BURST,
+        max_active: int = MAX_ACTIVE_CALLS,
+        queue_max: int = DIAL_QUEUE_MAX,
+        queue_timeout: float = DIAL_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_active = max_active
+        self.queue_max = queue_max
+        self.queue_timeout = queue_timeout
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._queue: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._admitting = 0  # admitted but not yet holding a reservation
+        self.counters: Dict[str, int] = {"admitted": 0, "rejected_full": 0, "timed_out": 0}
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    # ─── Token bucket ─────────────────────────────────────────────────────
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def _take_token(self) -> None:
+        self._refill()
+        while self._tokens < 1:
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+            self._refill()
+        self._tokens -= 1
+
+    # ─── Dispatcher ───────────────────────────────────────────────────────
+
+    async def _has_capacity(self) -> bool:
+        try:
+            active = await call_reservations.active_count()
+        except Exception as e:
+            logger.warning(f"Active call count failed, admitting on rate limit only: {e}")
+            return True
+        return active + self._admitting < self.max_active
+
+    def _pop_live(self) -> asyncio.Future | None:
+        while self._queue:
+            *_, fut = heapq.heappop(self._queue)
+            if not fut.done():
+                return fut
+        return None
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not any(not fut.done() for *_, fut in self._queue):
+                self._queue.clear()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            while not await self._has_capacity():
+                await asyncio.sleep(CAPACITY_POLL_SECONDS)
+            await self._take_token()
+            fut = self._pop_live()
+            if fut is None:
+                self._tokens = min(self.burst, self._tokens + 1)  # waiter left; give the token back
+                continue
+            self._admitting += 1
+            fut.set_result(None)
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    # ─── Public API ───────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def admit(self, priority: str = "normal") -> AsyncIterator[float]:
+        """
+        Wait for a dial slot; yields the queue wait in seconds. Leave the block
+        once the call holds its reservation (or has failed).
+        """
+        waiting = sum(1 for *_, fut in self._queue if not fut.done())
+        if waiting >= self.queue_max:
+            self.counters["rejected_full"] += 1
+            raise AdmissionRejected(f"Dial queue is full ({waiting} waiting)")
+
+        self._ensure_dispatcher()
+        fut = asyncio.get_running_loop().create_future()
+        start = time.monotonic()
+        heapq.heappush(self._queue, (PRIORITIES.get(priority, PRIORITIES["normal"]), next(self._seq), start, fut))
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done():
+                self._admitting -= 1  # admitted right at the deadline; hand the slot back
+            fut.cancel()
+            self.counters["timed_out"] += 1
+            raise AdmissionRejected(f"No dial slot within {self.queue_timeout:.0f}s")
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._admitting -= 1
+            fut.cancel()
+            raise
+
+        wait_ms = (time.monotonic() - start) * 1000
+        self.counters["admitted"] += 1
+        self._total_wait_ms += wait_ms
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        try:
+            yield wait_ms / 1000
+        finally:
+            self._admitting -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        depth = {name: 0 for name in PRIORITIES}
+        names = {v: k for k, v in PRIORITIES.items()}
+        now = time.monotonic()
+        oldest = 0.0
+        for prio, _, enqueued, fut in self._queue:
+            if not fut.done():
+                depth[names[prio]] += 1
+                oldest = max(oldest, now - enqueued)
+        admitted = self.counters["admitted"]
+        return {
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_priority": depth,
+            "oldest_wait_ms": round(oldest * 1000, 2),
+            "admitting": self._admitting,
+            "tokens": round(self._tokens, 2),
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "max_active_calls": self.max_active,
+            "avg_wait_ms": round(self._total_wait_ms / admitted, 2) if admitted else 0.0,
+            "max_wait_ms": round(self._max_wait_ms, 2),
+            **self.counters,
+        }
+
+
+dial_governor = DialGovernor()
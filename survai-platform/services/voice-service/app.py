@@ -9,13 +9,23 @@ Handles all voice/call operations:
 Builds survey prompts locally via prompt_builder. No brain-service calls needed.
 """
 
+import sys
+
+sys.path.insert(0, "/app")
+
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db import dispose_async_engines, pool_stats
+from shared.service_client import service_client
+
+import call_reservations
 from routes.voice import router as voice_router, agent_router
+from translation_cache import translation_cache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,8 +34,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Voice Service starting up...")
+    sweeper = asyncio.create_task(call_reservations.run_sweeper())
     yield
     logger.info("Voice Service shutting down...")
+    sweeper.cancel()
+    await service_client.close()
+    await dispose_async_engines()
 
 
 app = FastAPI(
@@ -54,7 +68,12 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "OK", "service": "voice-service"}
+    return {"status": "OK", "service": "voice-service", "translation_cache": translation_cache.stats()}
+
+
+@app.get("/health/db")
+async def health_db():
+    return {"service": "voice-service", "pools": pool_stats()}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+Cluster-wide call reservations for the Voice Service.
+
+One row per phone number being dialed, in Postgres, so every worker and
+replica sees the same locks:
+
+  phone (PK) | survey_id (UNIQUE) | holder | confirmed | reserved_at | expires_at
+
+A reservation is a lease:
+- reserve: INSERT ... ON CONFLICT DO NOTHING; the unique constraints on phone
+  and survey_id make it atomic across processes. Lease = UNCONFIRMED_LEASE_SECONDS
+  (the old per-call watchdog: released if the agent never confirms).
+- confirm: the call was answered; lease extended to CONFIRMED_LEASE_SECONDS.
+- renew: the agent heartbeats while the call is live; never extends past
+  HARD_LIMIT_SECONDS from reserved_at.
+- release: delete on call end / dispatch failure.
+
+Expired rows are ignored by reserve and deleted by the sweeper task started
+from the app lifespan, so a crashed worker can only block a number until its
+lease runs out.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from db import async_execute, utc_now
+
+logger = logging.getLogger(__name__)
+
+UNCONFIRMED_LEASE_SECONDS = int(os.getenv("CALL_UNCONFIRMED_LEASE_SECONDS", "75"))
+CONFIRMED_LEASE_SECONDS = int(os.getenv("CALL_CONFIRMED_LEASE_SECONDS", str(4 * 60)))
+HARD_LIMIT_SECONDS = int(os.getenv("CALL_HARD_LIMIT_SECONDS", str(10 * 60)))
+SWEEP_SECONDS = int(os.getenv("CALL_RESERVATION_SWEEP_SECONDS", "30"))
+
+HOLDER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def try_reserve(phone: str, survey_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Take the lease for phone/survey_id. Returns None on success, or the row
+    that currently holds the phone or survey.
+    """
+    now = utc_now()
+    params = {"phone": phone, "survey_id": survey_id, "now": now}
+    await async_execute(
+        """DELETE FROM call_reservations
+           WHERE (phone = :phone OR survey_id = :survey_id) AND expires_at <= :now""",
+        params,
+    )
+    rows = await async_execute(
+        """INSERT INTO call_reservations (phone, survey_id, holder, confirmed, reserved_at, expires_at)
+           VALUES (:phone, :survey_id, :holder, FALSE, :now, :expires_at)
+           ON CONFLICT DO NOTHING
+           RETURNING phone""",
+        {**params, "holder": HOLDER, "expires_at": now + timedelta(seconds=UNCONFIRMED_LEASE_SECONDS)},
+    )
+    if rows:
+        return None
+    existing = await async_execute(
+        """SELECT phone, survey_id, holder, confirmed, reserved_at, expires_at
+           FROM call_reservations
+           WHERE phone = :phone OR survey_id = :survey_id
+           ORDER BY (survey_id = :survey_id) DESC
+           LIMIT 1""",
+        params,
+    )
+    # Released between the insert and the select: report as free so the caller retries
+    return existing[0] if existing else {}
+
+
+async def evict(phone: str, survey_id: str, reserved_at) -> bool:
+    """Delete a specific lease (compare-and-delete on reserved_at). True if removed."""
+    rows = await async_execute(
+        """DELETE FROM call_reservations
+           WHERE phone = :phone AND survey_id = :survey_id AND reserved_at = :reserved_at
+           RETURNING phone""",
+        {"phone": phone, "survey_id": survey_id, "reserved_at": reserved_at},
+    )
+    return bool(rows)
+
+
+async def confirm(survey_id: str) -> bool:
+    now = utc_now()
+    rows = await async_execute(
+        """UPDATE call_reservations
+           SET confirmed = TRUE,
+               expires_at = LEAST(:expires_at, reserved_at + make_interval(secs => :hard_limit))
+           WHERE survey_id = :survey_id AND expires_at > :now
+           RETURNING phone""",
+        {
+            "survey_id": survey_id,
+            "now": now,
+            "expires_at": now + timedelta(seconds=CONFIRMED_LEASE_SECONDS),
+            "hard_limit": float(HARD_LIMIT_SECONDS),
+        },
+    )
+    return bool(rows)
+
+
+async def renew(survey_id: str) -> Optional[Dict[str, Any]]:
+    """Extend a live lease; returns the updated row or None if it is gone."""
+    now = utc_now()
+    rows = await async_execute(
+        """UPDATE call_reservations
+           SET expires_at = LEAST(:expires_at, reserved_at + make_interval(secs => :hard_limit))
+           WHERE survey_id = :survey_id AND expires_at > :now
+           RETURNING phone, survey_id, confirmed, expires_at""",
+        {
+            "survey_id": survey_id,
+            "now": now,
+            "expires_at": now + timedelta(seconds=CONFIRMED_LEASE_SECONDS),
+            "hard_limit": float(HARD_LIMIT_SECONDS),
+        },
+    )
+    return rows[0] if rows else None
+
+
+async def release(survey_id: Optional[str] = None, phone: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Drop the lease for survey_id (only if it is on phone, when both are given)."""
+    if survey_id and phone:
+        where = "survey_id = :survey_id AND phone = :phone"
+    elif survey_id:
+        where = "survey_id = :survey_id"
+    elif phone:
+        where = "phone = :phone"
+    else:
+        return None
+    rows = await async_execute(
+        f"DELETE FROM call_reservations WHERE {where} RETURNING phone, survey_id",
+        {"survey_id": survey_id, "phone": phone},
+    )
+    return rows[0] if rows else None
+
+
+async def sweep() -> int:
+    rows = await async_execute(
+        "DELETE FROM call_reservations WHERE expires_at <= :now RETURNING phone, survey_id",
+        {"now": utc_now()},
+    )
+    for row in rows:
+        logger.info(f"Expired call reservation: {row['phone']} (survey {row['survey_id']})")
+    return len(rows)
+
+
+async def active_count() -> int:
+    rows = await async_execute(
+        "SELECT COUNT(*) AS n FROM call_reservations WHERE expires_at > :now",
+        {"now": utc_now()},
+    )
+    return int(rows[0]["n"]) if rows else 0
+
+
+async def run_sweeper() -> None:
+    """Lifespan background task: delete expired leases every SWEEP_SECONDS."""
+    while True:
+        await asyncio.sleep(SWEEP_SECONDS)
+        try:
+            await sweep()
+        except Exception as e:
+            logger.warning(f"Call reservation sweep failed: {e}")
@@ -1,82 +1,55 @@
 """
 Database operations for the Voice Service.
 Uses async SQLAlchemy + asyncpg for non-blocking DB access on the call path.
-Keeps a sync engine for backward compat (store_transcript, etc.).
+Keeps a sync engine for background threads and scripts; routes only use
+the async helpers.
+Both pools come from shared.db.
 """
 
+import sys
+
+sys.path.insert(0, "/app")
+
+import asyncio
+import base64
+import binascii
 import json
-import os
 import logging
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from shared.db import (
+    async_sql_execute as _async_sql_execute,
+    get_async_engine as _get_async_engine,
+    get_engine as _get_engine,
+    sql_execute as _sql_execute,
+    utc_now,
+)
 
 logger = logging.getLogger(__name__)
 
-_sync_engine = None
-_async_engine: Optional[AsyncEngine] = None
-
-
-def _db_url(driver: str = "psycopg2") -> str:
-    db_host = os.getenv("DB_HOST", "localhost")
-    db_port = os.getenv("DB_PORT", "5432")
-    db_user = os.getenv("DB_USER", "pguser")
-    db_password = os.getenv("DB_PASSWORD", "root")
-    db_name = os.getenv("DB_NAME", "db")
-    return f"postgresql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+SERVICE_NAME = "voice-service"
 
 
 def get_engine():
-    global _sync_engine
-    if _sync_engine is None:
-        _sync_engine = create_engine(
-            _db_url("psycopg2"),
-            pool_size=5, max_overflow=10, pool_pre_ping=True, pool_recycle=300,
-        )
-    return _sync_engine
+    return _get_engine(SERVICE_NAME)
 
 
-def get_async_engine() -> AsyncEngine:
-    global _async_engine
-    if _async_engine is None:
-        _async_engine = create_async_engine(
-            _db_url("asyncpg"),
-            pool_size=5, max_overflow=10, pool_pre_ping=True, pool_recycle=300,
-        )
-    return _async_engine
+def get_async_engine():
+    return _get_async_engine(SERVICE_NAME)
 
 
 # ─── Sync helper (for non-critical paths) ────────────────────────────────────
 
 def sql_execute(query: str, params: dict = None) -> list:
-    engine = get_engine()
-    with engine.connect() as conn:
-        result = conn.execute(text(query), params or {})
-        if result.returns_rows:
-            rows = result.fetchall()
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in rows]
-        else:
-            conn.commit()
-            return []
+    return _sql_execute(query, params, service_name=SERVICE_NAME)
 
 
 # ─── Async helper (for the call-initiation hot path) ─────────────────────────
 
 async def async_execute(query: str, params: dict = None) -> list:
-    engine = get_async_engine()
-    async with engine.connect() as conn:
-        result = await conn.execute(text(query), params or {})
-        if result.returns_rows:
-            rows = result.fetchall()
-            columns = result.keys()
-            return [dict(zip(columns, row)) for row in rows]
-        else:
-            await conn.commit()
-            return []
+    return await _async_sql_execute(query, params, service_name=SERVICE_NAME)
 
 
 # ─── Survey Data Loading (async — used on call path) ─────────────────────────
@@ -178,7 +151,22 @@ async def get_template_config(template_name: str) -> Dict[str, Any]:
 
 # ─── Transcript Storage (sync — called after call, not latency-critical) ─────
 
-def store_transcript(
+def format_transcript(turns: List[Dict[str, Any]], answers: Dict[str, str]) -> str:
+    """Flat text form of structured turns, same layout the agent used to post."""
+    lines = []
+    for turn in turns:
+        role_label = "AGENT" if turn.get("role") == "agent" else "CALLER"
+        lines.append(f'[{turn.get("ts") or ""}] {role_label}: {turn.get("text", "")}')
+    if turns:
+        if answers:
+            lines.append("\n--- RECORDED ANSWERS ---")
+            lines.extend(f"  Q[{qid}]: {ans}" for qid, ans in answers.items())
+    else:
+        lines.extend(f"Q[{qid}]: {ans}" for qid, ans in answers.items())
+    return "\n".join(lines)
+
+
+async def store_transcript(
     survey_id: str,
     full_transcript: str,
     call_duration_seconds: int = 0,
@@ -187,27 +175,42 @@ def store_transcript(
     channel: str = "phone",
     call_id: str = None,
     audio_url: str = None,
+    turns: Optional[List[Dict[str, Any]]] = None,
+    answers: Optional[Dict[str, str]] = None,
 ) -> str:
     transcript_id = str(uuid4())
-    now = datetime.now(timezone.utc).isoformat()
-    sql_execute(
+    now = utc_now()
+    # Parse once here so reads are a plain row fetch; off the loop, long calls take a while
+    parsed = await asyncio.to_thread(enhance_transcript, {
+        "survey_id": survey_id,
+        "full_transcript": full_transcript,
+        "call_duration_seconds": call_duration_seconds,
+        "turns": turns,
+        "answers": answers,
+    })
+    await async_execute(
         """INSERT INTO call_transcripts
            (id, survey_id, full_transcript, call_duration_seconds,
             call_started_at, call_ended_at, call_status, call_attempts, channel,
-            audio_url)
+            audio_url, turns, answers, parsed, language_detected)
            VALUES (:id, :survey_id, :transcript, :duration,
                    :started, :ended, :status, :attempts, :channel,
-                   :audio_url)""",
+                   :audio_url, CAST(:turns AS jsonb), CAST(:answers AS jsonb),
+                   CAST(:parsed AS jsonb), :language)""",
         {
             "id": transcript_id, "survey_id": survey_id,
             "transcript": full_transcript, "duration": call_duration_seconds,
             "started": now, "ended": now, "status": call_status,
             "attempts": call_attempts, "channel": channel,
             "audio_url": audio_url,
+            "turns": json.dumps(turns, ensure_ascii=False) if turns is not None else None,
+            "answers": json.dumps(answers, ensure_ascii=False) if answers is not None else None,
+            "parsed": json.dumps(parsed, ensure_ascii=False),
+            "language": parsed["language_detected"],
         },
     )
     if call_id:
-        sql_execute(
+        await async_execute(
             "UPDATE surveys SET call_id = :call_id WHERE id = :survey_id",
             {"call_id": call_id, "survey_id": survey_id},
         )
@@ -232,11 +235,27 @@ def enhance_transcript(transcript: Dict[str, Any]) -> Dict[str, Any]:
         "translation_available": False
     }
     
-    # Parse conversation log if present
-    lines = full_transcript.split('\n')
     conversation_lines = []
     survey_answers = []
-    
+
+    turns = transcript.get("turns")
+    if isinstance(turns, list):
+        # Stored as structured turns: no text scanning needed
+        for turn in turns:
+            role = "agent" if turn.get("role") == "agent" else "user"
+            entry = {"timestamp": f"[{turn.get('ts') or ''}]", "role": role, "text": turn.get("text", "")}
+            conversation_lines.append(entry)
+            enhanced["conversation_log"].append(entry)
+            enhanced["agent_responses" if role == "agent" else "user_responses"].append(entry["text"])
+        for qid, answer in (transcript.get("answers") or {}).items():
+            survey_answer = {"question_id": qid, "answer": answer}
+            survey_answers.append(survey_answer)
+            enhanced["survey_answers"].append(survey_answer)
+        lines = []
+    else:
+        # Legacy rows: parse conversation log out of the flat text
+        lines = full_transcript.split('\n')
+
     for line in lines:
         line = line.strip()
         if not line:
@@ -321,19 +340,148 @@ def enhance_transcript(transcript: Dict[str, Any]) -> Dict[str, Any]:
     return enhanced
 
 
-def get_transcript(survey_id: str) -> Optional[Dict[str, Any]]:
-    transcripts = sql_execute(
-        """SELECT * FROM call_transcripts
+async def get_transcript(survey_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Latest transcript for a survey with its pre-parsed structure in "parsed".
+    Rows stored before parse-on-write are parsed once here and backfilled.
+    """
+    rows = await async_execute(
+        """SELECT id, survey_id, call_duration_seconds, call_started_at, call_ended_at,
+                  call_status, call_attempts, channel, audio_url, parsed, language_detected
+           FROM call_transcripts
            WHERE survey_id = :survey_id
            ORDER BY call_started_at DESC LIMIT 1""",
         {"survey_id": survey_id},
     )
-    return transcripts[0] if transcripts else None
+    if not rows:
+        return None
+    transcript = rows[0]
+    if transcript["parsed"] is None:
+        legacy = await async_execute(
+            "SELECT full_transcript, turns, answers FROM call_transcripts WHERE id = :id",
+            {"id": transcript["id"]},
+        )
+        parsed = enhance_transcript({**transcript, **legacy[0]})
+        transcript["parsed"] = parsed
+        transcript["language_detected"] = parsed["language_detected"]
+        try:
+            await async_execute(
+                """UPDATE call_transcripts
+                   SET parsed = CAST(:parsed AS jsonb), language_detected = :language
+                   WHERE id = :id""",
+                {
+                    "id": transcript["id"],
+                    "parsed": json.dumps(parsed, ensure_ascii=False),
+                    "language": parsed["language_detected"],
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to backfill parsed transcript {transcript['id']}: {e}")
+    return transcript
+
+
+# ─── Transcript listing (keyset pagination) ──────────────────────────────────
+
+def encode_transcript_cursor(call_started_at: datetime, transcript_id: str) -> str:
+    raw = f"{call_started_at.isoformat()}|{transcript_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_transcript_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_transcript_cursor; raises ValueError on a malformed cursor."""
+    try:
+        started, transcript_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(started), transcript_id
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _transcript_filters(
+    status: Optional[str], channel: Optional[str], tenant_id: Optional[str],
+) -> Tuple[str, str, Dict[str, Any]]:
+    """(join, where, params) shared by the page query and the counts."""
+    join, clauses, params = "", ["ct.call_started_at IS NOT NULL"], {}
+    if status:
+        clauses.append("ct.call_status = :status")
+        params["status"] = status
+    if channel:
+        clauses.append("ct.channel = :channel")
+        params["channel"] = channel
+    if tenant_id:
+        join = "JOIN surveys s ON s.id = ct.survey_id"
+        clauses.append("s.tenant_id = :tenant_id")
+        params["tenant_id"] = tenant_id
+    return join, " AND ".join(clauses), params
+
+
+async def list_transcripts(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    channel: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of transcripts, newest first, and the cursor for the next page
+    (None on the last page). Seeks on (call_started_at, id) so every page is
+    an index range scan regardless of depth.
+    """
+    join, where, params = _transcript_filters(status, channel, tenant_id)
+    if cursor:
+        started, transcript_id = decode_transcript_cursor(cursor)
+        where += " AND (ct.call_started_at, ct.id) < (:cursor_started, :cursor_id)"
+        params.update({"cursor_started": started, "cursor_id": transcript_id})
+    rows = await async_execute(
+        f"""SELECT ct.id, ct.survey_id, ct.call_status, ct.call_duration_seconds,
+                   ct.call_started_at, ct.channel
+            FROM call_transcripts ct {join}
+            WHERE {where}
+            ORDER BY ct.call_started_at DESC, ct.id DESC
+            LIMIT :limit""",
+        {**params, "limit": limit + 1},
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_transcript_cursor(rows[-1]["call_started_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+async def count_transcripts(
+    mode: str = "approximate",
+    status: Optional[str] = None,
+    channel: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Total for the listing filters. "exact" runs COUNT(*); "approximate" reads
+    the planner estimate (pg_class.reltuples unfiltered, EXPLAIN rows
+    otherwise), which costs no scan. "none" skips counting.
+    """
+    if mode == "none":
+        return None
+    join, where, params = _transcript_filters(status, channel, tenant_id)
+    query = f"FROM call_transcripts ct {join} WHERE {where}"
+    if mode == "exact":
+        rows = await async_execute(f"SELECT COUNT(*) AS n {query}", params)
+        return int(rows[0]["n"])
+    if not params:
+        rows = await async_execute(
+            "SELECT reltuples::bigint AS n FROM pg_class WHERE oid = 'call_transcripts'::regclass"
+        )
+        # reltuples is -1 until the table has been analyzed
+        if rows and rows[0]["n"] >= 0:
+            return int(rows[0]["n"])
+    rows = await async_execute(f"EXPLAIN (FORMAT JSON) SELECT 1 {query}", params)
+    plan = rows[0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
 
 
-def record_answer(survey_id: str, question_id: str, raw_answer: str) -> bool:
+async def record_answer(survey_id: str, question_id: str, raw_answer: str) -> bool:
     try:
-        sql_execute(
+        await async_execute(
             """UPDATE survey_response_items
                SET raw_answer = :raw_answer
                WHERE survey_id = :survey_id AND question_id = :question_id""",
@@ -346,19 +494,33 @@ def record_answer(survey_id: str, question_id: str, raw_answer: str) -> bool:
         return False
 
 
-def update_survey_status(survey_id: str, status: str = "Completed") -> bool:
-    """Update survey status and completion_date in DB. Uses explicit transaction so it always commits."""
+async def record_answers(survey_id: str, answers: List[Tuple[str, str]]) -> bool:
+    """Record several (question_id, raw_answer) pairs in one executemany; later pairs win."""
+    if not answers:
+        return True
     try:
-        now = datetime.now(timezone.utc).isoformat()[:19].replace("T", " ")
-        engine = get_engine()
-        with engine.begin() as conn:
-            conn.execute(
-                text(
-                    """UPDATE surveys SET status = :status, completion_date = :date
-                       WHERE id = :survey_id"""
-                ),
-                {"status": status, "date": now, "survey_id": survey_id},
-            )
+        await async_execute(
+            """UPDATE survey_response_items
+               SET raw_answer = :raw_answer
+               WHERE survey_id = :survey_id AND question_id = :question_id""",
+            [{"survey_id": survey_id, "question_id": qid, "raw_answer": ans} for qid, ans in answers],
+        )
+        logger.info(f"Recorded {len(answers)} answers for survey={survey_id}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to record answers: {e}")
+        return False
+
+
+async def update_survey_status(survey_id: str, status: str = "Completed", end_reason: Optional[str] = None) -> bool:
+    """Update survey status, completion_date and (if given) end_reason in one statement."""
+    try:
+        await async_execute(
+            """UPDATE surveys SET status = :status, completion_date = :date,
+                                  end_reason = COALESCE(:end_reason, end_reason)
+               WHERE id = :survey_id""",
+            {"status": status, "date": utc_now(), "end_reason": end_reason, "survey_id": survey_id},
+        )
         logger.info(f"Updated survey {survey_id} status to {status}")
         return True
     except Exception as e:
@@ -12,55 +12,59 @@ No bilingual mode.
 build_survey_prompt() is kept as a backward-compatible alias (returns joined text).
 """
 
-import hashlib
 import logging
 import os
+import re
 from typing import Any, Dict, List, Optional
 
-logger = logging.getLogger(__name__)
-_ES_TRANSLATION_CACHE: Dict[str, Dict[str, str]] = {}
-
+from translation_cache import make_key, translation_cache
 
-def _translation_cache_key(questions: List[Dict[str, Any]]) -> str:
-    payload = "\n".join(
-        f"{q.get('id', '')}|{q.get('text', '')}"
-        for q in questions
-        if isinstance(q, dict)
-    )
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+logger = logging.getLogger(__name__)
+TRANSLATION_MODEL = "gpt-4o-mini"
+# "3. [q3] ¿Cómo fue su viaje?" -- the model's numbering is optional, the [id] tag is not
+_TRANSLATED_LINE = re.compile(r"^\s*(?:\d+[.)]\s*)?\[([^\]]+)\]\s*(.+?)\s*$")
 
 
 async def _translate_questions_to_es(questions: List[Dict[str, Any]]) -> Dict[str, str]:
     """
-    Batch-translate all question texts to Spanish using OpenAI.
+    Translate question texts to Spanish using OpenAI, one cache entry per question.
+    Only questions missing from the cache are sent, in a single batch request.
+    Output lines are matched back by their [id] tag; a question whose line is
+    missing or untagged is neither returned nor cached.
     Returns a dict mapping question_id -> Spanish text.
-    Falls back gracefully to empty dict on any error.
+    Falls back gracefully to English (missing entries) on any error.
     """
+    questions = [q for q in questions if isinstance(q, dict) and q.get("text")]
     if not questions:
         return {}
 
-    cache_key = _translation_cache_key(questions)
-    cached = _ES_TRANSLATION_CACHE.get(cache_key)
-    if cached:
-        logger.info(f"Using cached Spanish translation for {len(cached)} questions")
-        return cached
+    keyed = [
+        (q.get("id", f"q{i+1}"), q.get("text", ""), make_key("es", TRANSLATION_MODEL, q.get("text", "")))
+        for i, q in enumerate(questions)
+    ]
+    cached = await translation_cache.get_many([key for _, _, key in keyed])
+    result: Dict[str, str] = {qid: cached[key] for qid, _, key in keyed if key in cached}
+    pending = [(qid, text, key) for qid, text, key in keyed if key not in cached]
+    if not pending:
+        logger.info(f"Using cached Spanish translation for {len(result)} questions")
+        return result
 
     api_key = os.getenv("OPENAI_API_KEY", "")
     if not api_key:
         logger.warning("OPENAI_API_KEY not set — Spanish questions will use English text")
-        return {}
+        return result
 
     try:
         from openai import AsyncOpenAI
         client = AsyncOpenAI(api_key=api_key)
 
         numbered_lines = "\n".join(
-            f"{i+1}. [{q.get('id', f'q{i+1}')}] {q.get('text', '')}"
-            for i, q in enumerate(questions)
+            f"{i+1}. [{qid}] {text}"
+            for i, (qid, text, _) in enumerate(pending)
         )
 
         response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+            model=TRANSLATION_MODEL,
             temperature=0.3,
             messages=[
                 {
@@ -77,25 +81,32 @@ async def _translate_questions_to_es(questions: List[Dict[str, Any]]) -> Dict[st
             ],
         )
 
-        translated_lines = response.choices[0].message.content.strip().split("\n")
-        result: Dict[str, str] = {}
-        for i, (q, line) in enumerate(zip(questions, translated_lines)):
-            qid = q.get("id", f"q{i+1}")
-            text = line.strip()
-            bracket_end = text.find("] ")
-            if bracket_end != -1:
-                text = text[bracket_end + 2:]
-            elif ". " in text:
-                text = text.split(". ", 1)[-1]
+        translated: Dict[str, str] = {}
+        for line in (response.choices[0].message.content or "").splitlines():
+            match = _TRANSLATED_LINE.match(line)
+            if match:
+                translated.setdefault(match.group(1).strip(), match.group(2))
+        new_entries = []
+        for qid, source, key in pending:
+            text = translated.get(str(qid))
+            if not text:
+                continue
             result[qid] = text
-
-        _ES_TRANSLATION_CACHE[cache_key] = result
-        logger.info(f"Translated {len(result)} questions to Spanish")
+            new_entries.append((key, qid, source, text))
+
+        await translation_cache.set_many("es", new_entries)
+        missing = len(pending) - len(new_entries)
+        if missing:
+            logger.warning(f"Spanish translation had no [id] line for {missing} questions — using English text")
+        logger.info(
+            f"Translated {len(new_entries)} questions to Spanish "
+            f"({len(keyed) - len(pending)} from cache)"
+        )
         return result
 
     except Exception as e:
         logger.warning(f"Question translation to Spanish failed: {e} — using English text")
-        return {}
+        return result
 
 
 def _format_question_en(order: int, q: Dict[str, Any]) -> str:
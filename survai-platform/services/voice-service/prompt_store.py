@@ -0,0 +1,169 @@
+"""
+Prompt artifact store for the Voice Service.
+
+make_call used to rebuild the greeter and questions prompts on every dial,
+including an OpenAI translation for the Spanish questions prompt. The
+prompts are now built once, when survey-service creates the survey
+(POST /api/voice/prompts/{survey_id}), and stored in prompt_artifacts:
+
+  survey_id (PK) | content_hash | artifacts (JSONB) | built_at
+
+content_hash covers everything the prompts are built from (company, rider
+first name, survey name, question texts/options/branching and
+PROMPT_BUILDER_VERSION). make_call does one primary-key read and uses the
+row only if the hash still matches; otherwise it builds what it needs
+inline, as before, and refreshes the stored artifacts in the background.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from db import async_execute, utc_now
+from prompt_builder import build_greeter_prompt, build_questions_prompt
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever prompt_builder output changes so stored prompts are rebuilt
+PROMPT_BUILDER_VERSION = "1"
+GREETER_LANGUAGES = ("en", "es", "bilingual")
+QUESTION_LANGUAGES = ("en", "es")
+
+# Strong references to in-flight background builds (the loop only keeps weak ones)
+_refresh_tasks: set = set()
+
+
+def content_hash(
+    organization_name: str,
+    rider_first_name: str,
+    survey_name: str,
+    questions: List[Dict[str, Any]],
+) -> str:
+    """Version key for a survey's prompts."""
+    payload = {
+        "v": PROMPT_BUILDER_VERSION,
+        "organization_name": organization_name,
+        "rider_first_name": rider_first_name,
+        "survey_name": survey_name,
+        "questions": [
+            {
+                "id": q.get("id"),
+                "text": q.get("text"),
+                "criteria": q.get("criteria"),
+                "scales": q.get("scales"),
+                "parent_id": q.get("parent_id"),
+                "categories": q.get("categories") or [],
+                "parent_category_texts": q.get("parent_category_texts") or [],
+            }
+            for q in questions
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+async def build_artifacts(
+    organization_name: str,
+    rider_first_name: str,
+    survey_name: str,
+    questions: List[Dict[str, Any]],
+    question_languages: Iterable[str] = QUESTION_LANGUAGES,
+) -> Dict[str, Any]:
+    """
+    Build greeter prompts for every language mode and questions prompts for
+    question_languages. Shape:
+        {"greeter": {lang: str}, "questions_prompt": {lang: str}, "questions_map": {lang: dict}}
+    """
+    artifacts: Dict[str, Any] = {
+        "greeter": {
+            lang: build_greeter_prompt(
+                organization_name=organization_name,
+                rider_first_name=rider_first_name,
+                language=lang,
+            )
+            for lang in GREETER_LANGUAGES
+        },
+        "questions_prompt": {},
+        "questions_map": {},
+    }
+    languages = list(question_languages)
+    built = await asyncio.gather(*(
+        build_questions_prompt(
+            organization_name=organization_name,
+            rider_first_name=rider_first_name,
+            survey_name=survey_name,
+            questions=questions,
+            language=lang,
+        )
+        for lang in languages
+    ))
+    for lang, (prompt, qmap) in zip(languages, built):
+        artifacts["questions_prompt"][lang] = prompt
+        artifacts["questions_map"][lang] = qmap
+    return artifacts
+
+
+async def load_artifacts(survey_id: str, expected_hash: str) -> Optional[Dict[str, Any]]:
+    """Stored artifacts for survey_id if they were built from the same content."""
+    rows = await async_execute(
+        "SELECT content_hash, artifacts FROM prompt_artifacts WHERE survey_id = :survey_id",
+        {"survey_id": survey_id},
+    )
+    if rows and rows[0]["content_hash"] == expected_hash:
+        return rows[0]["artifacts"]
+    return None
+
+
+async def save_artifacts(survey_id: str, hash_: str, artifacts: Dict[str, Any]) -> None:
+    await async_execute(
+        """INSERT INTO prompt_artifacts (survey_id, content_hash, artifacts, built_at)
+           VALUES (:survey_id, :content_hash, CAST(:artifacts AS jsonb), :built_at)
+           ON CONFLICT (survey_id) DO UPDATE
+           SET content_hash = EXCLUDED.content_hash,
+               artifacts = EXCLUDED.artifacts,
+               built_at = EXCLUDED.built_at""",
+        {
+            "survey_id": survey_id,
+            "content_hash": hash_,
+            "artifacts": json.dumps(artifacts, ensure_ascii=False),
+            "built_at": utc_now(),
+        },
+    )
+
+
+async def ensure_artifacts(
+    survey_id: str,
+    organization_name: str,
+    rider_first_name: str,
+    survey_name: str,
+    questions: List[Dict[str, Any]],
+) -> bool:
+    """Build and store the full artifact set unless it is already current. True if built."""
+    hash_ = content_hash(organization_name, rider_first_name, survey_name, questions)
+    if await load_artifacts(survey_id, hash_) is not None:
+        return False
+    artifacts = await build_artifacts(organization_name, rider_first_name, survey_name, questions)
+    await save_artifacts(survey_id, hash_, artifacts)
+    logger.info(f"Stored prompt artifacts for survey {survey_id} ({hash_[:12]})")
+    return True
+
+
+def refresh_in_background(
+    survey_id: str,
+    organization_name: str,
+    rider_first_name: str,
+    survey_name: str,
+    questions: List[Dict[str, Any]],
+) -> None:
+    """Fire-and-forget ensure_artifacts, for the make_call miss path."""
+    async def _run():
+        try:
+            await ensure_artifacts(survey_id, organization_name, rider_first_name, survey_name, questions)
+        except Exception as e:
+            logger.warning(f"Background prompt build failed for survey {survey_id}: {e}")
+
+    task = asyncio.create_task(_run())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
@@ -8,34 +8,47 @@ Handles LiveKit call lifecycle:
 """
 
 import asyncio
+import gzip
 import logging
 import os
-import time
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import ValidationError
 
+from shared.models.common import RecordAnswersRequest, TranscriptIngestRequest
+from shared.service_client import service_client
+
+import call_reservations
+from admission import AdmissionRejected, dial_governor
 from db import (
     get_survey_with_questions,
     get_template_config,
-    record_answer,
+    record_answer as db_record_answer,
+    record_answers as db_record_answers,
     store_transcript,
+    update_survey_status,
     get_transcript,
-    enhance_transcript,
-    sql_execute,
+    count_transcripts,
+    format_transcript,
+    list_transcripts,
     async_execute,
+    utc_now,
+)
+from prompt_store import (
+    build_artifacts,
+    content_hash,
+    ensure_artifacts,
+    load_artifacts,
+    refresh_in_background,
 )
-from prompt_builder import build_greeter_prompt, build_questions_prompt
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/voice", tags=["voice"])
 
-_active_calls: dict[str, dict[str, float | str]] = {}
-_active_surveys: dict[str, str] = {}
-_active_calls_lock = asyncio.Lock()
-ACTIVE_CALL_STALE_SECONDS = 4 * 60
-ACTIVE_CALL_HARD_LIMIT = 10 * 60
-LOCK_WATCHDOG_SECONDS = 75  # auto-release if agent never confirms the call connected
+ACTIVE_CALL_STALE_SECONDS = call_reservations.CONFIRMED_LEASE_SECONDS
+ACTIVE_CALL_HARD_LIMIT = call_reservations.HARD_LIMIT_SECONDS
+MAX_TRANSCRIPT_PAGE = 200
 
 
 def _normalize_phone(phone: str) -> str:
@@ -44,7 +57,7 @@ def _normalize_phone(phone: str) -> str:
 
 
 def _lock_age(meta: dict) -> float:
-    return time.monotonic() - float(meta.get("started_at", 0))
+    return (utc_now() - meta["reserved_at"]).total_seconds()
 
 
 async def _is_lock_still_valid(survey_id: str, phone: str, age_seconds: float) -> bool:
@@ -70,100 +83,53 @@ async def _is_lock_still_valid(survey_id: str, phone: str, age_seconds: float) -
         return False
     if db_phone != _normalize_phone(phone):
         return False
-    if age_seconds > ACTIVE_CALL_STALE_SECONDS:
-        return False
     return True
 
 
-async def _lock_watchdog(phone: str, survey_id: str) -> None:
-    """Background task: release the lock if the call was never answered."""
-    await asyncio.sleep(LOCK_WATCHDOG_SECONDS)
-    async with _active_calls_lock:
-        meta = _active_calls.get(phone)
-        if not meta:
-            return
-        if str(meta.get("survey_id", "")) != survey_id:
-            return
-        if meta.get("confirmed"):
-            return
-        logger.info(
-            f"Watchdog: releasing unconfirmed lock for {phone} "
-            f"(survey {survey_id}, age={_lock_age(meta):.0f}s)"
-        )
-        del _active_calls[phone]
-        _active_surveys.pop(survey_id, None)
-
-
 async def _reserve_call(phone: str, survey_id: str) -> None:
-    """Reserve a phone number while a live call is active."""
-    async with _active_calls_lock:
-        now = time.monotonic()
-
-        expired = [
-            number for number, meta in _active_calls.items()
-            if now - float(meta.get("started_at", 0)) > ACTIVE_CALL_HARD_LIMIT
-        ]
-        for number in expired:
-            sid = str(_active_calls[number].get("survey_id", ""))
-            logger.info(f"Auto-releasing expired lock: {number} (survey {sid})")
-            _active_surveys.pop(sid, None)
-            del _active_calls[number]
-
-        existing = _active_calls.get(phone)
-        if existing:
-            active_survey_id = str(existing.get("survey_id", ""))
-            age = _lock_age(existing)
-
-            if not await _is_lock_still_valid(active_survey_id, phone, age):
-                logger.info(
-                    f"Auto-releasing stale lock for {phone}: survey {active_survey_id}, "
-                    f"age={age:.0f}s"
-                )
-                del _active_calls[phone]
-                _active_surveys.pop(active_survey_id, None)
-                existing = None
-
-        if existing:
-            active_survey_id = str(existing.get("survey_id", ""))
-            age = _lock_age(existing)
-            raise HTTPException(
-                status_code=429,
-                detail=(
-                    f"A call to {phone} is already in progress "
-                    f"(survey {active_survey_id}, started {age:.0f}s ago). "
-                    f"It will auto-expire after {ACTIVE_CALL_STALE_SECONDS}s."
-                ),
+    """Reserve a phone number (cluster-wide) while a live call is active."""
+    for _ in range(3):
+        existing = await call_reservations.try_reserve(phone, survey_id)
+        if existing is None:
+            return
+        if not existing:
+            continue  # released between insert and lookup
+
+        active_phone = existing["phone"]
+        active_survey_id = existing["survey_id"]
+        age = _lock_age(existing)
+        if not await _is_lock_still_valid(active_survey_id, active_phone, age):
+            logger.info(
+                f"Auto-releasing stale lock for {active_phone}: survey {active_survey_id}, "
+                f"age={age:.0f}s"
             )
+            await call_reservations.evict(active_phone, active_survey_id, existing["reserved_at"])
+            continue
 
-        _active_calls[phone] = {"survey_id": survey_id, "started_at": now}
-        _active_surveys[survey_id] = phone
-
-    asyncio.create_task(_lock_watchdog(phone, survey_id))
+        if active_survey_id == survey_id:
+            raise HTTPException(status_code=409, detail=f"Survey {survey_id} is already being called")
+        raise HTTPException(
+            status_code=429,
+            detail=(
+                f"A call to {phone} is already in progress "
+                f"(survey {active_survey_id}, started {age:.0f}s ago). "
+                f"It will auto-expire after {ACTIVE_CALL_STALE_SECONDS}s."
+            ),
+        )
+    raise HTTPException(status_code=503, detail=f"Could not reserve a call slot for {phone}, try again")
 
 
 async def _confirm_call(phone: str, survey_id: str) -> None:
-    """Mark a lock as confirmed (call was answered), so the watchdog won't release it."""
-    async with _active_calls_lock:
-        meta = _active_calls.get(phone)
-        if meta and str(meta.get("survey_id", "")) == survey_id:
-            meta["confirmed"] = True
+    """Mark a lock as confirmed (call was answered), extending its lease."""
+    if not await call_reservations.confirm(survey_id):
+        logger.warning(f"Confirm for survey {survey_id} ({phone}) found no live reservation")
 
 
 async def _release_call(*, survey_id: str | None = None, phone: str | None = None) -> None:
     """Release an active call reservation after the call finishes or fails."""
-    async with _active_calls_lock:
-        resolved_phone = phone
-        if survey_id:
-            resolved_phone = resolved_phone or _active_surveys.pop(survey_id, None)
-        if resolved_phone:
-            meta = _active_calls.get(resolved_phone)
-            if meta:
-                meta_survey_id = str(meta.get("survey_id", ""))
-                if not survey_id or meta_survey_id == survey_id:
-                    del _active_calls[resolved_phone]
-                    if meta_survey_id:
-                        _active_surveys.pop(meta_survey_id, None)
-                    logger.info(f"Released call lock: {resolved_phone} (survey {meta_survey_id})")
+    released = await call_reservations.release(survey_id=survey_id, phone=phone)
+    if released:
+        logger.info(f"Released call lock: {released['phone']} (survey {released['survey_id']})")
 
 
 def _extract_rider_first_name(rider_name: str) -> str:
@@ -177,6 +143,14 @@ def _extract_rider_first_name(rider_name: str) -> str:
     return first
 
 
+def _resolve_company_name(template_config: dict) -> str:
+    # Caller ID / display: must be "IT Curves" (with s), not "IT Curve"
+    company_name = (template_config.get("company_name") or os.getenv("ORGANIZATION_NAME", "IT Curves") or "").strip()
+    if company_name == "IT Curve":
+        company_name = "IT Curves"
+    return company_name or "IT Curves"
+
+
 def _with_language_query(url: str, language: str) -> str:
     """Force a survey URL into a specific language when requested."""
     if language not in {"en", "es"} or not url:
@@ -194,8 +168,12 @@ async def make_call(
     provider: str = "livekit",
     greetings: str = "",
     language: str = "bilingual",
+    priority: str = "normal",
 ):
-    """Initiate an AI-powered survey call via LiveKit SIP."""
+    """
+    Initiate an AI-powered survey call via LiveKit SIP.
+    priority ("high" / "normal" / "low") orders the dial queue when calls are throttled.
+    """
     normalized_phone = phone.strip().replace(" ", "")
     survey = await get_survey_with_questions(survey_id)
     if not survey:
@@ -220,11 +198,7 @@ async def make_call(
     if language not in ("en", "es", "bilingual"):
         language = "bilingual"
 
-    # Caller ID / display: must be "IT Curves" (with s), not "IT Curve"
-    company_name = (template_config.get("company_name") or os.getenv("ORGANIZATION_NAME", "IT Curves") or "").strip()
-    if company_name == "IT Curve":
-        company_name = "IT Curves"
-    company_name = company_name or "IT Curves"
+    company_name = _resolve_company_name(template_config)
     callback_url = os.getenv("SURVEY_SUBMIT_URL", "http://survey-service:8020/api/answers/qna_phone")
 
     rider_first_name = _extract_rider_first_name(rider_name)
@@ -233,17 +207,24 @@ async def make_call(
     rider_email = survey.get("email", "")
 
     try:
+        # A new attempt: clear the previous attempt's end_reason (busy, no_answer, ...),
+        # which _is_lock_still_valid would otherwise read as this call having ended
         await async_execute(
-            "UPDATE surveys SET phone = :phone WHERE id = :sid",
+            "UPDATE surveys SET phone = :phone, end_reason = NULL WHERE id = :sid",
             {"phone": normalized_phone, "sid": survey_id},
         )
     except Exception as e:
         logger.warning(f"Failed to persist phone {normalized_phone} on survey {survey_id}: {e}")
 
-    # Check if survey is already being called to prevent duplicates
-    if survey_id in _active_surveys:
-        raise HTTPException(status_code=409, detail=f"Survey {survey_id} is already being called")
-    await _reserve_call(normalized_phone, survey_id)
+    # Wait for a dial slot (rate + concurrency limits), then reserve the number.
+    # Raises 409/429 if this survey or number is already being called on any replica
+    try:
+        async with dial_governor.admit(priority) as queue_wait:
+            await _reserve_call(normalized_phone, survey_id)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=503, detail=f"Call not dispatched: {e}")
+    if queue_wait >= 1:
+        logger.info(f"Survey {survey_id} waited {queue_wait:.1f}s for a dial slot ({priority})")
 
     survey_context = {
         "recipient_name": rider_name or "",
@@ -258,41 +239,37 @@ async def make_call(
     }
 
     try:
-        # For prompt building: bilingual uses the bilingual greeter,
-        # en/es use their respective fixed-language prompts
-        prompt_language = language  # "en", "es", or "bilingual"
-        greeter_prompt = build_greeter_prompt(
-            organization_name=company_name,
-            rider_first_name=rider_first_name,
-            language=prompt_language,
-        )
-
+        # Prompts are prebuilt when the survey is created (POST /prompts/{survey_id});
+        # the stored copy is used only if it was built from the same inputs.
+        survey_name = template_name or f"Survey {survey_id}"
         # For questions prompt: bilingual and en both default to English questions
         questions_lang = "es" if language == "es" else "en"
-        questions_prompt, translated_questions_map = await build_questions_prompt(
-            organization_name=company_name,
-            rider_first_name=rider_first_name,
-            survey_name=template_name or f"Survey {survey_id}",
-            questions=questions,
-            language=questions_lang,
-        )
+        prompt_hash = content_hash(company_name, rider_first_name, survey_name, questions)
+        artifacts = await load_artifacts(survey_id, prompt_hash)
+        if artifacts is None:
+            # Build only what this call needs; the full set is stored in the background
+            needed = ["en", "es"] if language == "bilingual" else [questions_lang]
+            artifacts = await build_artifacts(
+                company_name, rider_first_name, survey_name, questions, question_languages=needed,
+            )
+            refresh_in_background(survey_id, company_name, rider_first_name, survey_name, questions)
+            prompt_source = "built"
+        else:
+            prompt_source = "stored"
+
+        # bilingual uses the bilingual greeter, en/es their fixed-language prompts
+        greeter_prompt = artifacts["greeter"][language]
+        questions_prompt = artifacts["questions_prompt"][questions_lang]
         survey_context["greeter_prompt"] = greeter_prompt
         survey_context["questions_prompt"] = questions_prompt
-        survey_context["translated_questions"] = translated_questions_map
+        survey_context["translated_questions"] = artifacts["questions_map"][questions_lang]
         survey_context["system_prompt"] = greeter_prompt  # backward compat
-        # For bilingual calls, also build Spanish prompts so user can switch
+        # For bilingual calls, also pass Spanish prompts so user can switch
         if language == "bilingual":
-            questions_prompt_es, questions_es_map = await build_questions_prompt(
-                organization_name=company_name,
-                rider_first_name=rider_first_name,
-                survey_name=template_name or f"Survey {survey_id}",
-                questions=questions,
-                language="es",
-            )
-            survey_context["questions_prompt_es"] = questions_prompt_es
-            survey_context["questions_es_map"] = questions_es_map
+            survey_context["questions_prompt_es"] = artifacts["questions_prompt"]["es"]
+            survey_context["questions_es_map"] = artifacts["questions_map"]["es"]
         logger.info(
-            f"Built prompts for LiveKit call — greeter: {len(greeter_prompt)} chars, "
+            f"Using {prompt_source} prompts for LiveKit call — greeter: {len(greeter_prompt)} chars, "
             f"questions: {len(questions_prompt)} chars"
         )
     except Exception as e:
@@ -329,17 +306,40 @@ async def make_call(
         raise HTTPException(status_code=500, detail=f"LiveKit call failed: {str(e)}")
 
 
+@router.post("/prompts/{survey_id}")
+async def prebuild_prompts(survey_id: str):
+    """Build and store the call prompts for a survey ahead of dialing."""
+    survey = await get_survey_with_questions(survey_id)
+    if not survey:
+        raise HTTPException(status_code=404, detail=f"Survey {survey_id} not found")
+    questions = survey.get("questions", [])
+    if not questions:
+        raise HTTPException(status_code=400, detail="Survey has no questions")
+
+    template_name = survey.get("template_name", "")
+    template_config = await get_template_config(template_name) if template_name else {}
+    rider_name = survey.get("rider_name") or survey.get("recipient") or ""
+    built = await ensure_artifacts(
+        survey_id,
+        _resolve_company_name(template_config),
+        _extract_rider_first_name(rider_name),
+        template_name or f"Survey {survey_id}",
+        questions,
+    )
+    return {"survey_id": survey_id, "status": "built" if built else "current"}
+
+
 @router.get("/transcript/{survey_id}/translate")
 async def translate_transcript(survey_id: str, target_language: str = "en"):
     """Translate transcript to target language (currently supports Spanish to English)."""
-    transcript = get_transcript(survey_id)
+    transcript = await get_transcript(survey_id)
     if not transcript:
         raise HTTPException(
             status_code=404,
             detail=f"No transcript found for survey {survey_id}"
         )
     
-    enhanced = enhance_transcript(transcript)
+    enhanced = transcript["parsed"]
     
     # Only support Spanish to English for now
     if enhanced["language_detected"] != "es" or target_language != "en":
@@ -395,40 +395,54 @@ async def translate_transcript(survey_id: str, target_language: str = "en"):
 
 
 @router.get("/transcripts")
-async def list_all_transcripts(limit: int = 50, offset: int = 0):
-    """List all available transcripts with pagination."""
+async def list_all_transcripts(
+    limit: int = 50,
+    cursor: str | None = None,
+    status: str | None = None,
+    channel: str | None = None,
+    tenant_id: str | None = None,
+    count: str = "approximate",
+):
+    """
+    List transcripts newest first with keyset pagination.
+    Pass next_cursor from the previous page as cursor. count is
+    "approximate" (planner estimate), "exact" or "none".
+    """
+    limit = max(1, min(limit, MAX_TRANSCRIPT_PAGE))
+    if count not in ("approximate", "exact", "none"):
+        raise HTTPException(status_code=400, detail="count must be approximate, exact or none")
     try:
-        transcripts = sql_execute(
-            """SELECT survey_id, call_status, call_duration_seconds, call_started_at, channel
-               FROM call_transcripts 
-               ORDER BY call_started_at DESC 
-               LIMIT :limit OFFSET :offset""",
-            {"limit": limit, "offset": offset}
+        transcripts, next_cursor = await list_transcripts(
+            limit=limit, cursor=cursor, status=status, channel=channel, tenant_id=tenant_id,
         )
-        
-        return {
-            "transcripts": transcripts,
-            "total_count": len(transcripts),
-            "limit": limit,
-            "offset": offset
-        }
+        total_count = await count_transcripts(count, status=status, channel=channel, tenant_id=tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to list transcripts: {e}")
         raise HTTPException(status_code=500, detail="Failed to list transcripts")
 
+    return {
+        "transcripts": transcripts,
+        "total_count": total_count,
+        "count_mode": count,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    }
+
 
 @router.get("/transcript/{survey_id}")
 async def get_survey_transcript(survey_id: str):
-    """Get the stored transcript for a survey with enhanced formatting."""
-    transcript = get_transcript(survey_id)
+    """Get the stored transcript for a survey with enhanced formatting (single row read)."""
+    transcript = await get_transcript(survey_id)
     if not transcript:
         raise HTTPException(
             status_code=404,
             detail=f"No transcript found for survey {survey_id}"
         )
     
-    # Enhanced transcript processing
-    enhanced_transcript = enhance_transcript(transcript)
+    # Parsed at write time (store_transcript)
+    enhanced_transcript = transcript["parsed"]
     
     return {
         "transcript_id": transcript["id"],
@@ -460,7 +474,7 @@ async def api_store_transcript(
 ):
     """Store a call transcript (and optional audio URL) after the voice call ends."""
     try:
-        tid = store_transcript(
+        tid = await store_transcript(
             survey_id=survey_id,
             full_transcript=full_transcript,
             call_duration_seconds=call_duration_seconds,
@@ -473,6 +487,42 @@ async def api_store_transcript(
         raise HTTPException(status_code=500, detail="Failed to store transcript")
 
 
+@router.post("/transcripts")
+async def api_ingest_transcript(request: Request):
+    """
+    Store a call transcript from a JSON body (TranscriptIngestRequest), optionally
+    sent with Content-Encoding: gzip. Turns and answers are kept as JSONB so reads
+    don't have to re-parse the flat text.
+    """
+    body = await request.body()
+    if "gzip" in request.headers.get("content-encoding", "").lower():
+        try:
+            body = gzip.decompress(body)
+        except (OSError, EOFError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid gzip body: {e}")
+    try:
+        payload = TranscriptIngestRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    turns = [turn.model_dump() for turn in payload.turns]
+    try:
+        tid = await store_transcript(
+            survey_id=payload.survey_id,
+            full_transcript=format_transcript(turns, payload.answers),
+            call_duration_seconds=payload.call_duration_seconds,
+            call_status=payload.call_status,
+            channel=payload.channel,
+            audio_url=payload.audio_url or None,
+            turns=turns,
+            answers=payload.answers,
+        )
+        return {"status": "stored", "transcript_id": tid, "turns": len(turns)}
+    except Exception as e:
+        logger.error(f"Failed to store transcript: {e}")
+        raise HTTPException(status_code=500, detail="Failed to store transcript")
+
+
 @router.post("/send-email-fallback")
 async def send_email_fallback(
     survey_id: str,
@@ -622,12 +672,41 @@ async def send_email_fallback(
 @router.post("/record-answer")
 async def api_record_answer(survey_id: str, question_id: str, answer: str):
     """Record a single answer from the voice agent into the database."""
-    ok = db_record_answer(survey_id, question_id, answer)
+    ok = await db_record_answer(survey_id, question_id, answer)
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to record answer")
     return {"status": "recorded", "survey_id": survey_id, "question_id": question_id}
 
 
+@router.post("/record-answers")
+async def api_record_answers(payload: RecordAnswersRequest):
+    """Record a batch of answers from the voice agent's outbox in one round trip."""
+    ok = await db_record_answers(payload.survey_id, [(a.question_id, a.answer) for a in payload.answers])
+    if not ok:
+        raise HTTPException(status_code=500, detail="Failed to record answers")
+    return {"status": "recorded", "survey_id": payload.survey_id, "count": len(payload.answers)}
+
+
+# Strong references to in-flight outcome reports (the loop only keeps weak ones)
+_outcome_tasks: set = set()
+
+
+def _report_outcome(survey_id: str, reason: str) -> None:
+    """Fire-and-forget: tell scheduler-service how the call ended so it can schedule a retry."""
+    async def _run():
+        try:
+            await service_client.post(
+                "scheduler-service", "/api/scheduler/call-outcome",
+                json={"survey_id": survey_id, "reason": reason}, timeout=10.0,
+            )
+        except Exception as e:
+            logger.warning(f"Could not report outcome '{reason}' for survey {survey_id}: {e}")
+
+    task = asyncio.create_task(_run())
+    _outcome_tasks.add(task)
+    task.add_done_callback(_outcome_tasks.discard)
+
+
 @router.post("/complete-survey")
 async def api_complete_survey(survey_id: str, reason: str = "completed"):
     """Mark a voice survey as completed (or other status) in the database."""
@@ -638,38 +717,50 @@ async def api_complete_survey(survey_id: str, reason: str = "completed"):
     if reason_lower == "completed":
         status = "Completed"
     else:
-        answer_count = sql_execute(
+        answer_count = await async_execute(
             "SELECT COUNT(*) as count FROM survey_response_items WHERE survey_id = :sid AND raw_answer IS NOT NULL",
             {"sid": survey_id},
         )
         has_answers = answer_count and answer_count[0]["count"] > 0
         status = "Completed" if has_answers else "In-Progress"
-    ok = update_survey_status(survey_id, status)
+    ok = await update_survey_status(survey_id, status, end_reason=reason)
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to update survey status")
-    try:
-        from db import async_execute
-        await async_execute(
-            "UPDATE surveys SET end_reason = :reason WHERE id = :sid",
-            {"reason": reason, "sid": survey_id},
-        )
-    except Exception:
-        pass
     await _release_call(survey_id=survey_id)
+    _report_outcome(survey_id, reason)
     return {"status": status, "survey_id": survey_id, "end_reason": reason}
 
 
 @router.post("/confirm-call")
 async def api_confirm_call(survey_id: str, phone: str | None = None):
-    """Agent confirms the call was answered — prevents the watchdog from releasing the lock."""
+    """Agent confirms the call was answered — extends the lease past the unconfirmed window."""
     normalized_phone = _normalize_phone(phone or "")
     await _confirm_call(normalized_phone, survey_id)
     return {"status": "confirmed", "survey_id": survey_id}
 
 
+@router.get("/admission")
+async def admission_stats():
+    """Dial queue depth, wait times and limits."""
+    try:
+        active_calls = await call_reservations.active_count()
+    except Exception:
+        active_calls = None
+    return {"active_calls": active_calls, **dial_governor.stats()}
+
+
+@router.post("/renew-call")
+async def api_renew_call(survey_id: str):
+    """Agent heartbeat while a call is live — extends the reservation lease."""
+    lease = await call_reservations.renew(survey_id)
+    if not lease:
+        raise HTTPException(status_code=404, detail=f"No live reservation for survey {survey_id}")
+    return {"status": "renewed", "survey_id": survey_id, "expires_at": lease["expires_at"].isoformat()}
+
+
 @router.post("/release-call")
 async def api_release_call(survey_id: str | None = None, phone: str | None = None):
-    """Release an in-memory active call lock when an agent job exits."""
+    """Release the call reservation when an agent job exits."""
     normalized_phone = _normalize_phone(phone or "")
     await _release_call(survey_id=survey_id, phone=normalized_phone or None)
     return {"status": "released", "survey_id": survey_id, "phone": normalized_phone}
@@ -680,7 +771,9 @@ async def api_release_call(survey_id: str | None = None, phone: str | None = Non
 @router.post("/direct-call")
 async def direct_call(to: str, survey_id: str, provider: str = "livekit", greetings: str = "", language: str = "bilingual"):
     """Dashboard-compatible endpoint: accepts 'to' param instead of 'phone'."""
-    return await make_call(survey_id=survey_id, phone=to, provider=provider, greetings=greetings, language=language)
+    return await make_call(
+        survey_id=survey_id, phone=to, provider=provider, greetings=greetings, language=language, priority="high",
+    )
 
 
 # ─── Backward Compatibility Aliases ──────────────────────────────────────────
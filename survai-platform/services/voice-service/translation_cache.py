@@ -0,0 +1,128 @@
+"""
+Per-question translation cache for prompt_builder.
+
+Keys are sha256(target language, model, question text), so a template that
+gains one question only translates that question, and the same question
+text shared by several templates is translated once. Two tiers:
+
+- in-process LRU (TRANSLATION_CACHE_MAX_ENTRIES, default 2000)
+- Postgres table question_translations shared by all voice-service replicas
+  and kept across restarts
+
+Translations never go stale (an edited question gets a new key), so there
+is no TTL. Setting TRANSLATION_CACHE_DB=0 keeps the cache memory-only; a DB
+error also just skips the Postgres tier for that call.
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from db import async_execute, utc_now
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "2000"))
+DB_ENABLED = os.getenv("TRANSLATION_CACHE_DB", "1") != "0"
+
+
+def make_key(lang: str, model: str, text: str) -> str:
+    payload = f"{lang}\n{model}\n{text.strip()}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self.counters: Dict[str, int] = {
+            "memory_hits": 0, "db_hits": 0, "misses": 0, "sets": 0, "evictions": 0, "db_errors": 0,
+        }
+
+    def _memory_set(self, key: str, value: str) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Cached translations for keys; missing keys are simply absent."""
+        found: Dict[str, str] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self._lru.get(key)
+            if value is None:
+                missing.append(key)
+                continue
+            self._lru.move_to_end(key)
+            found[key] = value
+            self.counters["memory_hits"] += 1
+
+        if missing and DB_ENABLED:
+            try:
+                rows = await async_execute(
+                    "SELECT key, translated_text FROM question_translations WHERE key = ANY(:keys)",
+                    {"keys": missing},
+                )
+            except Exception as e:
+                self.counters["db_errors"] += 1
+                logger.warning(f"question_translations read failed: {e}")
+                rows = []
+            for row in rows:
+                found[row["key"]] = row["translated_text"]
+                self._memory_set(row["key"], row["translated_text"])
+                self.counters["db_hits"] += 1
+
+        self.counters["misses"] += sum(1 for key in missing if key not in found)
+        return found
+
+    async def set_many(self, lang: str, entries: List[Tuple[str, str, str, str]]) -> None:
+        """Store (key, question_id, source_text, translated_text) tuples."""
+        if not entries:
+            return
+        for key, _, _, translated in entries:
+            self._memory_set(key, translated)
+        self.counters["sets"] += len(entries)
+        if not DB_ENABLED:
+            return
+
+        now = utc_now()
+        try:
+            await async_execute(
+                """INSERT INTO question_translations
+                   (key, question_id, lang, source_text, translated_text, created_at)
+                   VALUES (:key, :question_id, :lang, :source_text, :translated_text, :now)
+                   ON CONFLICT (key) DO UPDATE
+                   SET translated_text = EXCLUDED.translated_text, created_at = EXCLUDED.created_at""",
+                [
+                    {
+                        "key": key,
+                        "question_id": question_id,
+                        "lang": lang,
+                        "source_text": source,
+                        "translated_text": translated,
+                        "now": now,
+                    }
+                    for key, question_id, source, translated in entries
+                ],
+            )
+        except Exception as e:
+            self.counters["db_errors"] += 1
+            logger.warning(f"question_translations write failed: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        hits = self.counters["memory_hits"] + self.counters["db_hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "db_enabled": DB_ENABLED,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self.counters,
+        }
+
+
+translation_cache = TranslationCache()
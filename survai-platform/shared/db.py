@@ -1,67 +1,369 @@
 """
 Shared database connection factory for all microservices.
 Each service gets its own connection pool but uses the same PostgreSQL instance.
+
+Two access paths are provided:
+- sql_execute: synchronous psycopg2 engine, for background threads / scripts.
+- async_sql_execute / async_transaction: asyncpg engine, for FastAPI routes,
+  so a slow query never stalls the uvicorn event loop.
+- async_stream: asyncpg server-side cursor, for results too large to hold
+  in memory (exports); yields the rows in batches.
+
+Both return the same shape: a list of dicts for statements that return rows,
+[] otherwise. Every call runs in its own transaction and commits on success.
+
+asyncpg binds parameters with their real Postgres types (no client-side
+interpolation like psycopg2), so TIMESTAMP columns need datetime values
+(see utc_now) and INTEGER columns need ints.
+
+Pool sizing is read from the environment, service-prefixed first:
+    SURVEY_SERVICE_DB_POOL_SIZE -> DB_POOL_SIZE -> default
+Keys: DB_POOL_SIZE / DB_MAX_OVERFLOW (async pool), DB_SYNC_POOL_SIZE /
+DB_SYNC_MAX_OVERFLOW (sync pool), DB_POOL_TIMEOUT, DB_POOL_RECYCLE.
+Every service shares one Postgres, so the sum of pool_size + max_overflow
+over every engine must stay under its max_connections (100 by default).
+With the defaults a service holds at most 5 async + 3 sync = 8 connections,
+64 for the eight services, leaving room for replicas of a service, psql
+and migrations. Raise a service's pool only with that sum in mind.
 """
 
 import os
 import logging
-from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
 logger = logging.getLogger(__name__)
 
+Params = Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]
+
 _engines: Dict[str, Engine] = {}
+_async_engines: Dict[str, AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+# (pool_size, max_overflow). Routes run on the async pool; the sync pool only
+# serves background threads and scripts, so it stays small. No async overflow:
+# a burst waits pool_timeout for a connection instead of exhausting Postgres.
+_POOL_DEFAULTS = {
+    "async": (5, 0),
+    "sync": (1, 2),
+}
+_POOL_TIMEOUT_DEFAULT = 30
+_POOL_RECYCLE_DEFAULT = 300
+_SLOW_ACQUIRE_MS = float(os.getenv("DB_POOL_SLOW_ACQUIRE_MS", "250"))
+
+
+def _db_url(driver: str = "psycopg2") -> str:
+    db_host = os.getenv("DB_HOST", "localhost")
+    db_port = os.getenv("DB_PORT", "5432")
+    db_user = os.getenv("DB_USER", "pguser")
+    db_password = os.getenv("DB_PASSWORD", "root")
+    db_name = os.getenv("DB_NAME", "db")
+    return f"postgresql+{driver}://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+
+def _pool_setting(service_name: str, key: str, default: int) -> int:
+    """Read an int pool setting: <SERVICE>_<key>, then <key>, then default."""
+    prefix = service_name.upper().replace("-", "_")
+    for var in (f"{prefix}_{key}", key):
+        value = os.getenv(var)
+        if value:
+            try:
+                return int(value)
+            except ValueError:
+                logger.warning(f"Ignoring non-integer {var}={value!r}")
+    return default
+
+
+def _pool_kwargs(service_name: str, kind: str) -> Dict[str, Any]:
+    size, overflow = _POOL_DEFAULTS[kind]
+    key = "DB_SYNC_" if kind == "sync" else "DB_"
+    return {
+        "pool_size": _pool_setting(service_name, f"{key}POOL_SIZE", size),
+        "max_overflow": _pool_setting(service_name, f"{key}MAX_OVERFLOW", overflow),
+        "pool_timeout": _pool_setting(service_name, "DB_POOL_TIMEOUT", _POOL_TIMEOUT_DEFAULT),
+        "pool_recycle": _pool_setting(service_name, "DB_POOL_RECYCLE", _POOL_RECYCLE_DEFAULT),
+        "pool_pre_ping": True,
+    }
+
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, ready to bind to TIMESTAMP columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ─── Pool instrumentation ────────────────────────────────────────────────────
+
+class _PoolStats:
+    """Counters for one engine; live pool numbers are read from the pool itself."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.timeouts = 0
+        self.slow_acquires = 0
+        self.connects = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def record_wait(self, service_name: str, kind: str, wait_ms: float) -> None:
+        with self._lock:
+            self.acquired += 1
+            self.total_wait_ms += wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+            if wait_ms >= _SLOW_ACQUIRE_MS:
+                self.slow_acquires += 1
+        if wait_ms >= _SLOW_ACQUIRE_MS:
+            logger.warning(f"[{service_name}] slow {kind} DB connection acquire: {wait_ms:.0f}ms")
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
 
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self, engine: Union[Engine, AsyncEngine]) -> Dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            avg = self.total_wait_ms / self.acquired if self.acquired else 0.0
+            counters = {
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "slow_acquires": self.slow_acquires,
+                "connects": self.connects,
+                "avg_wait_ms": round(avg, 2),
+                "max_wait_ms": round(self.max_wait_ms, 2),
+            }
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **counters,
+        }
+
+
+_stats: Dict[str, _PoolStats] = {}
+
+
+def _stats_for(service_name: str, kind: str) -> _PoolStats:
+    key = f"{service_name}:{kind}"
+    if key not in _stats:
+        _stats[key] = _PoolStats()
+    return _stats[key]
+
+
+def _instrument(engine: Engine, service_name: str, kind: str) -> None:
+    stats = _stats_for(service_name, kind)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.record_connect()
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Live pool usage and acquire-wait counters per service, for /health/db."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, engine in list(_engines.items()):
+        out.setdefault(name, {})["sync"] = _stats_for(name, "sync").snapshot(engine)
+    for name, engine in list(_async_engines.items()):
+        out.setdefault(name, {})["async"] = _stats_for(name, "async").snapshot(engine)
+    return out
+
+
+# ─── Engines ─────────────────────────────────────────────────────────────────
 
 def get_engine(service_name: str = "default") -> Engine:
     """Get or create a SQLAlchemy engine for the given service."""
     if service_name not in _engines:
-        db_host = os.getenv("DB_HOST", "localhost")
-        db_port = os.getenv("DB_PORT", "5432")
-        db_user = os.getenv("DB_USER", "pguser")
-        db_password = os.getenv("DB_PASSWORD", "root")
-        db_name = os.getenv("DB_NAME", "postgres")
-
-        url = f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        _engines[service_name] = create_engine(
-            url,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-            pool_recycle=300,
-        )
-        logger.info(f"Created DB engine for service: {service_name}")
+        with _engines_lock:
+            if service_name not in _engines:
+                kwargs = _pool_kwargs(service_name, "sync")
+                engine = create_engine(_db_url("psycopg2"), **kwargs)
+                _instrument(engine, service_name, "sync")
+                _engines[service_name] = engine
+                logger.info(
+                    f"Created DB engine for service: {service_name} "
+                    f"(pool_size={kwargs['pool_size']}, max_overflow={kwargs['max_overflow']})"
+                )
 
     return _engines[service_name]
 
 
+def get_async_engine(service_name: str = "default") -> AsyncEngine:
+    """Get or create an asyncpg-backed engine for the given service."""
+    if service_name not in _async_engines:
+        kwargs = _pool_kwargs(service_name, "async")
+        engine = create_async_engine(_db_url("asyncpg"), **kwargs)
+        _instrument(engine.sync_engine, service_name, "async")
+        _async_engines[service_name] = engine
+        logger.info(
+            f"Created async DB engine for service: {service_name} "
+            f"(pool_size={kwargs['pool_size']}, max_overflow={kwargs['max_overflow']})"
+        )
+
+    return _async_engines[service_name]
+
+
+# ─── Sync API ────────────────────────────────────────────────────────────────
+
+def _run_sync(conn: Connection, query: str, params: Params) -> List[Dict[str, Any]]:
+    if isinstance(params, list):
+        if not params:
+            return []
+        # executemany: one prepared statement, many parameter sets
+        conn.execute(text(query), params)
+        return []
+    result = conn.execute(text(query), params or {})
+    if result.returns_rows:
+        return [dict(row) for row in result.mappings().all()]
+    return []
+
+
+@contextmanager
+def _begin(service_name: str) -> Iterator[Connection]:
+    engine = get_engine(service_name)
+    stats = _stats_for(service_name, "sync")
+    start = time.perf_counter()
+    try:
+        with engine.begin() as conn:
+            stats.record_wait(service_name, "sync", (time.perf_counter() - start) * 1000)
+            yield conn
+    except PoolTimeoutError:
+        stats.record_timeout()
+        raise
+
+
 def sql_execute(
     query: str,
-    params: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+    params: Params = None,
     service_name: str = "default",
 ) -> List[Dict[str, Any]]:
     """
-    Execute a SQL query and return results as list of dicts.
-    Compatible with the existing monolith's sql_execute signature.
+    Execute a SQL query and return results as list of dicts ([] when the
+    statement returns no rows). A list of dicts as params runs executemany.
+    Commits on success, rolls back if the statement raises.
     """
-    engine = get_engine(service_name)
+    with _begin(service_name) as conn:
+        return _run_sync(conn, query, params)
+
+
+@contextmanager
+def transaction(service_name: str = "default") -> Iterator["Transaction"]:
+    """Sync counterpart of async_transaction, for background threads."""
+    with _begin(service_name) as conn:
+        yield Transaction(conn)
+
+
+class Transaction:
+    """Handle yielded by transaction; all statements share one connection."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
 
-    with engine.connect() as conn:
-        if isinstance(params, list):
-            # Batch insert/update
-            result = conn.execute(text(query), params)
-            conn.commit()
+    def execute(self, query: str, params: Params = None) -> List[Dict[str, Any]]:
+        return _run_sync(self.conn, query, params)
+
+
+# ─── Async API ───────────────────────────────────────────────────────────────
+
+async def _run(conn: AsyncConnection, query: str, params: Params) -> List[Dict[str, Any]]:
+    if isinstance(params, list):
+        if not params:
             return []
-        else:
-            result = conn.execute(text(query), params or {})
-
-            if result.returns_rows:
-                rows = result.fetchall()
-                columns = result.keys()
-                return [dict(zip(columns, row)) for row in rows]
-            else:
-                conn.commit()
-                return []
+        # executemany: one prepared statement, many parameter sets
+        await conn.execute(text(query), params)
+        return []
+    result = await conn.execute(text(query), params or {})
+    if result.returns_rows:
+        return [dict(row) for row in result.mappings().all()]
+    return []
+
+
+@asynccontextmanager
+async def _async_begin(service_name: str) -> AsyncIterator[AsyncConnection]:
+    engine = get_async_engine(service_name)
+    stats = _stats_for(service_name, "async")
+    start = time.perf_counter()
+    try:
+        async with engine.begin() as conn:
+            stats.record_wait(service_name, "async", (time.perf_counter() - start) * 1000)
+            yield conn
+    except PoolTimeoutError:
+        stats.record_timeout()
+        raise
+
+
+async def async_sql_execute(
+    query: str,
+    params: Params = None,
+    service_name: str = "default",
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of sql_execute. Returns a list of dicts for queries that
+    return rows and [] otherwise. A list of dicts as params runs executemany.
+    Each call runs in its own transaction and commits on success.
+    """
+    async with _async_begin(service_name) as conn:
+        return await _run(conn, query, params)
+
+
+async def async_stream(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    service_name: str = "default",
+    batch_size: int = 1000,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of a SELECT as lists of up to batch_size dicts, read
+    through a server-side cursor, so memory is bounded by one batch however
+    large the result. The pooled connection (and its transaction) is held
+    until the iterator is exhausted or closed; aclose() it when stopping early.
+    """
+    async with _async_begin(service_name) as conn:
+        result = await conn.stream(text(query).execution_options(yield_per=batch_size), params or {})
+        async for partition in result.mappings().partitions(batch_size):
+            yield [dict(row) for row in partition]
+
+
+class AsyncTransaction:
+    """Handle yielded by async_transaction; all statements share one connection."""
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+
+    async def execute(self, query: str, params: Params = None) -> List[Dict[str, Any]]:
+        return await _run(self.conn, query, params)
+
+
+@asynccontextmanager
+async def async_transaction(service_name: str = "default") -> AsyncIterator[AsyncTransaction]:
+    """
+    Run several statements atomically:
+
+        async with async_transaction("survey-service") as tx:
+            await tx.execute("DELETE ...", {...})
+            await tx.execute("UPDATE ...", {...})
+
+    Commits when the block exits cleanly, rolls back if it raises.
+    """
+    async with _async_begin(service_name) as conn:
+        yield AsyncTransaction(conn)
+
+
+async def dispose_async_engines() -> None:
+    """Close all async pools (call from the FastAPI lifespan on shutdown)."""
+    for name, engine in list(_async_engines.items()):
+        await engine.dispose()
+        logger.info(f"Disposed async DB engine for service: {name}")
+    _async_engines.clear()
@@ -3,7 +3,7 @@ Shared Pydantic models used across multiple microservices.
 """
 
 from datetime import datetime
-from typing import List, Literal, Optional, Union
+from typing import Dict, List, Literal, Optional, Union
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -226,6 +226,37 @@ class EmailFallbackRequest(BaseModel):
     survey_url: str
 
 
+class TranscriptTurn(BaseModel):
+    role: Literal["agent", "user"]
+    text: str
+    ts: Optional[str] = None  # ISO timestamp from the agent
+
+
+class TranscriptIngestRequest(BaseModel):
+    survey_id: str
+    turns: List[TranscriptTurn] = []
+    answers: Dict[str, str] = {}
+    call_duration_seconds: int = 0
+    call_status: str = "completed"
+    channel: str = "phone"
+    audio_url: Optional[str] = None
+
+
+class RecordedAnswer(BaseModel):
+    question_id: str
+    answer: str
+
+
+class RecordAnswersRequest(BaseModel):
+    survey_id: str
+    answers: List[RecordedAnswer]
+
+
+class CallOutcomeRequest(BaseModel):
+    survey_id: str
+    reason: str
+
+
 # ─── Analytics ────────────────────────────────────────────────────────────────
 
 class AnalyticsSummary(BaseModel):
@@ -20,8 +20,15 @@ SERVICE_URLS = {
     "agent-service": os.getenv("AGENT_SERVICE_URL", "http://agent-service:8050"),
     "analytics-service": os.getenv("ANALYTICS_SERVICE_URL", "http://analytics-service:8060"),
     "scheduler-service": os.getenv("SCHEDULER_SERVICE_URL", "http://scheduler-service:8070"),
+    "brain-service": os.getenv("BRAIN_SERVICE_URL", "http://brain-service:8016"),
+    "voice-service": os.getenv("VOICE_SERVICE_URL", "http://voice-service:8017"),
 }
 
+# Keep-alive pool shared by all calls from one process
+MAX_CONNECTIONS = int(os.getenv("SERVICE_CLIENT_MAX_CONNECTIONS", "50"))
+MAX_KEEPALIVE = int(os.getenv("SERVICE_CLIENT_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("SERVICE_CLIENT_KEEPALIVE_EXPIRY", "60"))
+
 
 class ServiceClient:
     """Async HTTP client for calling other microservices."""
@@ -32,7 +39,14 @@ class ServiceClient:
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
         return self._client
 
     def _get_base_url(self, service: str) -> str:
@@ -49,11 +63,15 @@ class ServiceClient:
         resp.raise_for_status()
         return resp.json()
 
-    async def post(self, service: str, path: str, json: Optional[Dict] = None) -> Any:
+    async def post(
+        self, service: str, path: str, json: Optional[Dict] = None, timeout: Optional[float] = None,
+    ) -> Any:
         client = await self._get_client()
         url = f"{self._get_base_url(service)}{path}"
         logger.debug(f"POST {url}")
-        resp = await client.post(url, json=json)
+        resp = await client.post(
+            url, json=json, timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
         resp.raise_for_status()
         return resp.json()
 
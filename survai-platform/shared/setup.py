@@ -5,8 +5,9 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "sqlalchemy>=2.0",
+        "sqlalchemy[asyncio]>=2.0",
         "psycopg2-binary>=2.9",
+        "asyncpg>=0.30.0",
         "httpx>=0.27",
         "pydantic>=2.0",
     ],